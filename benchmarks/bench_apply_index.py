@@ -0,0 +1,70 @@
+"""
+Benchmark: label updates of apply_changes by linear NFC path scan vs. the PlaylistManager path index.
+
+Builds a 10k-item playlist (half of the paths in NFD form, as written on macOS) and
+updates every label by path, the way apply_changes does for a full preview.
+
+Usage: python benchmarks/bench_apply_index.py [items]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unicodedata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+from playlist_manager import PlaylistManager
+
+def build_playlist(path, count):
+    items = []
+    for i in range(count):
+        rom = f"/roms/psx/游戏 Café {i:05d} (Japan).chd"
+        if i % 2:
+            rom = unicodedata.normalize('NFD', rom)
+        items.append({'path': rom, 'label': f"Game {i:05d} (Japan)"})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': "1.5", 'items': items}, f, ensure_ascii=False)
+    # Changes carry the NFC form, as produced on another platform
+    return [(unicodedata.normalize('NFC', item['path']), f"游戏 {i:05d}") for i, item in enumerate(items)]
+
+def linear_scan(manager, changes):
+    # The lookup apply_changes used before the path index
+    for target_path, new_label in changes:
+        norm_target = unicodedata.normalize('NFC', target_path)
+        for item in manager.items:
+            item_path = item.get('path')
+            if item_path and unicodedata.normalize('NFC', item_path) == norm_target:
+                item['label'] = new_label
+                break
+
+def path_index(manager, changes):
+    for target_path, new_label in changes:
+        manager.update_label_by_path(target_path, new_label)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    work_dir = tempfile.mkdtemp()
+    try:
+        playlist_path = os.path.join(work_dir, "bench.lpl")
+        changes = build_playlist(playlist_path, count)
+
+        results = {}
+        for name, update in (("Linear scan", linear_scan), ("Path index", path_index)):
+            manager = PlaylistManager(playlist_path)
+            start = time.perf_counter()
+            update(manager, changes)
+            results[name] = (time.perf_counter() - start, [item['label'] for item in manager.items])
+
+        assert results["Linear scan"][1] == results["Path index"][1], "path index updated different items"
+        print(f"Updating {count} labels by path")
+        for name, (elapsed, _) in results.items():
+            print(f"{name + ':':<13} {elapsed:.3f}s")
+        print(f"Speedup:      {results['Linear scan'][0] / results['Path index'][0]:.0f}x")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
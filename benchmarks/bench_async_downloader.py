@@ -0,0 +1,109 @@
+"""
+Benchmark: thumbnail download throughput of the thread pool downloader vs. the asyncio engine.
+
+A local HTTP server stands in for thumbnails.libretro.com: each request takes a fixed
+latency, and it answers 429 while more than --capacity requests are in flight, like a
+rate-limited server. Every game has three thumbnail types; a share of them are 404s.
+
+Usage: python benchmarks/bench_async_downloader.py [games] [--latency 0.05] [--capacity 12]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+from thumbnail_downloader import ThumbnailDownloader
+from async_downloader import AsyncThumbnailDownloader
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 20000
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, capacity):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            over = server.in_flight > server.capacity
+            if over:
+                server.throttled += 1
+        try:
+            time.sleep(server.latency)
+            if over:
+                self.reply(429, b"")
+            elif "Named_Titles" in self.path and "7%20%28USA" in self.path:
+                self.reply(404, b"not found")
+            else:
+                self.reply(200, PNG)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def run(downloader, games):
+    tasks = [("Bench System", f"Game {i:04d} (USA)", f"游戏 {i:04d}") for i in range(games)]
+    start = time.perf_counter()
+    downloader.download_batch(tasks)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("games", nargs="?", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--capacity", type=int, default=12)
+    args = parser.parse_args()
+
+    server = StandInServer(args.latency, args.capacity)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.games} games x 3 types, {args.latency * 1000:.0f} ms latency, "
+          f"429 above {args.capacity} concurrent requests")
+    try:
+        for name, make in (("Threads (5)", lambda d: ThumbnailDownloader(d)),
+                           ("Asyncio", lambda d: AsyncThumbnailDownloader(d, max_connections=16, backoff=0.05))):
+            work_dir = tempfile.mkdtemp()
+            server.throttled = 0
+            downloader = make(work_dir)
+            downloader.BASE_URL = base_url
+            try:
+                elapsed = run(downloader, args.games)
+            finally:
+                downloader.close()
+            files = sum(len(f) for _, _, f in os.walk(work_dir))
+            extra = ""
+            if isinstance(downloader, AsyncThumbnailDownloader):
+                limit = next(iter(downloader.limits.values()))
+                extra = f", limit {limit.limit:.1f} (peak {limit.peak}, {limit.decreases} decreases)"
+            print(f"{name + ':':<13} {elapsed:6.2f}s  {args.games / elapsed:6.1f} games/s  "
+                  f"{files} files, {server.throttled} throttled{extra}")
+            shutil.rmtree(work_dir)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: full vs. incremental re-analysis of a playlist after adding a few ROMs.
+
+Builds a 3000-item playlist from one system's CSV, analyzes and applies it once, then adds
+10 new ROMs and runs analysis + label update + thumbnail check again, both with and without
+the item fingerprints. The translator pool is cleared between runs, like a new CLI process,
+and every thumbnail already exists, so no network access is involved.
+
+Usage: python benchmarks/bench_incremental.py [system]
+"""
+import os
+import sys
+import io
+import csv
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+import plcn
+from translator_pool import translator_pool
+from thumbnail_downloader import ThumbnailDownloader
+
+ITEMS = 3000
+NEW_ITEMS = 10
+
+def load_names(system):
+    with open(os.path.join(ROOT, "data", "rom-name-cn", f"{system}.csv"), 'r', encoding='utf-8-sig') as f:
+        return [row[0] for row in csv.reader(f) if row][1:ITEMS + NEW_ITEMS + 1]
+
+def write_playlist(path, names):
+    items = [{'path': f"/roms/{name}.zip", 'label': name} for name in names]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': "1.5", 'items': items}, f, ensure_ascii=False)
+
+def run(playlist_path, system, rom_name_cn_path, downloader, incremental):
+    translator_pool.clear()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        changes = plcn.analyze_playlist(playlist_path, system, rom_name_cn_path, incremental=incremental)
+        tasks = plcn.apply_labels(playlist_path, changes, backup=False)
+        pending = [task for task in tasks if not downloader.is_complete(task[0], task[2])]
+    return time.perf_counter() - start, changes, pending
+
+def main():
+    system = sys.argv[1] if len(sys.argv) > 1 else "Nintendo - Game Boy Advance"
+    names = load_names(system)
+    work_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(work_dir)  # plcn.db is created in the working directory
+        rom_name_cn_path = os.path.join(work_dir, "data", "rom-name-cn")
+        os.makedirs(rom_name_cn_path)
+        for name in (f"{system}.csv", "name_alias(Chinese).json"):
+            shutil.copy(os.path.join(ROOT, "data", "rom-name-cn", name), rom_name_cn_path)
+        downloader = ThumbnailDownloader(os.path.join(work_dir, "thumbnails"))
+        playlist_path = os.path.join(work_dir, "bench.lpl")
+
+        # First run, then pretend all thumbnails were downloaded
+        write_playlist(playlist_path, names[:ITEMS])
+        first, changes, _ = run(playlist_path, system, rom_name_cn_path, downloader, incremental=True)
+        for change in changes:
+            for type_name in ThumbnailDownloader.TYPES:
+                target_dir = os.path.join(downloader.thumbnails_dir, system, type_name)
+                os.makedirs(target_dir, exist_ok=True)
+                open(os.path.join(target_dir, downloader.sanitize_filename(change['new_label']) + ".png"), 'wb').close()
+
+        # Add new ROMs to the (now translated) playlist
+        with open(playlist_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'] += [{'path': f"/roms/{name}.zip", 'label': name} for name in names[ITEMS:]]
+        with open(playlist_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        shutil.copy(playlist_path, playlist_path + ".orig")
+
+        full, full_changes, _ = run(playlist_path, system, rom_name_cn_path, downloader, incremental=False)
+        shutil.copy(playlist_path + ".orig", playlist_path)
+        incremental, inc_changes, pending = run(playlist_path, system, rom_name_cn_path, downloader, incremental=True)
+        assert [c['new_label'] for c in full_changes] == [c['new_label'] for c in inc_changes], \
+            "incremental run resolved different labels"
+
+        print(f"First run ({ITEMS} items):           {first:.3f}s")
+        print(f"Re-run +{NEW_ITEMS} ROMs, full:          {full:.3f}s")
+        print(f"Re-run +{NEW_ITEMS} ROMs, incremental:   {incremental:.3f}s "
+              f"({len(pending)} item(s) left to download)")
+    finally:
+        os.chdir(cwd)
+        translator_pool.clear()
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
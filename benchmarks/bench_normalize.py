@@ -0,0 +1,46 @@
+"""
+Microbenchmark: shared normalizer vs. the original regex implementation.
+
+Usage: python benchmarks/bench_normalize.py
+"""
+import os
+import sys
+import csv
+import glob
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+sys.path.append(ROOT)
+import normalizer
+from test_normalizer import reference_normalize_name
+
+def load_names():
+    names = []
+    for csv_file in sorted(glob.glob(os.path.join(ROOT, "data", "rom-name-cn", "*.csv"))):
+        with open(csv_file, 'r', encoding='utf-8-sig') as f:
+            for row in csv.reader(f):
+                if row:
+                    names.append(row[0])
+    return names
+
+def main():
+    names = load_names()
+    print(f"Normalizing {len(names)} names")
+
+    reference = timeit.timeit(lambda: [reference_normalize_name(n) for n in names], number=3) / 3
+
+    def cold():
+        normalizer.normalize_name.cache_clear()
+        normalizer.normalize_many(names)
+    cold_time = timeit.timeit(cold, number=3) / 3
+
+    normalizer.normalize_many(names)
+    warm_time = timeit.timeit(lambda: normalizer.normalize_many(names), number=3) / 3
+
+    print(f"reference (6x re.sub): {reference * 1000:8.1f} ms")
+    print(f"shared, cold cache:    {cold_time * 1000:8.1f} ms  ({reference / cold_time:.1f}x)")
+    print(f"shared, warm cache:    {warm_time * 1000:8.1f} ms  ({reference / warm_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: playlist detection and loading with json.load vs. the streaming PlaylistReader.
+
+Builds a large playlist and compares time and peak Python memory (tracemalloc) of
+detecting the system from the first items, and of loading all items.
+
+Usage: python benchmarks/bench_playlist_reader.py [items]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+from playlist_manager import PlaylistReader, detect_system_name
+
+def build_playlist(path, count):
+    items = [{'path': f"/roms/psx/游戏 {i:06d} (Japan).chd", 'label': f"Game {i:06d} (Japan)",
+              'core_path': "DETECT", 'core_name': "DETECT", 'crc32': "DETECT",
+              'db_name': "Sony - PlayStation.lpl"} for i in range(count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': "1.5", 'items': items}, f, indent=2, ensure_ascii=False)
+
+def detect_json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f).get('items', [])
+    return os.path.splitext(items[0]['db_name'])[0] if items else None
+
+def load_json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['items']
+
+def measure(func, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    work_dir = tempfile.mkdtemp()
+    try:
+        playlist_path = os.path.join(work_dir, "bench.lpl")
+        build_playlist(playlist_path, count)
+        print(f"Playlist: {count} items, {os.path.getsize(playlist_path) / 1e6:.1f} MB")
+
+        for title, cases in (
+            ("Detect system", (("json.load", detect_json_load), ("Streaming", detect_system_name))),
+            ("Load all items", (("json.load", load_json_load), ("Streaming", lambda p: list(PlaylistReader(p))))),
+        ):
+            results = [(name, *measure(func, playlist_path)) for name, func in cases]
+            assert results[0][1] == results[1][1], "streaming reader returned a different result"
+            print(title)
+            for name, _, elapsed, peak in results:
+                print(f"  {name + ':':<11} {elapsed * 1000:9.1f} ms  peak {peak / 1e6:7.1f} MB")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: exact lookup tiers served from SQLite vs. the in-memory TranslationSnapshot.
+
+Builds a 5000-item synthetic playlist for one system (English names, Chinese names,
+names without tags and Chinese names with a bracketed suffix) and translates it with
+both translators. Only items resolved by the exact tiers are generated, so the fuzzy
+tiers do not dominate the timings.
+
+Usage: python benchmarks/bench_snapshot.py [system]
+"""
+import os
+import sys
+import io
+import time
+import random
+import shutil
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+from translator import Translator
+from translation_snapshot import TranslationSnapshot
+
+ITEMS = 5000
+
+def build_playlist(translator, system):
+    cursor = translator.db.get_connection().cursor()
+    where, params = translator.db.system_clause(system)
+    cursor.execute(f'SELECT english_name, chinese_name FROM translations {where}', params)
+    rows = cursor.fetchall()
+    random.seed(0)
+    labels = []
+    for _ in range(ITEMS):
+        english, chinese = random.choice(rows)
+        kind = random.randrange(4)
+        if kind == 0:
+            labels.append(english)
+        elif kind == 1:
+            labels.append(chinese)
+        elif kind == 2:
+            labels.append(english.split(' (')[0])
+        else:
+            labels.append(f"{chinese}（中文版）")
+    return labels
+
+def run(translator, labels):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [translator.translate(label) for label in labels]
+    return time.perf_counter() - start, results
+
+def main():
+    system = sys.argv[1] if len(sys.argv) > 1 else "Nintendo - Game Boy Advance"
+    work_dir = tempfile.mkdtemp()
+    try:
+        rom_name_cn_path = os.path.join(work_dir, "rom-name-cn")
+        os.makedirs(rom_name_cn_path)
+        for name in (f"{system}.csv", "name_alias(Chinese).json"):
+            shutil.copy(os.path.join(ROOT, "data", "rom-name-cn", name), rom_name_cn_path)
+        db_path = os.path.join(work_dir, "bench.db")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            sql = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False)
+            snap = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False)
+        # Bypass the DAT download: only the DB tiers are measured
+        sql.system_name = snap.system_name = system
+
+        start = time.perf_counter()
+        snap.snapshot = TranslationSnapshot(snap.db, system)
+        load_time = time.perf_counter() - start
+
+        labels = build_playlist(sql, system)
+        sql_time, sql_results = run(sql, labels)
+        snap_time, snap_results = run(snap, labels)
+        assert sql_results == snap_results, "snapshot results differ from SQL"
+
+        print(f"System: {system}, {snap.snapshot.rows} rows, "
+              f"snapshot ~{snap.snapshot.estimate_bytes() / (1024 * 1024):.1f} MB, loaded in {load_time * 1000:.0f} ms")
+        print(f"SQLite:   {sql_time:.3f}s ({ITEMS / sql_time:,.0f} items/s)")
+        print(f"Snapshot: {snap_time:.3f}s ({ITEMS / snap_time:,.0f} items/s)")
+        print(f"Speedup:  {sql_time / snap_time:.1f}x")
+
+        sql.db.close()
+        snap.db.close()
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
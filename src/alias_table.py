@@ -0,0 +1,82 @@
+import re
+import normalizer
+
+
+class AliasTable:
+    """
+    Substitution table compiled from name_alias(Chinese).json.
+
+    Every alternative spelling of a series name ("超级马力欧", "超级玛丽") is rewritten to
+    the series default ("超级马里奥"). Rules work on canonical Chinese keys (see
+    normalizer.chinese_key) and longer spellings win, so "超级玛丽" is rewritten as a
+    whole before "玛丽" could be. English titles listed in a series' exclude list are
+    left alone by that series' rules.
+    """
+
+    def __init__(self, rules=(), excludes=()):
+        """
+        rules: (alias, default, series) tuples, earlier rules win when an alias repeats.
+        excludes: (series, english_name) tuples.
+        """
+        self.rules = {}  # alias key -> (default key, series)
+        for alias, default, series in rules:
+            alias_key = normalizer.chinese_key(alias)
+            default_key = normalizer.chinese_key(default)
+            if alias_key and alias_key != default_key and alias_key not in self.rules:
+                self.rules[alias_key] = (default_key, series)
+
+        self.excludes = {}  # series -> normalized English title prefixes
+        for series, english_name in excludes:
+            norm = normalizer.normalize_name(english_name)
+            if norm:
+                self.excludes.setdefault(series, []).append(norm)
+
+        self.pattern = None
+        if self.rules:
+            spellings = sorted(self.rules, key=len, reverse=True)
+            self.pattern = re.compile('|'.join(re.escape(s) for s in spellings))
+
+    def __len__(self):
+        return len(self.rules)
+
+    @staticmethod
+    def parse(aliases_data):
+        """
+        Turns the parsed JSON ({series: {"alias": [...], "default": ..., "others": [...],
+        "exclude": [...]}}) into (rules, excludes) for the constructor.
+        A default that is not one of the aliases (a placeholder) is replaced by the first alias.
+        """
+        rules = []
+        excludes = []
+        for series, entry in aliases_data.items():
+            if not isinstance(entry, dict):
+                continue
+            spellings = list(entry.get('alias', [])) + list(entry.get('others', []))
+            if not spellings:
+                continue
+            default = entry.get('default')
+            if default not in spellings:
+                default = spellings[0]
+            rules.extend((spelling, default, series) for spelling in spellings)
+            excludes.extend((series, english_name) for english_name in entry.get('exclude', []))
+        return rules, excludes
+
+    def excluded_series(self, english_name):
+        """Series whose rules must not touch the Chinese name of english_name."""
+        if not english_name or not self.excludes:
+            return ()
+        norm = normalizer.normalize_name(english_name)
+        return {series for series, prefixes in self.excludes.items()
+                if any(norm.startswith(prefix) for prefix in prefixes)}
+
+    def rewrite(self, key, english_name=None):
+        """Rewrites alias spellings in a canonical Chinese key to their series default."""
+        if self.pattern is None or not key:
+            return key
+        excluded = self.excluded_series(english_name)
+
+        def substitute(match):
+            default, series = self.rules[match.group(0)]
+            return match.group(0) if series in excluded else default
+
+        return self.pattern.sub(substitute, key)
@@ -0,0 +1,229 @@
+import asyncio
+import collections
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from thumbnail_downloader import ThumbnailDownloader
+from log_stream import get_logger
+
+logger = get_logger("async_downloader")
+
+# Status codes that mean the server wants us to slow down
+THROTTLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit for one host, used from a single event loop. Every fast
+    response raises the limit by about one request per round trip (additive increase);
+    a 429/5xx, a connection error or a response slower than slow_latency halves it
+    (multiplicative decrease), at most once per round trip so a burst of failures in
+    flight does not collapse it to the minimum.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, target_latency=1.0, slow_latency=5.0):
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.slow_latency = slow_latency
+        self.active = 0
+        self.peak = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        # Futures of the requests waiting for a slot, woken in FIFO order
+        self._waiters = collections.deque()
+
+    async def acquire(self):
+        if self.active < int(self.limit) and not self._waiters:
+            self._take()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Woken and cancelled at the same time: hand the slot on
+            if waiter.done() and not waiter.cancelled():
+                self.active -= 1
+                self._wake()
+            raise
+
+    def release(self, latency, throttled=False):
+        """Frees the slot of a finished request and adjusts the limit by its outcome."""
+        self.active -= 1
+        self.record(latency, throttled)
+        self._wake()
+
+    def _take(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def _wake(self):
+        while self._waiters and self.active < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def record(self, latency, throttled=False, now=None):
+        """Adjusts the limit for one finished request."""
+        now = time.monotonic() if now is None else now
+        if throttled or latency > self.slow_latency:
+            if now - self._last_decrease >= max(latency, self.target_latency):
+                self.limit = max(float(self.minimum), self.limit / 2)
+                self._last_decrease = now
+                self.decreases += 1
+        elif latency <= self.target_latency:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+
+
+class AsyncThumbnailDownloader(ThumbnailDownloader):
+    """
+    ThumbnailDownloader on an asyncio engine. One event loop thread schedules every
+    request: the three thumbnail types of a game are fetched concurrently, and the
+    requests to each host are bounded by an AdaptiveLimit of at most max_connections,
+    which is also the size of the keep-alive connection pool. The blocking requests
+    calls run in a thread pool of the same size, so the connections are reused.
+
+    download_thumbnail and download_batch keep the ThumbnailDownloader interface and
+    may be called from any thread (DownloadPipeline workers, the batch I/O pool).
+    """
+
+    def __init__(self, thumbnails_dir, max_connections=16, initial_concurrency=4, retries=3, backoff=0.5,
+                 target_latency=1.0):
+        # Retries (and backing off) are done here, where 429/5xx also lower the limit
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections, max_retries=0)
+        super().__init__(thumbnails_dir, max_workers=max_connections, adapter=adapter)
+        self.max_connections = max_connections
+        self.initial_concurrency = initial_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.target_latency = target_latency
+        self.limits = {}
+
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro):
+        """Runs a coroutine on the engine's loop and waits for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def close(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def _limit_for(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        limit = self.limits.get(host)
+        if limit is None:
+            limit = AdaptiveLimit(initial=self.initial_concurrency, maximum=self.max_connections,
+                                  target_latency=self.target_latency)
+            self.limits[host] = limit
+        return limit
+
+    def _get_to_file(self, url, system, type_name, server_filename, target_path):
+        """Blocking GET in an executor thread; the image is saved there too. Returns (status, retry_after)."""
+        response = self.session.get(url, timeout=10)
+        if response.status_code == 200:
+            self.save_image(system, type_name, server_filename, response.content, target_path)
+        return response.status_code, response.headers.get('Retry-After')
+
+    async def _fetch(self, system, type_name, game_english_name, game_chinese_name):
+        target_path = self.target_path(system, type_name, game_chinese_name)
+        if os.path.exists(target_path):
+            return f"Successfully skipped {type_name}: {game_chinese_name} (已存在)"
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+        loop = asyncio.get_running_loop()
+        # The first lookup of a system/type may fetch its listing
+        server_filename = await loop.run_in_executor(self._executor, self.server_filename, system, type_name,
+                                                     game_english_name)
+        if server_filename is None:
+            return f"Failed {type_name}: not on the server"
+        if await loop.run_in_executor(self._executor, self.from_store, system, type_name, server_filename,
+                                      target_path):
+            return f"Successfully linked {type_name}: {game_chinese_name} (from store)"
+        url = self.thumbnail_url(system, type_name, server_filename)
+        limit = self._limit_for(url)
+        for attempt in range(self.retries + 1):
+            await limit.acquire()
+            start = time.monotonic()
+            try:
+                status, retry_after = await loop.run_in_executor(self._executor, self._get_to_file, url, system,
+                                                                 type_name, server_filename, target_path)
+            except Exception as e:
+                limit.release(time.monotonic() - start, throttled=True)
+                if attempt == self.retries:
+                    return f"Error {type_name}: {e}"
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            throttled = status in THROTTLE_STATUS
+            limit.release(time.monotonic() - start, throttled)
+            if status == 200:
+                return f"Successfully downloaded {type_name}: {game_chinese_name}"
+            if not throttled or attempt == self.retries:
+                return f"Failed {type_name}: HTTP {status}"
+            delay = self.backoff * 2 ** attempt
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+
+    async def fetch_thumbnail(self, system, game_english_name, game_chinese_name):
+        """The thumbnail types of one game, fetched concurrently. Returns the results in TYPES order."""
+        return list(await asyncio.gather(*(self._fetch(system, type_name, game_english_name, game_chinese_name)
+                                           for type_name in self.TYPES)))
+
+    def download_thumbnail(self, system, game_english_name, game_chinese_name):
+        return self._run(self.fetch_thumbnail(system, game_english_name, game_chinese_name))
+
+    def download_batch(self, tasks, progress_callback=None):
+        """Same contract as ThumbnailDownloader.download_batch, with every game scheduled at once."""
+        pending = [task for task in tasks if not self.is_complete(task[0], task[2])]
+        if len(pending) < len(tasks):
+            logger.info(f"Skipping {len(tasks) - len(pending)} item(s) with complete thumbnails")
+        if not pending:
+            return
+        logger.info(f"Starting batch download for {len(pending)} items "
+                    f"(asyncio, up to {self.max_connections} connections per host)...")
+        self._run(self._download_all(pending, progress_callback))
+
+    async def _download_all(self, tasks, progress_callback=None):
+        async def run(task):
+            try:
+                return task, await self.fetch_thumbnail(*task), None
+            except Exception as exc:
+                return task, None, exc
+
+        total = len(tasks)
+        completed = 0
+        for future in asyncio.as_completed([run(task) for task in tasks]):
+            (system, en_name, cn_name), results, exc = await future
+            completed += 1
+            if exc is None:
+                message = self.summarize_results(cn_name, results)
+            else:
+                message = f"✗ {cn_name} - 错误: {str(exc)}"
+                logger.error(f"[{completed}/{total}] Error processing {cn_name}: {exc}")
+            if progress_callback:
+                progress_callback(completed, total, message)
@@ -0,0 +1,166 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from database import DatabaseManager
+from translator import TierStats
+from translator_pool import translator_pool
+from thumbnail_downloader import create_downloader
+from log_stream import LOGGER_NAME, get_logger, setup_logging
+
+logger = get_logger("batch_runner")
+
+
+def _init_worker(use_snapshot, log_level):
+    """Runs once in each worker process; its translator pool stays warm across playlists."""
+    setup_logging(log_level)
+    translator_pool.use_snapshot = use_snapshot
+
+
+def analyze_for_batch(playlist_path, system_name, rom_name_cn_path, config=None, db_path=None):
+    """Analyzes one playlist (in a worker process when --jobs > 1). Returns (changes, stats)."""
+    import plcn
+    from fuzzy_budget import FuzzyBudget
+    stats = {}
+    config = config or {}
+    changes = plcn.analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=stats,
+                                    fuzzy_budget=FuzzyBudget.from_config(config),
+                                    incremental=config.get("incremental", True), db_path=db_path)
+    return changes, stats
+
+
+def _prepare_database(rom_name_cn_path, db_path):
+    """
+    Imports the CSVs into the workers' database once before they start, so they do not
+    all find an empty database and import it at the same time.
+    """
+    from translator import Translator
+    translator = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False)
+    translator.db.close()
+
+
+class BatchProgress:
+    """
+    Progress over a whole batch: one unit per playlist analyzed and per thumbnail
+    downloaded. The total grows as analyses finish and their downloads are queued.
+    """
+
+    def __init__(self, playlists, callback=None):
+        self.playlists = playlists
+        self.analyzed = 0
+        self.downloads = 0
+        self.downloaded = 0
+        self.callback = callback
+        self.lock = threading.Lock()
+
+    def playlist_done(self, message, downloads=0):
+        with self.lock:
+            self.analyzed += 1
+            self.downloads += downloads
+            logger.info(f"[{self.summary()}] {message}")
+            self._report(message)
+
+    def download_done(self, message):
+        with self.lock:
+            self.downloaded += 1
+            self._report(message)
+
+    def summary(self):
+        return (f"{self.analyzed}/{self.playlists} playlists, "
+                f"{self.downloaded}/{self.downloads} thumbnails")
+
+    def _report(self, message):
+        if self.callback:
+            self.callback(self.analyzed + self.downloaded, self.playlists + self.downloads,
+                          f"[{self.summary()}] {message}")
+
+
+def run_batch(playlists, thumbnails_dir, rom_name_cn_path, jobs=1, config=None, progress_callback=None, cancel=None,
+              db_path=None):
+    """
+    Processes [(playlist_path, system_name), ...]. With jobs > 1 the playlists are analyzed
+    in a process pool (spawned workers, each with its own warm translators); labels are
+    written in this process as each analysis finishes and its thumbnails go to one shared
+    download thread pool, so downloads of one playlist overlap the analysis of the next.
+
+    progress_callback(done, total, message) gets BatchProgress updates. Once the optional
+    cancel event is set, no further playlists are analyzed and queued downloads are dropped.
+    Every process uses the database at db_path (default: plcn.db in the working directory).
+    Returns {'playlists', 'failed', 'stats'} with the merged tier statistics.
+    """
+    import plcn
+
+    compact = (config or {}).get("compact_playlists", False)
+    # Resolved here, so the workers and this process open the same file
+    db_path = os.path.abspath(db_path or DatabaseManager.DB_FILE)
+    progress = BatchProgress(len(playlists), progress_callback)
+    downloader = create_downloader(thumbnails_dir, config)
+    totals = TierStats()
+    failed = []
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    io_pool = ThreadPoolExecutor(max_workers=downloader.max_workers)
+
+    def download(system, english_name, chinese_name):
+        results = downloader.download_thumbnail(system, english_name, chinese_name)
+        progress.download_done(downloader.summarize_results(chinese_name, results))
+
+    def apply(playlist_path, system_name, changes, stats):
+        download_tasks = [task for task in plcn.apply_labels(playlist_path, changes, compact=compact, db_path=db_path)
+                          if not downloader.is_complete(task[0], task[2])]
+        totals.merge(stats)
+        translator_pool.merge_stats(system_name, stats)
+        progress.playlist_done(f"Processed {os.path.basename(playlist_path)}", len(download_tasks))
+        for task in download_tasks:
+            io_pool.submit(download, *task)
+
+    def record_failure(playlist_path, error):
+        logger.error(f"Error processing {os.path.basename(playlist_path)}: {error}")
+        failed.append(playlist_path)
+        progress.playlist_done(f"Failed {os.path.basename(playlist_path)}")
+
+    try:
+        if jobs <= 1:
+            for playlist_path, system_name in playlists:
+                if cancelled():
+                    break
+                try:
+                    changes, stats = analyze_for_batch(playlist_path, system_name, rom_name_cn_path, config, db_path)
+                    apply(playlist_path, system_name, changes, stats)
+                except Exception as e:
+                    record_failure(playlist_path, e)
+        else:
+            _prepare_database(rom_name_cn_path, db_path)
+            log_level = logging.getLogger(LOGGER_NAME).getEffectiveLevel()
+            # spawn: workers must not inherit the logging thread and open connections of this process
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker,
+                                     initargs=(translator_pool.use_snapshot, log_level)) as pool:
+                futures = {
+                    pool.submit(analyze_for_batch, playlist_path, system_name, rom_name_cn_path, config, db_path):
+                        (playlist_path, system_name)
+                    for playlist_path, system_name in playlists
+                }
+                for future in as_completed(futures):
+                    if cancelled():
+                        pool.shutdown(cancel_futures=True)
+                        break
+                    playlist_path, system_name = futures[future]
+                    try:
+                        changes, stats = future.result()
+                        apply(playlist_path, system_name, changes, stats)
+                    except Exception as e:
+                        record_failure(playlist_path, e)
+    finally:
+        io_pool.shutdown(wait=True, cancel_futures=cancelled())
+        downloader.close()
+
+    logger.info(f"Batch finished: {progress.summary()}")
+    return {
+        'playlists': len(playlists),
+        'failed': failed,
+        'stats': totals.snapshot()
+    }
@@ -4,10 +4,21 @@ import csv
 import glob
 import json
 import re
+import normalizer
+import fuzzy_budget
+from ngram_index import NgramIndex
+from deletion_index import DeletionIndex
+from alias_table import AliasTable
+from name_parser import parse_name, pack_tags, parsed_from_row, rank_candidate
+from log_stream import get_logger
+
+logger = get_logger("database")
 
 class DatabaseManager:
     DB_FILE = "plcn.db"
-    
+
+    # Parsed name tags stored next to each translation (see name_parser.parse_name)
+    TAG_COLUMNS = ('base_title', 'regions', 'languages', 'revision', 'disc', 'flags')
     
     # System mappings for known discrepancies
     SYSTEM_MAPPINGS = {
@@ -55,6 +66,9 @@ class DatabaseManager:
         self.conn = None
         self.english_names_cache = None
         self.chinese_names_cache = None
+        self.chinese_index_cache = {}  # system -> NgramIndex over Chinese names
+        self.english_index_cache = {}  # system -> (normalized -> (english, chinese), DeletionIndex)
+        self.alias_table = None  # AliasTable loaded from the chinese_aliases tables on first use
         self.init_db()
     
     def expand_system_mapping(self, system):
@@ -80,6 +94,14 @@ class DatabaseManager:
             
         return systems
 
+    def system_clause(self, system, column='system'):
+        """Returns (WHERE clause, params) restricting column to the expanded systems of system ('' if None)."""
+        if not system:
+            return '', []
+        systems = self.expand_system_mapping(system)
+        placeholders = ' OR '.join([f'{column} LIKE ?' for _ in systems])
+        return f'WHERE ({placeholders})', [f'{s}%' for s in systems]
+
     def get_connection(self):
         if self.conn is None:
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
@@ -97,9 +119,18 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 english_name TEXT NOT NULL UNIQUE,
                 chinese_name TEXT NOT NULL,
-                system TEXT
+                system TEXT,
+                base_title TEXT,
+                regions TEXT,
+                languages TEXT,
+                revision TEXT,
+                disc INTEGER,
+                flags TEXT,
+                chinese_key TEXT
             )
         ''')
+        self._migrate_tag_columns(cursor)
+        self._migrate_chinese_key(cursor)
         
         # Table: aliases
         cursor.execute('''
@@ -115,7 +146,40 @@ class DatabaseManager:
         # Indexes for speed
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_english ON translations(english_name)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_chinese ON translations(chinese_name)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_translations_chinese_key ON translations(chinese_key)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_aliases_normalized ON aliases(normalized_alias)')
+
+        # Tables: Chinese series aliases from name_alias(Chinese).json
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chinese_aliases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                alias TEXT NOT NULL UNIQUE,
+                default_name TEXT NOT NULL,
+                series TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chinese_alias_excludes (
+                series TEXT NOT NULL,
+                english_name TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chinese_alias_excludes_series ON chinese_alias_excludes(series)')
+
+        # Table: per-item results of earlier analyses, so re-runs only resolve new or changed items
+        self._migrate_item_fingerprints(cursor)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS item_fingerprints (
+                playlist TEXT NOT NULL,
+                path TEXT NOT NULL,
+                system TEXT NOT NULL,
+                data_version TEXT NOT NULL,
+                label TEXT,
+                new_label TEXT,
+                thumbnail_source TEXT,
+                PRIMARY KEY (playlist, path)
+            )
+        ''')
         
         # FTS Table (Virtual Table)
         try:
@@ -141,33 +205,146 @@ class DatabaseManager:
                 END;
             ''')
         except sqlite3.OperationalError:
-            print("Warning: FTS5 not supported by this SQLite version. Manual search might be slower.")
+            logger.warning("Warning: FTS5 not supported by this SQLite version. Manual search might be slower.")
+
+        conn.commit()
+
+    def _migrate_tag_columns(self, cursor):
+        """Adds the parsed name tag columns to databases created by older versions and fills them."""
+        cursor.execute("PRAGMA table_info(translations)")
+        existing = {row[1] for row in cursor.fetchall()}
+        missing = [col for col in self.TAG_COLUMNS if col not in existing]
+        if not missing:
+            return
+
+        for col in missing:
+            col_type = 'INTEGER' if col == 'disc' else 'TEXT'
+            cursor.execute(f'ALTER TABLE translations ADD COLUMN {col} {col_type}')
+
+        cursor.execute('SELECT id, english_name FROM translations')
+        rows = cursor.fetchall()
+        if rows:
+            logger.info(f"Parsing name tags for {len(rows)} existing translations...")
+            cursor.executemany(
+                'UPDATE translations SET base_title = ?, regions = ?, languages = ?, revision = ?, disc = ?, flags = ? WHERE id = ?',
+                [self._tag_values(row[1]) + (row[0],) for row in rows]
+            )
+
+    def _migrate_item_fingerprints(self, cursor):
+        """
+        Drops fingerprint tables of older versions, which stored the display label instead
+        of the item's label. They only hold cached results, the items are resolved again.
+        """
+        cursor.execute("PRAGMA table_info(item_fingerprints)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if columns and 'label' not in columns:
+            cursor.execute('DROP TABLE item_fingerprints')
+
+    def _migrate_chinese_key(self, cursor):
+        """Adds the canonical Chinese key column to databases created by older versions and fills it."""
+        cursor.execute("PRAGMA table_info(translations)")
+        if 'chinese_key' in {row[1] for row in cursor.fetchall()}:
+            return
+
+        cursor.execute('ALTER TABLE translations ADD COLUMN chinese_key TEXT')
+        cursor.execute('SELECT id, chinese_name FROM translations')
+        rows = cursor.fetchall()
+        if rows:
+            logger.info(f"Computing Chinese keys for {len(rows)} existing translations...")
+            cursor.executemany(
+                'UPDATE translations SET chinese_key = ? WHERE id = ?',
+                [(normalizer.chinese_key(row[1]), row[0]) for row in rows]
+            )
+
+    def get_alias_table(self):
+        """Returns the AliasTable built from the chinese_aliases tables (cached until import_aliases)."""
+        if self.alias_table is None:
+            cursor = self.get_connection().cursor()
+            cursor.execute('SELECT alias, default_name, series FROM chinese_aliases ORDER BY id')
+            rules = [tuple(row) for row in cursor.fetchall()]
+            cursor.execute('SELECT series, english_name FROM chinese_alias_excludes')
+            excludes = [tuple(row) for row in cursor.fetchall()]
+            self.alias_table = AliasTable(rules, excludes)
+        return self.alias_table
+
+    def has_chinese_aliases(self):
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT 1 FROM chinese_aliases LIMIT 1')
+        return cursor.fetchone() is not None
+
+    def chinese_key(self, chinese_name, english_name=None):
+        """
+        Canonical Chinese key with series alias spellings folded to their default
+        (unless english_name is excluded from that series).
+        """
+        return self.get_alias_table().rewrite(normalizer.chinese_key(chinese_name), english_name)
+
+    def import_aliases(self, rom_name_cn_path):
+        """
+        Compiles name_alias(Chinese).json into the chinese_aliases tables and recomputes the
+        Chinese keys of existing translations with the new rules.
+        """
+        alias_file = os.path.join(rom_name_cn_path, "name_alias(Chinese).json")
+        if not os.path.exists(alias_file):
+            return
+        try:
+            with open(alias_file, 'r', encoding='utf-8') as f:
+                aliases_data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading alias file: {e}")
+            return
 
+        rules, excludes = AliasTable.parse(aliases_data)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM chinese_aliases')
+        cursor.execute('DELETE FROM chinese_alias_excludes')
+        cursor.executemany('INSERT OR IGNORE INTO chinese_aliases (alias, default_name, series) VALUES (?, ?, ?)', rules)
+        cursor.executemany('INSERT INTO chinese_alias_excludes (series, english_name) VALUES (?, ?)', excludes)
+        self.alias_table = None
+
+        cursor.execute('SELECT id, english_name, chinese_name, chinese_key FROM translations')
+        updates = []
+        for row in cursor.fetchall():
+            key = self.chinese_key(row[2], row[1])
+            if key != row[3]:
+                updates.append((key, row[0]))
+        cursor.executemany('UPDATE translations SET chinese_key = ? WHERE id = ?', updates)
         conn.commit()
+        logger.info(f"Loaded {len(self.get_alias_table())} Chinese alias spellings.")
+
+    def _tag_values(self, english_name):
+        """Parses an English name into the values stored in the tag columns."""
+        parsed = parse_name(english_name)
+        return (parsed.base, pack_tags(parsed.regions), pack_tags(parsed.languages),
+                parsed.revision, parsed.disc, pack_tags(parsed.flags))
+
+    def _insert_translation(self, cursor, english_name, chinese_name, system_name):
+        """Inserts a translation row together with its parsed name tags and canonical Chinese key."""
+        cursor.execute('''
+            INSERT OR IGNORE INTO translations (english_name, chinese_name, system, base_title, regions, languages, revision, disc, flags, chinese_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (english_name, chinese_name, system_name) + self._tag_values(english_name) +
+             (self.chinese_key(chinese_name, english_name),))
 
     def import_csvs(self, rom_name_cn_path):
         """Imports data from CSV files into the database."""
         if not os.path.exists(rom_name_cn_path):
-            print(f"Error: CSV path not found: {rom_name_cn_path}")
+            logger.error(f"Error: CSV path not found: {rom_name_cn_path}")
             return
 
-        print(f"Importing CSVs from {rom_name_cn_path} into SQLite...")
+        logger.info(f"Importing CSVs from {rom_name_cn_path} into SQLite...")
         conn = self.get_connection()
         cursor = conn.cursor()
         
         # Invalidate cache
         self.english_names_cache = None
         self.chinese_names_cache = None
+        self.chinese_index_cache = {}
+        self.english_index_cache = {}
         
-        # 1. Load Aliases from JSON if exists
-        alias_file = os.path.join(rom_name_cn_path, "name_alias(Chinese).json")
-        if os.path.exists(alias_file):
-            try:
-                with open(alias_file, 'r', encoding='utf-8') as f:
-                    aliases_data = json.load(f)
-                    pass
-            except Exception as e:
-                print(f"Error loading alias file: {e}")
+        # 1. Load Aliases from JSON if exists (Chinese keys of the rows below use them)
+        self.import_aliases(rom_name_cn_path)
 
         # 2. Load CSVs
         csv_files = glob.glob(os.path.join(rom_name_cn_path, "*.csv"))
@@ -207,10 +384,7 @@ class DatabaseManager:
                             
                             if english_name:
                                 try:
-                                    cursor.execute('''
-                                        INSERT OR IGNORE INTO translations (english_name, chinese_name, system)
-                                        VALUES (?, ?, ?)
-                                    ''', (english_name, chinese_name, system_name))
+                                    self._insert_translation(cursor, english_name, chinese_name, system_name)
                                     norm_name = self.normalize_name(english_name)
                                     cursor.execute('''
                                         INSERT OR IGNORE INTO aliases (alias, english_name, normalized_alias)
@@ -238,10 +412,7 @@ class DatabaseManager:
                                 if mame_name and english_name:
                                     try:
                                         # Store EN Name as english_name, CN Name as chinese_name
-                                        cursor.execute('''
-                                            INSERT OR IGNORE INTO translations (english_name, chinese_name, system)
-                                            VALUES (?, ?, ?)
-                                        ''', (english_name, chinese_name, system_name))
+                                        self._insert_translation(cursor, english_name, chinese_name, system_name)
                                         
                                         # Add english name as alias
                                         norm_name = self.normalize_name(english_name)
@@ -270,10 +441,7 @@ class DatabaseManager:
                                 
                                 if english_name:
                                     try:
-                                        cursor.execute('''
-                                            INSERT OR IGNORE INTO translations (english_name, chinese_name, system)
-                                            VALUES (?, ?, ?)
-                                        ''', (english_name, chinese_name, system_name))
+                                        self._insert_translation(cursor, english_name, chinese_name, system_name)
                                         
                                         norm_name = self.normalize_name(english_name)
                                         cursor.execute('''
@@ -285,7 +453,7 @@ class DatabaseManager:
                                     except sqlite3.Error:
                                         pass
             except Exception as e:
-                print(f"Error processing {csv_file}: {e}")
+                logger.error(f"Error processing {csv_file}: {e}")
         
         # Rebuild FTS index if needed (though triggers handle new inserts, existing data might need sync if table was empty but FTS wasn't)
         # For simplicity, we assume fresh import populates triggers.
@@ -296,31 +464,14 @@ class DatabaseManager:
             pass
             
         conn.commit()
-        print(f"Imported {count} entries into database.")
+        logger.info(f"Imported {count} entries into database.")
 
     def normalize_name(self, name):
         """
         Normalizes a game name for fuzzy matching.
-        Duplicated from Translator to ensure consistency in DB generation.
+        Uses the shared normalizer so DB generation and lookups stay consistent.
         """
-        import re
-        # Strategy 1: Aggressive
-        name_clean = re.sub(r'\[.*?\]', '', name)
-        name_clean = re.sub(r'\(.*?\)', '', name_clean)
-        name_clean = re.sub(r'\bCN\b', '', name_clean, flags=re.IGNORECASE)
-        name_clean = name_clean.replace('_', ' ').replace('.', ' ')
-        clean_name = re.sub(r'[^a-zA-Z0-9]', '', name_clean).lower()
-        
-        if clean_name:
-            return clean_name
-            
-        # Strategy 2: Fallback
-        name_fallback = name.replace('[', ' ').replace(']', ' ').replace('(', ' ').replace(')', ' ')
-        name_fallback = re.sub(r'\bCN\b', '', name_fallback, flags=re.IGNORECASE)
-        name_fallback = name_fallback.replace('_', ' ').replace('.', ' ')
-        clean_name_fallback = re.sub(r'[^a-zA-Z0-9]', '', name_fallback).lower()
-        
-        return clean_name_fallback
+        return normalizer.normalize_name(name)
 
     def search_by_english(self, english_name, system=None):
         cursor = self.get_connection().cursor()
@@ -348,74 +499,93 @@ class DatabaseManager:
                 placeholders = ' OR '.join(['system LIKE ?' for _ in systems])
                 query = f'SELECT english_name FROM translations WHERE chinese_name = ? AND ({placeholders})'
                 params = [chinese_name] + [f'{s}%' for s in systems]
-                print(f"      DB Query: chinese_name='{chinese_name}', systems={systems}")
+                logger.debug(f"DB Query: chinese_name='{chinese_name}', systems={systems}")
                 cursor.execute(query, params)
             else:
-                print(f"      DB Query: chinese_name='{chinese_name}', system LIKE '{systems[0]}%'")
+                logger.debug(f"DB Query: chinese_name='{chinese_name}', system LIKE '{systems[0]}%'")
                 cursor.execute('SELECT english_name FROM translations WHERE chinese_name = ? AND system LIKE ?', (chinese_name, f'{systems[0]}%'))
         else:
             cursor.execute('SELECT english_name FROM translations WHERE chinese_name = ?', (chinese_name,))
         row = cursor.fetchone()
         result = row['english_name'] if row else None
         if result:
-            print(f"      DB Result: Found '{result}'")
+            logger.debug(f"DB Result: Found '{result}'")
         else:
-            print(f"      DB Result: No match")
+            logger.debug(f"DB Result: No match")
         return result
 
-    def search_by_normalized_alias(self, normalized_name, system=None):
+    def search_by_chinese_key(self, chinese_name, system=None):
+        """
+        Looks up a Chinese name by its canonical key (see chinese_key), so labels differing
+        only in width, punctuation, spacing, bracketed tags or series alias spelling still hit.
+        The unfolded key is tried as well, for titles excluded from an alias series.
+        Returns (chinese_name, english_name) of the first matching row, or None.
+        """
+        raw_key = normalizer.chinese_key(chinese_name)
+        if not raw_key:
+            return None
+        key = self.get_alias_table().rewrite(raw_key)
+
+        cursor = self.get_connection().cursor()
+        if system:
+            systems = self.expand_system_mapping(system)
+            if len(systems) > 1:
+                placeholders = ' OR '.join(['system LIKE ?' for _ in systems])
+                query = f'SELECT chinese_name, english_name FROM translations WHERE chinese_key IN (?, ?) AND ({placeholders}) ORDER BY id'
+                params = [key, raw_key] + [f'{s}%' for s in systems]
+                cursor.execute(query, params)
+            else:
+                cursor.execute('SELECT chinese_name, english_name FROM translations WHERE chinese_key IN (?, ?) AND system LIKE ? ORDER BY id', (key, raw_key, f'{systems[0]}%'))
+        else:
+            cursor.execute('SELECT chinese_name, english_name FROM translations WHERE chinese_key IN (?, ?) ORDER BY id', (key, raw_key))
+        row = cursor.fetchone()
+        return (row['chinese_name'], row['english_name']) if row else None
+
+    def search_by_normalized_alias(self, normalized_name, system=None, regions=()):
+        """
+        Looks up a normalized alias. When several regional releases share the alias,
+        the stored region tags pick the best one (regions of the input first, then USA -> Europe -> Japan).
+        """
         cursor = self.get_connection().cursor()
         # Join to get chinese name directly
+        select = '''
+            SELECT t.chinese_name, t.english_name, t.base_title, t.regions, t.languages, t.revision, t.disc, t.flags
+            FROM aliases a
+            JOIN translations t ON a.english_name = t.english_name
+        '''
         if system:
             systems = self.expand_system_mapping(system)
             if len(systems) > 1:
                 # Multiple systems: use OR condition
                 placeholders = ' OR '.join(['t.system LIKE ?' for _ in systems])
-                query = f'''
-                    SELECT t.chinese_name, t.english_name 
-                    FROM aliases a
-                    JOIN translations t ON a.english_name = t.english_name
-                    WHERE a.normalized_alias = ? AND ({placeholders})
-                    LIMIT 1
-                '''
+                query = f'{select} WHERE a.normalized_alias = ? AND ({placeholders}) ORDER BY a.id'
                 params = [normalized_name] + [f'{s}%' for s in systems]
                 cursor.execute(query, params)
             else:
-                query = '''
-                    SELECT t.chinese_name, t.english_name 
-                    FROM aliases a
-                    JOIN translations t ON a.english_name = t.english_name
-                    WHERE a.normalized_alias = ? AND t.system LIKE ?
-                    LIMIT 1
-                '''
+                query = f'{select} WHERE a.normalized_alias = ? AND t.system LIKE ? ORDER BY a.id'
                 cursor.execute(query, (normalized_name, f'{systems[0]}%'))
         else:
-            query = '''
-                SELECT t.chinese_name, t.english_name 
-                FROM aliases a
-                JOIN translations t ON a.english_name = t.english_name
-                WHERE a.normalized_alias = ?
-                LIMIT 1
-            '''
+            query = f'{select} WHERE a.normalized_alias = ? ORDER BY a.id'
             cursor.execute(query, (normalized_name,))
-        row = cursor.fetchone()
-        return (row['chinese_name'], row['english_name']) if row else (None, None)
+        rows = cursor.fetchall()
+        if not rows:
+            return (None, None)
 
-    def fuzzy_search_by_english(self, query, threshold=50, system=None):
+        # max() keeps the first row on ties, so equally ranked releases resolve in insertion order
+        best = max(rows, key=lambda row: rank_candidate(parsed_from_row(*row[2:]), regions))
+        return (best['chinese_name'], best['english_name'])
+
+    def get_english_index(self, system=None):
         """
-        Fuzzy search for English name in the database using normalized matching.
-        Returns the Chinese name if a match is found with score >= threshold.
-        
-        Uses normalized names (alphanumeric only, lowercase) to better handle
-        variations like "1943kai" vs "1943 Kai" or "metalslug" vs "Metal Slug".
+        Returns (norm_map, index) for the English names of a system (all systems if None):
+        norm_map maps each normalized name to the (english_name, chinese_name) of its first row,
+        index is a DeletionIndex over those normalized names.
+        Built on first use and kept until the next import_csvs().
         """
-        try:
-            from rapidfuzz import process, fuzz
-        except ImportError:
-            print("rapidfuzz not installed, skipping fuzzy search")
-            return None
+        cached = self.english_index_cache.get(system)
+        if cached is not None:
+            return cached
 
-        # Build candidates list (optionally filtered by system)
         cursor = self.get_connection().cursor()
         if system:
             systems = self.expand_system_mapping(system)
@@ -428,76 +598,117 @@ class DatabaseManager:
                 cursor.execute('SELECT english_name, chinese_name FROM translations WHERE system LIKE ?', (f'{systems[0]}%',))
         else:
             cursor.execute('SELECT english_name, chinese_name FROM translations')
-        
+
         candidates = [(row[0], row[1]) for row in cursor.fetchall()]
+
+        # Create mapping: normalized_name -> (original_english, chinese)
+        norm_map = {}
+        norm_names = normalizer.normalize_many([eng for eng, _ in candidates])
+        for (eng, cn), norm_eng in zip(candidates, norm_names):
+            if norm_eng not in norm_map:
+                norm_map[norm_eng] = (eng, cn)
+
+        cached = (norm_map, DeletionIndex(norm_map.keys()))
+        self.english_index_cache[system] = cached
+        return cached
+
+    def fuzzy_search_by_english(self, query, threshold=50, system=None, budget=None):
+        """
+        Fuzzy search for English name in the database using normalized matching.
+        Returns the Chinese name if a match is found with score >= threshold.
         
-        if not candidates:
+        Uses normalized names (alphanumeric only, lowercase) to better handle
+        variations like "1943kai" vs "1943 Kai" or "metalslug" vs "Metal Slug".
+        Names within two edits of the query are found through the DeletionIndex first;
+        all names are scored only when none of those reach the threshold.
+        An optional ItemBudget (see fuzzy_budget) limits the candidates scored.
+        """
+        try:
+            from rapidfuzz import process, fuzz
+        except ImportError:
+            logger.warning("rapidfuzz not installed, skipping fuzzy search")
+            return None
+
+        norm_map, index = self.get_english_index(system)
+        if not norm_map:
             return None
         
         # Normalize query
         norm_query = self.normalize_name(query)
         
-        # Create mapping: normalized_name -> (original_english, chinese)
-        norm_map = {}
-        for eng, cn in candidates:
-            norm_eng = self.normalize_name(eng)
-            if norm_eng not in norm_map:
-                norm_map[norm_eng] = (eng, cn)
-        
-        # Fuzzy match on normalized names
-        norm_candidates = list(norm_map.keys())
-        result = process.extractOne(norm_query, norm_candidates, scorer=fuzz.ratio)
+        # Fuzzy match on normalized names, typo-distance neighbours first
+        nearby = [index.names[i] for i in index.lookup(norm_query)]
+        result = None
+        if nearby:
+            result = fuzzy_budget.extract_one(process, norm_query, nearby, fuzz.ratio, threshold, budget)
+        if not result:
+            result = fuzzy_budget.extract_one(process, norm_query, index.names, fuzz.ratio, threshold, budget)
         
         if result:
             match_norm, score, _ = result
             if score >= threshold:
                 original_eng, chinese = norm_map[match_norm]
-                print(f"Fuzzy match found: '{query}' (norm: '{norm_query}') -> '{original_eng}' (norm: '{match_norm}') (Score: {score})")
+                logger.debug(f"Fuzzy match found: '{query}' (norm: '{norm_query}') -> '{original_eng}' (norm: '{match_norm}') (Score: {score})")
                 return chinese
         
         return None
 
-    def fuzzy_search_by_chinese(self, query, threshold=65, system=None):
+    def get_chinese_index(self, system=None):
         """
-        Fuzzy search for Chinese name in the database.
-        Returns the English name if a match is found with score >= threshold.
+        Returns the bigram index over the Chinese names of a system (all systems if None).
+        Built on first use and kept until the next import_csvs().
         """
-        try:
-            from rapidfuzz import process, fuzz
-        except ImportError:
-            print("rapidfuzz not installed, skipping fuzzy search")
-            return None
+        index = self.chinese_index_cache.get(system)
+        if index is not None:
+            return index
 
-        # Build candidates list (optionally filtered by system)
         cursor = self.get_connection().cursor()
         if system:
             systems = self.expand_system_mapping(system)
             if len(systems) > 1:
                 placeholders = ' OR '.join(['system LIKE ?' for _ in systems])
-                query_sql = f'SELECT chinese_name FROM translations WHERE {placeholders}'
+                query_sql = f'SELECT chinese_name, english_name FROM translations WHERE {placeholders} ORDER BY id'
                 params = [f'{s}%' for s in systems]
                 cursor.execute(query_sql, params)
             else:
-                cursor.execute('SELECT chinese_name FROM translations WHERE system LIKE ?', (f'{systems[0]}%',))
+                cursor.execute('SELECT chinese_name, english_name FROM translations WHERE system LIKE ? ORDER BY id', (f'{systems[0]}%',))
         else:
-            cursor.execute('SELECT chinese_name FROM translations')
-        
-        candidates = [row[0] for row in cursor.fetchall()]
-        
-        if not candidates:
+            cursor.execute('SELECT chinese_name, english_name FROM translations ORDER BY id')
+
+        index = NgramIndex(cursor.fetchall())
+        self.chinese_index_cache[system] = index
+        return index
+
+    def fuzzy_search_by_chinese(self, query, threshold=65, system=None, budget=None):
+        """
+        Fuzzy search for Chinese name in the database.
+        Returns (chinese_name, english_name) if a match is found with score >= threshold.
+        Only names sharing a character bigram with the query are scored (see NgramIndex).
+        An optional ItemBudget (see fuzzy_budget) limits the candidates scored.
+        """
+        try:
+            from rapidfuzz import process, fuzz
+        except ImportError:
+            logger.warning("rapidfuzz not installed, skipping fuzzy search")
             return None
-            
+
+        index = self.get_chinese_index(system)
+        ids = index.shortlist(query)
+        if not ids:
+            return None
+
+        candidates = [index.names[i] for i in ids]
+
         # Extract best match
         # WRatio handles partial matches and other heuristics better for mixed content
-        result = process.extractOne(query, candidates, scorer=fuzz.WRatio)
-        
+        result = fuzzy_budget.extract_one(process, query, candidates, fuzz.WRatio, threshold, budget)
+
         if result:
-            match, score, _ = result
+            match, score, position = result
             if score >= threshold:
-                print(f"Fuzzy match (CN) found: '{query}' -> '{match}' (Score: {score})")
-                english_name = self.search_by_chinese(match, system=system)
-                return (match, english_name) if english_name else None
-        
+                logger.debug(f"Fuzzy match (CN) found: '{query}' -> '{match}' (Score: {score})")
+                return (match, index.english_names[ids[position]])
+
         return None
 
     def search_by_keyword(self, keyword, limit=20, system=None):
@@ -508,7 +719,7 @@ class DatabaseManager:
         try:
             from rapidfuzz import process, fuzz
         except ImportError:
-            print("rapidfuzz not installed, skipping search")
+            logger.warning("rapidfuzz not installed, skipping search")
             return []
 
         cursor = self.get_connection().cursor()
@@ -517,7 +728,7 @@ class DatabaseManager:
         # Determine if keyword is Chinese or English
         is_chinese = any(ord(c) >= 128 for c in keyword)
         
-        print(f"DEBUG search_by_keyword: keyword='{keyword}', system='{system}', is_chinese={is_chinese}")
+        logger.debug(f"search_by_keyword: keyword='{keyword}', system='{system}', is_chinese={is_chinese}")
         
         if is_chinese:
             # Build Chinese names cache (optionally filtered by system)
@@ -536,7 +747,7 @@ class DatabaseManager:
             candidates = [(row[0], row[1], row[2]) for row in cursor.fetchall()]
             chinese_names = [c[0] for c in candidates]
             
-            print(f"DEBUG search_by_keyword: Found {len(candidates)} candidates")
+            logger.debug(f"search_by_keyword: Found {len(candidates)} candidates")
             
             if not chinese_names:
                 return []
@@ -544,7 +755,7 @@ class DatabaseManager:
             # Fuzzy search on Chinese names
             matches = process.extract(keyword, chinese_names, scorer=fuzz.WRatio, limit=limit)
             
-            print(f"DEBUG search_by_keyword: Top 5 matches: {matches[:5]}")
+            logger.debug(f"search_by_keyword: Top 5 matches: {matches[:5]}")
             
             # Build results from matches
             for match_name, score, _ in matches:
@@ -575,7 +786,7 @@ class DatabaseManager:
             candidates = [(row[0], row[1], row[2]) for row in cursor.fetchall()]
             english_names = [c[0] for c in candidates]
             
-            print(f"DEBUG search_by_keyword: Found {len(candidates)} candidates")
+            logger.debug(f"search_by_keyword: Found {len(candidates)} candidates")
             
             if not english_names:
                 return []
@@ -595,7 +806,7 @@ class DatabaseManager:
                 # Use WRatio for better matching (handles partials, token sort, etc.)
                 matches = process.extract(keyword, english_names, scorer=fuzz.WRatio, limit=limit*2)
 
-            print(f"DEBUG search_by_keyword: Top matches (before filtering): {[(m[0], m[1]) for m in matches[:5]]}")
+            logger.debug(f"search_by_keyword: Top matches (before filtering): {[(m[0], m[1]) for m in matches[:5]]}")
             
             # Build results from matches
             count = 0
@@ -606,10 +817,10 @@ class DatabaseManager:
                 if is_short_query:
                     # For short queries, require word boundary match
                     if not keyword_regex.search(match_name):
-                        print(f"DEBUG search_by_keyword: Skipping '{match_name}' (score {score}) - failed word boundary check")
+                        logger.debug(f"search_by_keyword: Skipping '{match_name}' (score {score}) - failed word boundary check")
                         continue
                 
-                print(f"DEBUG search_by_keyword: Accepting match '{match_name}' with score {score}")
+                logger.debug(f"search_by_keyword: Accepting match '{match_name}' with score {score}")
                 
                 # Find the corresponding record
                 for en, cn, sys in candidates:
@@ -625,9 +836,47 @@ class DatabaseManager:
                 if count >= limit:
                     break
             
-        print(f"DEBUG search_by_keyword: Returning {len(results)} results")
+        logger.debug(f"search_by_keyword: Returning {len(results)} results")
         return results
 
+    def get_item_fingerprints(self, playlist, system, data_version):
+        """
+        Stored results for the items of a playlist that were resolved for this system
+        with this translation data version: {path: row}.
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute('''
+            SELECT path, label, new_label, thumbnail_source FROM item_fingerprints
+            WHERE playlist = ? AND system = ? AND data_version = ?
+        ''', (playlist, system, data_version))
+        return {row['path']: row for row in cursor.fetchall()}
+
+    def save_item_fingerprints(self, playlist, system, data_version, results):
+        """
+        Stores the analysis results [(label, change), ...] (keyed by playlist and item path),
+        label being the item's label in the playlist when it was analyzed.
+        """
+        rows = [(playlist, change['path'], system, data_version, label,
+                 change['new_label'], change['thumbnail_source'])
+                for label, change in results if change.get('path')]
+        conn = self.get_connection()
+        conn.executemany('''
+            INSERT OR REPLACE INTO item_fingerprints
+                (playlist, path, system, data_version, label, new_label, thumbnail_source)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+
+    def update_item_fingerprints(self, playlist, changes):
+        """Records the labels that were finally applied (they may have been edited after the analysis)."""
+        conn = self.get_connection()
+        conn.executemany('''
+            UPDATE item_fingerprints SET new_label = ?, thumbnail_source = ?
+            WHERE playlist = ? AND path = ?
+        ''', [(change['new_label'], change['thumbnail_source'], playlist, change['path'])
+              for change in changes if change.get('path')])
+        conn.commit()
+
     def close(self):
         if self.conn:
             self.conn.close()
@@ -0,0 +1,60 @@
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+
+class DeletionIndex:
+    """
+    Typo-tolerant lookup over normalized names (SymSpell-style deletion neighborhoods).
+
+    Every name prefix of up to prefix_length characters is stored under all the strings
+    obtainable by deleting up to max_distance characters from it. A query generates the
+    same deletions, so names within max_distance edits are found by hash lookups and only
+    those candidates are checked with a real Levenshtein distance.
+    """
+
+    def __init__(self, names, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.names = list(names)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.deletes = {}  # deletion string -> ids of names, ascending
+
+        for name_id, name in enumerate(self.names):
+            for variant in self._deletions(name[:prefix_length]):
+                self.deletes.setdefault(variant, []).append(name_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _deletions(self, word):
+        """word and every string obtained by deleting up to max_distance characters from it."""
+        result = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for variant in frontier:
+                for i in range(len(variant)):
+                    next_frontier.add(variant[:i] + variant[i + 1:])
+            next_frontier -= result
+            result |= next_frontier
+            frontier = next_frontier
+        return result
+
+    def lookup(self, query):
+        """Returns the ids of names within max_distance edits of query, in insertion order."""
+        if not query:
+            return []
+        from rapidfuzz.distance import Levenshtein
+
+        ids = set()
+        for variant in self._deletions(query[:self.prefix_length]):
+            ids.update(self.deletes.get(variant, ()))
+
+        max_distance = self.max_distance
+        matches = []
+        for name_id in sorted(ids):
+            name = self.names[name_id]
+            if abs(len(name) - len(query)) > max_distance:
+                continue
+            if Levenshtein.distance(query, name, score_cutoff=max_distance) <= max_distance:
+                matches.append(name_id)
+        return matches
@@ -0,0 +1,113 @@
+import time
+
+# Defaults used when config.json does not set a budget (None = unlimited).
+# Only the candidate cap is on by default: it is deterministic and above the size of any
+# single system's name list. The time budgets are opt-in, as they make the result depend
+# on how busy the machine is.
+DEFAULT_ITEM_MS = None
+DEFAULT_PLAYLIST_MS = None
+DEFAULT_MAX_CANDIDATES = 20000
+
+# Candidates scored per rapidfuzz call between budget checks
+CHUNK_SIZE = 512
+
+
+class FuzzyBudget:
+    """
+    Limits how much fuzzy matching a playlist analysis may do.
+
+    max_candidates and item_ms bound the fuzzy scoring done for a single item,
+    playlist_ms bounds the total fuzzy time of the whole playlist. Once a budget is
+    used up, the fuzzy tiers return the best match found so far (if any) and the
+    item is marked as deferred. By default only max_candidates is set.
+    """
+
+    def __init__(self, max_candidates=DEFAULT_MAX_CANDIDATES, item_ms=DEFAULT_ITEM_MS, playlist_ms=DEFAULT_PLAYLIST_MS):
+        self.max_candidates = max_candidates
+        self.item_ms = item_ms
+        self.playlist_ms = playlist_ms
+        self.spent = 0.0  # seconds of fuzzy scoring across the playlist
+        self.deferred_count = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Builds a budget from the fuzzy_* keys of config.json (or CLI overrides)."""
+        return cls(
+            max_candidates=config.get('fuzzy_max_candidates', DEFAULT_MAX_CANDIDATES),
+            item_ms=config.get('fuzzy_item_ms', DEFAULT_ITEM_MS),
+            playlist_ms=config.get('fuzzy_playlist_ms', DEFAULT_PLAYLIST_MS)
+        )
+
+    def item(self):
+        """Returns the budget for the next playlist item."""
+        return ItemBudget(self)
+
+    def playlist_exhausted(self):
+        return self.playlist_ms is not None and self.spent * 1000.0 >= self.playlist_ms
+
+
+class ItemBudget:
+    """Fuzzy budget of a single playlist item; see FuzzyBudget."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.scored = 0
+        self.spent = 0.0
+        self.deferred = False
+
+    def exhausted(self):
+        parent = self.parent
+        if parent.max_candidates is not None and self.scored >= parent.max_candidates:
+            return True
+        if parent.item_ms is not None and self.spent * 1000.0 >= parent.item_ms:
+            return True
+        return parent.playlist_exhausted()
+
+    def remaining_candidates(self):
+        if self.parent.max_candidates is None:
+            return None
+        return max(self.parent.max_candidates - self.scored, 0)
+
+    def charge(self, elapsed, scored):
+        self.spent += elapsed
+        self.scored += scored
+        self.parent.spent += elapsed
+
+    def defer(self):
+        if not self.deferred:
+            self.deferred = True
+            self.parent.deferred_count += 1
+
+
+def extract_one(process, query, choices, scorer, threshold, budget=None):
+    """
+    Like process.extractOne(query, choices, scorer=scorer) restricted to scores >= threshold,
+    but scores the choices in chunks and stops when the budget runs out.
+    Returns (match, score, index) or None. Ties resolve to the earliest choice, as in extractOne.
+    """
+    if budget is None:
+        return process.extractOne(query, choices, scorer=scorer, score_cutoff=threshold)
+
+    best = None
+    total = len(choices)
+    start = 0
+    while start < total:
+        if budget.exhausted():
+            budget.defer()
+            break
+
+        size = CHUNK_SIZE
+        remaining = budget.remaining_candidates()
+        if remaining is not None:
+            size = min(size, remaining)
+        chunk = choices[start:start + size]
+
+        began = time.perf_counter()
+        result = process.extractOne(query, chunk, scorer=scorer, score_cutoff=threshold)
+        budget.charge(time.perf_counter() - began, len(chunk))
+
+        if result and (best is None or result[1] > best[1]):
+            best = (result[0], result[1], start + result[2])
+        start += size
+
+    return best
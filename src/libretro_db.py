@@ -4,6 +4,16 @@ import urllib.request
 import urllib.parse
 import xml.etree.ElementTree as ET
 import re
+import normalizer
+import fuzzy_budget
+from name_parser import parse_name, rank_candidate
+from deletion_index import DeletionIndex
+from log_stream import get_logger
+
+logger = get_logger("libretro_db")
+
+_DAT_NAME_RE = re.compile(r'name\s+"(.*?)"')
+_DAT_DESC_RE = re.compile(r'description\s+"(.*?)"')
 
 class LibretroDB:
     # No system mappings needed - main DAT files contain all games
@@ -14,6 +24,8 @@ class LibretroDB:
         self.dat_dir = os.path.join(storage_path, "libretro-db", "dat")
         os.makedirs(self.dat_dir, exist_ok=True)
         self.standard_names = {} # normalized_name -> standard_english_name
+        self.name_tags = {} # standard_english_name -> ParsedName (parsed once at load time)
+        self.deletion_index = None # DeletionIndex over standard_names keys, built on first fuzzy lookup
         
     def get_dat_path(self, system_name):
         """Returns the path to the DAT file for the given system."""
@@ -33,13 +45,13 @@ class LibretroDB:
         target_path = self.get_dat_path(system_name)
         
         if specific_url:
-            print(f"Downloading DAT for {system_name} from specific URL: {specific_url}...")
+            logger.info(f"Downloading DAT for {system_name} from specific URL: {specific_url}...")
             try:
                 urllib.request.urlretrieve(specific_url, target_path)
-                print(f"Downloaded to {target_path}")
+                logger.info(f"Downloaded to {target_path}")
                 return True
             except Exception as e:
-                print(f"Failed to download from {specific_url}: {e}")
+                logger.error(f"Failed to download from {specific_url}: {e}")
                 return False
 
         # URL encode the system name for the URL
@@ -68,16 +80,16 @@ class LibretroDB:
         ])
         
         for url in base_urls:
-            print(f"Trying to download DAT for {system_name} from {url}...")
+            logger.debug(f"Trying to download DAT for {system_name} from {url}...")
             try:
                 urllib.request.urlretrieve(url, target_path)
-                print(f"Downloaded to {target_path}")
+                logger.info(f"Downloaded to {target_path}")
                 return True
             except Exception as e:
                 # print(f"Failed to download from {url}: {e}")
                 continue
                 
-        print(f"Failed to download DAT for {system_name} from all known locations.")
+        logger.error(f"Failed to download DAT for {system_name} from all known locations.")
         return False
             
     def load_system_dat(self, system_name):
@@ -85,30 +97,32 @@ class LibretroDB:
         For mapped systems (like FBNeo), loads all mapped system DATs plus the main system DAT."""
         
         self.standard_names = {} # Clear previous entries before loading new system(s)
+        self.name_tags = {}
+        self.deletion_index = None
         
         # Check if this is a mapped system
         base_system = system_name.split('(')[0].strip()
         
         if base_system in self.SYSTEM_MAPPINGS:
             # For mapped systems, try to load the main system DAT first
-            print(f"Loading main DAT for {base_system}...")
+            logger.info(f"Loading main DAT for {base_system}...")
             loaded_count = 0
             
             # Try loading the main system DAT (e.g., "FBNeo - Arcade Games")
             if self._load_single_dat(base_system):
                 loaded_count += 1
-                print(f"Loaded main {base_system} DAT")
+                logger.info(f"Loaded main {base_system} DAT")
             
             # Also load all mapped subsystems
             mapped_systems = self.SYSTEM_MAPPINGS[base_system]
-            print(f"Loading {len(mapped_systems)} subsystem DAT files...")
+            logger.info(f"Loading {len(mapped_systems)} subsystem DAT files...")
             
             for mapped_system in mapped_systems:
                 if self._load_single_dat(mapped_system):
                     loaded_count += 1
             
             total_entries = len(self.standard_names)
-            print(f"Loaded {loaded_count} DAT file(s) with {total_entries} total entries for {base_system}.")
+            logger.info(f"Loaded {loaded_count} DAT file(s) with {total_entries} total entries for {base_system}.")
             return loaded_count > 0
         else:
             # Single system
@@ -116,12 +130,12 @@ class LibretroDB:
             
             # Special handling for NEC - PC-98 to load Redump DAT as well
             if base_system == "NEC - PC-98":
-                print(f"Loading supplemental Redump DAT for {base_system}...")
+                logger.info(f"Loading supplemental Redump DAT for {base_system}...")
                 redump_system = f"{base_system} (Redump)"
                 redump_url = f"https://raw.githubusercontent.com/libretro/libretro-database/master/metadat/redump/{urllib.parse.quote(base_system)}.dat"
                 if self._load_single_dat(redump_system, specific_url=redump_url):
                     success = True
-                    print(f"Loaded Redump DAT for {base_system}")
+                    logger.info(f"Loaded Redump DAT for {base_system}")
             
             return success
     
@@ -131,7 +145,7 @@ class LibretroDB:
         
         # Check if DAT exists (either bundled or previously downloaded)
         if not os.path.exists(dat_path):
-            print(f"DAT file not found at {dat_path}, attempting download...")
+            logger.info(f"DAT file not found at {dat_path}, attempting download...")
             if not self.download_dat(system_name, specific_url=specific_url):
                 return False
                 
@@ -163,6 +177,8 @@ class LibretroDB:
                         # If we have a description, use it as the standard name (common for Arcade)
                         # Otherwise use the name
                         standard_name = current_desc if current_desc else current_name
+                        if standard_name not in self.name_tags:
+                            self.name_tags[standard_name] = parse_name(standard_name)
                         
                         # Store mapping: normalized(name) -> standard_name
                         # This allows looking up by zip name ("aof3") to get "Art of Fighting 3"
@@ -184,55 +200,32 @@ class LibretroDB:
                     current_block = None
                 elif current_block == 'game':
                     if line.startswith('name'):
-                        match = re.search(r'name\s+"(.*?)"', line)
+                        match = _DAT_NAME_RE.search(line)
                         if match:
                             current_name = match.group(1)
                     elif line.startswith('description'):
-                        match = re.search(r'description\s+"(.*?)"', line)
+                        match = _DAT_DESC_RE.search(line)
                         if match:
                             current_desc = match.group(1)
             
-            print(f"Loaded {len(self.standard_names)} normalized entries from {system_name}.dat")
+            logger.info(f"Loaded {len(self.standard_names)} normalized entries from {system_name}.dat")
             return True
         except Exception as e:
-            print(f"Error parsing DAT file {dat_path}: {e}")
+            logger.error(f"Error parsing DAT file {dat_path}: {e}")
             return False
             
     def normalize_name(self, name):
         """
         Normalizes a game name for fuzzy matching.
-        Same logic as Translator.normalize_name to ensure consistency.
+        Uses the shared normalizer, same as DatabaseManager and Translator.
         """
-        # Strategy 1: Aggressive (Remove content in brackets/parentheses)
-        name_clean = re.sub(r'\[.*?\]', '', name)
-        name_clean = re.sub(r'\(.*?\)', '', name_clean)
-        
-        # Remove 'CN' prefix/suffix
-        name_clean = re.sub(r'\bCN\b', '', name_clean, flags=re.IGNORECASE)
-        
-        # Replace underscores and dots
-        name_clean = name_clean.replace('_', ' ').replace('.', ' ')
-        
-        # Remove non-alphanumeric
-        clean_name = re.sub(r'[^a-zA-Z0-9]', '', name_clean).lower()
-        
-        if clean_name:
-            return clean_name
-            
-        # Strategy 2: Fallback
-        name_fallback = name
-        name_fallback = name_fallback.replace('[', ' ').replace(']', ' ').replace('(', ' ').replace(')', ' ')
-        name_fallback = re.sub(r'\bCN\b', '', name_fallback, flags=re.IGNORECASE)
-        name_fallback = name_fallback.replace('_', ' ').replace('.', ' ')
-        clean_name_fallback = re.sub(r'[^a-zA-Z0-9]', '', name_fallback).lower()
-        
-        return clean_name_fallback
+        return normalizer.normalize_name(name)
 
-    def get_standard_name(self, name):
+    def get_standard_name(self, name, budget=None):
         """
         Returns the standard English name for a given input name (fuzzy matched).
         Uses multiple strategies: exact match, prefix match, fuzzy match.
-        Returns None if no match found.
+        Returns None if no match found. An optional ItemBudget limits the fuzzy step.
         """
         if not self.standard_names:
             return None
@@ -248,27 +241,32 @@ class LibretroDB:
             for db_norm, db_names in self.standard_names.items():
                 if db_norm.startswith(norm_name) and len(norm_name) >= 4:  # Minimum 4 chars to avoid false positives
                     candidates = db_names
-                    print(f"LibretroDB prefix match: '{name}' (norm: '{norm_name}') -> '{db_norm}' -> '{db_names[0]}'")
+                    logger.debug(f"LibretroDB prefix match: '{name}' (norm: '{norm_name}') -> '{db_norm}' -> '{db_names[0]}'")
                     break
         
         if not candidates:
             # Strategy 3: Try fuzzy matching on normalized names
             try:
                 from rapidfuzz import process, fuzz
-                result = process.extractOne(
-                    norm_name,
-                    list(self.standard_names.keys()),
-                    scorer=fuzz.ratio
-                )
-                
-                if result and result[1] >= 80:  # High threshold for LibretroDB
-                    matched_norm = result[0]
-                    candidates = self.standard_names[matched_norm]
-                    print(f"LibretroDB fuzzy match: '{name}' (norm: '{norm_name}') -> '{matched_norm}' (Score: {result[1]})")
-                else:
-                    return None
             except ImportError:
                 return None
+
+            index = self.get_deletion_index()
+            # Names within two edits first, scanning everything only if none scores high enough
+            nearby = [index.names[i] for i in index.lookup(norm_name)]
+            result = None
+            if nearby:
+                # High threshold for LibretroDB
+                result = fuzzy_budget.extract_one(process, norm_name, nearby, fuzz.ratio, 80, budget)
+            if not result:
+                result = fuzzy_budget.extract_one(process, norm_name, index.names, fuzz.ratio, 80, budget)
+
+            if result and result[1] >= 80:
+                matched_norm = result[0]
+                candidates = self.standard_names[matched_norm]
+                logger.debug(f"LibretroDB fuzzy match: '{name}' (norm: '{norm_name}') -> '{matched_norm}' (Score: {result[1]})")
+            else:
+                return None
         
         if not candidates:
             return None
@@ -280,29 +278,24 @@ class LibretroDB:
         # If no region match, or no region in input, prefer USA -> Europe -> Japan -> World
         # Also prefer names WITHOUT "Anniversary Collection", "Mini", etc.
         
-        # Extract region from input name if possible
-        # Look for (Japan), (USA), (Europe), etc.
-        regions = re.findall(r'\((.*?)\)', name)
-        region = regions[-1] if regions else None
+        # Use the region of the input name if it has one, e.g. "(Japan)"
+        regions = parse_name(name).regions
         
         def score_candidate(c):
-            score = 0
-            if region and region in c:
-                score += 100
-            if "USA" in c: score += 50
-            elif "Europe" in c: score += 40
-            elif "Japan" in c: score += 30
-            
-            # Penalize collections/minis as they usually don't have individual thumbnails
-            if "Anniversary Collection" in c: score -= 500
-            if "Mini" in c: score -= 500
-            if "Virtual Console" in c: score -= 500
-            
-            return score
+            parsed = self.name_tags.get(c)
+            if parsed is None:
+                parsed = self.name_tags[c] = parse_name(c)
+            return rank_candidate(parsed, regions)
             
         candidates.sort(key=score_candidate, reverse=True)
         return candidates[0]
 
+    def get_deletion_index(self):
+        """DeletionIndex over the normalized names of the loaded DATs."""
+        if self.deletion_index is None or len(self.deletion_index) != len(self.standard_names):
+            self.deletion_index = DeletionIndex(self.standard_names.keys())
+        return self.deletion_index
+
     def search(self, keyword, limit=20):
         """
         Searches for standard names matching the keyword.
@@ -0,0 +1,118 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from collections import deque
+
+# All PLCN loggers live under this name: get_logger("translator") -> "plcn.translator"
+LOGGER_NAME = "plcn"
+LOG_BUFFER_SIZE = 2000
+
+
+def get_logger(name):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def level_from_flags(quiet=False, verbose=False):
+    """--quiet shows warnings and errors only, --verbose adds the per-item debug messages."""
+    if verbose:
+        return logging.DEBUG
+    if quiet:
+        return logging.WARNING
+    return logging.INFO
+
+
+class LogBuffer(logging.Handler):
+    """
+    Keeps the most recent log records in memory so the web UI can show the same
+    stream as the console. Each record gets an increasing sequence number; readers
+    ask for the records after the last one they have seen.
+    """
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.seq = 0
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.seq += 1
+        self.records.append({
+            'seq': self.seq,
+            'time': record.created,
+            'level': record.levelname,
+            'message': message
+        })
+
+    def since(self, seq=0, limit=None):
+        """Records with a sequence number greater than seq, oldest first."""
+        self.acquire()
+        try:
+            records = [r for r in self.records if r['seq'] > seq]
+        finally:
+            self.release()
+        if limit is not None:
+            records = records[-limit:]
+        return records
+
+    def last_seq(self):
+        self.acquire()
+        try:
+            return self.seq
+        finally:
+            self.release()
+
+
+log_buffer = LogBuffer()
+_listener = None
+_queue_handler = None
+
+
+def setup_logging(level=None):
+    """
+    Routes the plcn loggers through a queue: callers only enqueue records, and a
+    background QueueListener writes them to stdout and the in-memory LogBuffer, so
+    hot loops never block on console I/O. Calling it again only changes the level;
+    level None keeps the current one (INFO if none was set).
+    """
+    global _listener, _queue_handler
+    logger = logging.getLogger(LOGGER_NAME)
+    if level is not None:
+        logger.setLevel(level)
+    elif logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    if _listener is not None:
+        return
+
+    formatter = logging.Formatter('%(message)s')
+    handlers = [log_buffer]
+    log_buffer.setFormatter(formatter)
+    # Windowed PyInstaller builds have no console
+    if sys.stdout is not None:
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(formatter)
+        handlers.insert(0, console)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Writes out queued records and stops the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger(LOGGER_NAME).removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
@@ -0,0 +1,124 @@
+import re
+from collections import namedtuple
+
+# Parsed representation of a No-Intro / Redump style title, e.g.
+#   "Final Fantasy VII (USA) (Disc 1) (Rev 1)"
+#   -> ParsedName(base='Final Fantasy VII', regions=('USA',), languages=(),
+#                 revision='Rev 1', disc=1, flags=())
+# Tuples keep the records small and hashable so they can be cached per DAT entry.
+ParsedName = namedtuple('ParsedName', ['base', 'regions', 'languages', 'revision', 'disc', 'flags'])
+
+REGIONS = {
+    'World', 'USA', 'Europe', 'Japan', 'Asia', 'Australia', 'Brazil', 'Canada', 'China',
+    'Denmark', 'Finland', 'France', 'Germany', 'Greece', 'Hong Kong', 'Italy', 'Korea',
+    'Mexico', 'Netherlands', 'New Zealand', 'Norway', 'Poland', 'Portugal', 'Russia',
+    'Scandinavia', 'Spain', 'Sweden', 'Taiwan', 'UK', 'United Kingdom', 'Latin America',
+    'Austria', 'Belgium', 'Switzerland', 'India', 'South Africa', 'Unknown',
+}
+
+# Preferred regions when nothing better is known (higher is better)
+REGION_PREFERENCE = {'USA': 50, 'Europe': 40, 'Japan': 30}
+
+# Releases that usually have no individual thumbnails on the libretro server
+PENALIZED_MARKERS = ('Anniversary Collection', 'Mini', 'Virtual Console')
+
+_GROUP_RE = re.compile(r'\(([^()]*)\)|\[([^\[\]]*)\]')
+_LANGUAGE_RE = re.compile(r'^[A-Z][a-z](?:-[A-Z][a-z]+)?$')
+_REVISION_RE = re.compile(r'^(?:Rev\s*[\w.]+|v\s*\d[\w.]*)$', re.IGNORECASE)
+_DISC_RE = re.compile(r'^Dis[ck]\s*(\d+)(?:\s*of\s*\d+)?$', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def parse_name(name):
+    """
+    Splits a game title into base title, regions, languages, revision, disc number and flags.
+    Tags that are not recognised are kept verbatim in flags. Collection markers such as
+    "Virtual Console" are also added to flags when they appear in the base title.
+    """
+    if not name:
+        return ParsedName('', (), (), None, None, ())
+
+    regions = []
+    languages = []
+    revision = None
+    disc = None
+    flags = []
+
+    for match in _GROUP_RE.finditer(name):
+        group = match.group(1) if match.group(1) is not None else match.group(2)
+        parts = [p.strip() for p in group.split(',')]
+
+        if parts and all(p in REGIONS for p in parts):
+            regions.extend(parts)
+            continue
+        if parts and all(_LANGUAGE_RE.match(p) for p in parts):
+            languages.extend(parts)
+            continue
+
+        group = group.strip()
+        disc_match = _DISC_RE.match(group)
+        if disc_match:
+            disc = int(disc_match.group(1))
+            continue
+        if revision is None and _REVISION_RE.match(group):
+            revision = group
+            continue
+
+        # Arcade style "(World 900227)" / "(USA 920313)": region followed by a date code
+        first, _, rest = group.partition(' ')
+        if first in REGIONS and rest[:1].isdigit():
+            regions.append(first)
+            flags.append(rest)
+            continue
+
+        flags.append(group)
+
+    base = _WHITESPACE_RE.sub(' ', _GROUP_RE.sub('', name)).strip()
+
+    for marker in PENALIZED_MARKERS:
+        if marker in base and marker not in flags:
+            flags.append(marker)
+
+    return ParsedName(base, tuple(regions), tuple(languages), revision, disc, tuple(flags))
+
+
+def is_penalized(parsed):
+    """True if the title is a collection/mini/virtual console release."""
+    for flag in parsed.flags:
+        for marker in PENALIZED_MARKERS:
+            if marker in flag:
+                return True
+    return False
+
+
+def rank_candidate(parsed, preferred_regions=()):
+    """
+    Scores a parsed candidate title for region preference.
+    A region matching the input wins, then USA -> Europe -> Japan,
+    and collection/mini releases are pushed to the bottom.
+    """
+    score = 0
+    if preferred_regions and any(r in parsed.regions for r in preferred_regions):
+        score += 100
+    for region in ('USA', 'Europe', 'Japan'):
+        if region in parsed.regions:
+            score += REGION_PREFERENCE[region]
+            break
+    if is_penalized(parsed):
+        score -= 500
+    return score
+
+
+def pack_tags(values):
+    """Joins a tuple of tags into the compact '|' separated form stored in the database."""
+    return '|'.join(values) if values else ''
+
+
+def unpack_tags(text):
+    """Inverse of pack_tags."""
+    return tuple(text.split('|')) if text else ()
+
+
+def parsed_from_row(base, regions, languages, revision, disc, flags):
+    """Rebuilds a ParsedName from the tag columns of the translations table."""
+    return ParsedName(base or '', unpack_tags(regions), unpack_tags(languages), revision or None, disc, unpack_tags(flags))
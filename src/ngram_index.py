@@ -0,0 +1,50 @@
+class NgramIndex:
+    """
+    In-memory character bigram inverted index over Chinese names.
+
+    Each distinct name is stored once together with the English name of its first row,
+    so a fuzzy hit can be mapped back to English without another query. shortlist()
+    returns the names sharing at least one bigram with the query, in insertion order,
+    so scoring the shortlist resolves ties like a scan over all names would.
+    """
+
+    def __init__(self, rows):
+        self.names = []
+        self.english_names = []
+        self.postings = {}  # bigram -> ids in ascending order
+
+        seen = set()
+        for chinese_name, english_name in rows:
+            if not chinese_name or chinese_name in seen:
+                continue
+            seen.add(chinese_name)
+            name_id = len(self.names)
+            self.names.append(chinese_name)
+            self.english_names.append(english_name)
+            for gram in self.grams(chinese_name):
+                self.postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def grams(text):
+        """Distinct bigrams of text, ignoring case, whitespace and punctuation."""
+        chars = [c for c in text.lower() if c.isalnum()]
+        if len(chars) == 1:
+            return {chars[0]}
+        return {chars[i] + chars[i + 1] for i in range(len(chars) - 1)}
+
+    def shortlist(self, query):
+        """Returns the ids of names sharing a bigram with query, in insertion order."""
+        grams = self.grams(query)
+        if len(grams) == 1:
+            # Single character query: names containing it
+            char = next(iter(grams))
+            if len(char) == 1:
+                return [i for i, name in enumerate(self.names) if char in name.lower()]
+
+        ids = set()
+        for gram in grams:
+            ids.update(self.postings.get(gram, ()))
+        return sorted(ids)
@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Shared game name normalizer used by DatabaseManager, LibretroDB and Translator.
+# "Metal Slug X (USA) [!]" -> "metalslugx"
+
+NORMALIZE_CACHE_SIZE = 65536
+
+_SQUARE_TAG_RE = re.compile(r'\[.*?\]')
+_ROUND_TAG_RE = re.compile(r'\(.*?\)')
+_CN_RE = re.compile(r'\bCN\b', flags=re.IGNORECASE)
+
+
+class _AlnumTable(dict):
+    """
+    str.translate table that keeps ASCII letters/digits (lowercased) and deletes
+    everything else. Entries are filled in lazily the first time a character is seen.
+    """
+    def __missing__(self, codepoint):
+        if 48 <= codepoint <= 57 or 97 <= codepoint <= 122:
+            value = codepoint
+        elif 65 <= codepoint <= 90:
+            value = codepoint + 32
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_ALNUM_TABLE = _AlnumTable()
+
+
+def _strip_to_alnum(text):
+    """Equivalent of re.sub(r'[^a-zA-Z0-9]', '', text).lower()."""
+    return text.translate(_ALNUM_TABLE)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_name(name):
+    """
+    Normalizes a game name for fuzzy matching.
+    Strategy 1 removes bracketed/parenthesized tags and the 'CN' marker; if that leaves
+    nothing, strategy 2 keeps the bracket contents instead.
+    """
+    has_square = '[' in name
+    has_round = '(' in name
+    has_cn = 'cn' in name.lower()
+
+    # Fast path: nothing to strip but punctuation, so a single translate pass does it all
+    if not (has_square or has_round or has_cn):
+        return _strip_to_alnum(name)
+
+    # Strategy 1: Aggressive (Remove content in brackets/parentheses)
+    # Each pass only runs when its pattern can match at all
+    name_clean = _SQUARE_TAG_RE.sub('', name) if has_square else name
+    if has_round:
+        name_clean = _ROUND_TAG_RE.sub('', name_clean)
+    if has_cn:
+        name_clean = _CN_RE.sub('', name_clean)
+    clean_name = _strip_to_alnum(name_clean)
+
+    if clean_name:
+        return clean_name
+
+    # Strategy 2: Fallback
+    name_fallback = name.replace('[', ' ').replace(']', ' ').replace('(', ' ').replace(')', ' ')
+    if has_cn:
+        name_fallback = _CN_RE.sub('', name_fallback)
+    return _strip_to_alnum(name_fallback)
+
+
+def normalize_many(names):
+    """Normalizes a sequence of names, returning a list in the same order."""
+    return [normalize_name(name) for name in names]
+
+
+# Canonical key for Chinese labels: "超级马里奥３：世界（中文版）" -> "超级马里奥3世界"
+_CHINESE_TAG_RE = re.compile(r'\([^)]*\)|\[[^\]]*\]|【[^】]*】|〔[^〕]*〕')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def chinese_key(name):
+    """
+    Canonical form of a Chinese game name for exact-hit lookups.
+    Folds full-width characters (NFKC), lowercases, removes bracketed tags and drops
+    punctuation and whitespace. If removing the tags leaves nothing, their contents are kept.
+    """
+    folded = unicodedata.normalize('NFKC', name).lower()
+    key = ''.join(c for c in _CHINESE_TAG_RE.sub('', folded) if c.isalnum())
+    if key:
+        return key
+    return ''.join(c for c in folded if c.isalnum())
@@ -1,10 +1,221 @@
+import itertools
 import json
 import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from name_parser import parse_name
+
+# RetroArch's pre-1.7.6 playlists: six lines per entry, in this order
+LEGACY_FIELDS = ('path', 'label', 'core_path', 'core_name', 'crc32', 'db_name')
+READ_CHUNK_SIZE = 64 * 1024
+# Items looked at for a db_name when detecting the system of a playlist
+DETECT_ITEMS = 20
+_WHITESPACE_RE = re.compile(r'\s*')
+_DECODER = json.JSONDecoder()
+
+
+class PlaylistReader:
+    """
+    Streams the items of a playlist without parsing the whole document at once: the
+    JSON format is decoded item by item from READ_CHUNK_SIZE chunks (json raw_decode),
+    so memory stays bounded by the largest item, and the legacy six-line format is read
+    line by line. The top-level fields of a JSON playlist are collected in `metadata`
+    (in file order; 'items' marks the position of the item list). Fields after the item
+    list are only there once all items have been read.
+
+        reader = PlaylistReader(path)
+        for item in reader:
+            ...
+    """
+
+    def __init__(self, playlist_path, chunk_size=READ_CHUNK_SIZE):
+        self.playlist_path = playlist_path
+        self.chunk_size = chunk_size
+        self.metadata = {}
+        self.legacy = False
+
+    def __iter__(self):
+        with open(self.playlist_path, 'r', encoding='utf-8-sig') as f:
+            self._file = f
+            self._buffer = ''
+            self._pos = 0
+            self._eof = False
+            if self._peek() in ('{', ''):
+                yield from self._iter_json()
+            else:
+                self.legacy = True
+                yield from self._iter_legacy()
+
+    def _read_more(self):
+        """Appends the next chunk to the buffer, dropping what was consumed. False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Next non-whitespace character ('' at end of file), without consuming it."""
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Invalid playlist {self.playlist_path}: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def _decode(self):
+        """Decodes the next JSON value, reading more chunks while it is incomplete."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._read_more():
+                continue
+            self._pos = end
+            return value
+
+    def _iter_json(self):
+        if self._peek() == '':
+            return
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._decode()
+            self._expect(':')
+            if key == 'items':
+                self.metadata['items'] = []
+                yield from self._iter_json_items()
+            else:
+                self.metadata[key] = self._decode()
+            if self._peek() == '}':
+                return
+            self._expect(',')
+
+    def _iter_json_items(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._peek() == ']':
+                self._pos += 1
+                return
+            self._expect(',')
+
+    def _iter_legacy(self):
+        # Rewind: the legacy format is plain lines
+        self._file.seek(0)
+        lines = (line.rstrip('\r\n') for line in self._file)
+        while True:
+            entry = list(itertools.islice(lines, len(LEGACY_FIELDS)))
+            if not entry or not any(entry):
+                return
+            entry += [''] * (len(LEGACY_FIELDS) - len(entry))
+            yield dict(zip(LEGACY_FIELDS, entry))
+
+
+def is_legacy_playlist(playlist_path):
+    """True for the six-line format: anything that does not start with a JSON object."""
+    with open(playlist_path, 'r', encoding='utf-8-sig') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return False
+            head = chunk.lstrip()
+            if head:
+                return not head.startswith('{')
+
+
+def iter_playlist_items(playlist_path, limit=None):
+    """Yields the items of a playlist (JSON or legacy format), stopping after `limit` items."""
+    items = iter(PlaylistReader(playlist_path))
+    try:
+        yield from itertools.islice(items, limit)
+    finally:
+        items.close()
+
+
+def detect_system_name(playlist_path, max_items=DETECT_ITEMS):
+    """
+    System name from the db_name ("System Name.lpl") of the first of the first
+    max_items items that has one, or None. Only those items are read.
+    """
+    for item in iter_playlist_items(playlist_path, limit=max_items):
+        db_name = item.get('db_name', '')
+        if db_name:
+            return os.path.splitext(db_name)[0]
+    return None
+
+
+def _path_stem(path):
+    """File name without extension; RetroArch archive paths (Game.zip#Inner.nes) use the archive name."""
+    basename = os.path.basename(path).split('#')[0]
+    return os.path.splitext(basename)
+
+
+def title_group_key(item):
+    """
+    Key of the title an item belongs to, ignoring its disc number and file format:
+    "FF VII (USA) (Disc 1).chd", "FF VII (USA) (Disc 2).chd" and "FF VII (USA).m3u" in
+    the same directory share it. The directory is part of the key because the analysis
+    also looks at the parent directory name. None for items without a path.
+    """
+    path = item.get('path')
+    if not path:
+        return None
+    stem, _ = _path_stem(path)
+    parsed = parse_name(stem)
+    return (os.path.dirname(path), parsed.base.casefold(), parsed.regions, parsed.languages,
+            parsed.revision, parsed.flags)
+
+
+def group_items(items):
+    """
+    {index: key} for the items that share their title_group_key with another item
+    (discs of one game, .m3u and its members, the same game in several formats).
+    Items on their own are left out.
+    """
+    keys = {}
+    counts = {}
+    for i, item in enumerate(items):
+        key = title_group_key(item)
+        if key is not None:
+            keys[i] = key
+            counts[key] = counts.get(key, 0) + 1
+    return {i: key for i, key in keys.items() if counts[key] > 1}
+
+
+def disc_number(item):
+    """Disc number from the item's file name ("(Disc 2)"), or None."""
+    path = item.get('path')
+    return parse_name(_path_stem(path)[0]).disc if path else None
+
 
 class PlaylistManager:
     def __init__(self, playlist_path):
         self.playlist_path = playlist_path
         self.items = []
+        self._path_index = None
+        # Set when a label or the item list actually changes; save() skips clean playlists
+        self.dirty = False
         self.load()
 
     def load(self):
@@ -12,32 +223,116 @@ class PlaylistManager:
         if not os.path.exists(self.playlist_path):
             raise FileNotFoundError(f"Playlist file not found: {self.playlist_path}")
         
-        with open(self.playlist_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        self.legacy = is_legacy_playlist(self.playlist_path)
+        if self.legacy:
+            reader = PlaylistReader(self.playlist_path)
+            self.items = list(reader)
+            self.data = reader.metadata
+        else:
+            # All items are kept anyway, and json.load is about twice as fast as
+            # decoding them one by one
+            with open(self.playlist_path, 'r', encoding='utf-8-sig') as f:
+                self.data = json.load(f)
             self.items = self.data.get('items', [])
+        self._path_index = None
+        self.dirty = False
 
-    def save(self, output_path=None):
-        """Saves the playlist to the file."""
-        target_path = output_path if output_path else self.playlist_path
-        # Update items in self.data before saving
+    def serialize(self, compact=False):
+        """
+        The playlist as text, in the format it was loaded in. Key order and the top-level
+        metadata fields are kept as loaded; compact drops the JSON indentation, which
+        makes very large playlists much smaller.
+        """
+        if self.legacy:
+            return ''.join(f"{item.get(field, '')}\n" for item in self.items for field in LEGACY_FIELDS)
+        # Update items in self.data before saving ('items' keeps its position)
         self.data['items'] = self.items
-        
-        with open(target_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)
+        if compact:
+            return json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(self.data, indent=4, ensure_ascii=False)
+
+    def save(self, output_path=None, compact=False, backup_path=None):
+        """
+        Saves the playlist to the file. Returns False without touching the file when no
+        label or item changed since it was loaded (no needless rewrites, backups or
+        rescans on network shares); the file keeps the formatting RetroArch gave it.
+
+        The new content goes to a temp file in the same directory, is fsynced and then
+        renamed over the target, so a crash leaves either the old or the new playlist,
+        never a partial one. backup_path, if given, gets a copy of the old file first.
+        """
+        target_path = output_path if output_path else self.playlist_path
+        same_file = os.path.abspath(target_path) == os.path.abspath(self.playlist_path)
+        if same_file and not self.dirty:
+            return False
+        content = self.serialize(compact).encode('utf-8')
+
+        if backup_path and os.path.exists(target_path):
+            shutil.copy2(target_path, backup_path)
+
+        directory = os.path.dirname(os.path.abspath(target_path))
+        fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(target_path) + '.', suffix='.tmp',
+                                         dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target_path):
+                # mkstemp creates the file private (0600); keep the playlist's permissions
+                shutil.copymode(target_path, temp_path)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        if same_file:
+            self.dirty = False
+        return True
 
     def update_label(self, entry_index, new_label):
         """Updates the label of a specific entry."""
-        if 0 <= entry_index < len(self.items):
+        if 0 <= entry_index < len(self.items) and self.items[entry_index].get('label') != new_label:
             self.items[entry_index]['label'] = new_label
+            self.dirty = True
 
     def get_items(self):
         return self.items
+
+    def _get_path_index(self):
+        """NFC-normalized path -> item, built once and rebuilt after the item list changes."""
+        if self._path_index is None:
+            index = {}
+            for item in self.items:
+                path = item.get('path')
+                if path:
+                    # The first entry wins, like a linear scan would
+                    index.setdefault(unicodedata.normalize('NFC', path), item)
+            self._path_index = index
+        return self._path_index
+
+    def find_by_path(self, path):
+        """Returns the item whose path matches (NFC-normalized, so macOS NFD paths match), or None."""
+        if not path:
+            return None
+        return self._get_path_index().get(unicodedata.normalize('NFC', path))
+
+    def update_label_by_path(self, path, new_label):
+        """Updates the label of the entry with this path. Returns False if no entry has it."""
+        item = self.find_by_path(path)
+        if item is None:
+            return False
+        if item.get('label') != new_label:
+            item['label'] = new_label
+            self.dirty = True
+        return True
     
     def deduplicate_items(self):
         """
         Remove duplicate entries for the same game with different file extensions.
         Priority order: .cue > .chd > .iso > .bin
-        Keeps the entry with the highest priority extension.
+        Keeps the entry with the highest priority extension. The discs of a multi-disc
+        game share their label but are not duplicates, so each disc keeps an entry.
         """
         # Extension priority (lower number = higher priority)
         extension_priority = {
@@ -48,21 +343,22 @@ class PlaylistManager:
             '.img': 4,  # Similar to bin
         }
         
-        # Group items by label (game name)
+        # Group items by label (game name) and disc
         label_groups = {}
         for idx, item in enumerate(self.items):
             label = item.get('label', '')
             if not label:
                 continue
             
-            if label not in label_groups:
-                label_groups[label] = []
-            label_groups[label].append((idx, item))
+            key = (label, disc_number(item))
+            if key not in label_groups:
+                label_groups[key] = []
+            label_groups[key].append((idx, item))
         
         # Determine which items to keep
         indices_to_remove = set()
         
-        for label, items_list in label_groups.items():
+        for key, items_list in label_groups.items():
             if len(items_list) <= 1:
                 continue  # No duplicates
             
@@ -90,6 +386,9 @@ class PlaylistManager:
         # Remove duplicates (in reverse order to maintain indices)
         for idx in sorted(indices_to_remove, reverse=True):
             del self.items[idx]
+        if indices_to_remove:
+            self._path_index = None
+            self.dirty = True
         
         removed_count = len(indices_to_remove)
         return removed_count
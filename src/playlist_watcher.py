@@ -0,0 +1,88 @@
+import glob
+import os
+import threading
+import time
+from log_stream import get_logger
+
+logger = get_logger("playlist_watcher")
+
+
+class PlaylistWatcher:
+    """
+    Polls a directory of .lpl files and calls process(playlist_path) for each playlist
+    that is new or changed. A change is detected by (mtime, size) and only handled once
+    the file has kept the same signature for `debounce` seconds, so a playlist that
+    RetroArch is still writing is not read half way.
+
+    After process() returns, the playlist's signature is taken again and remembered as
+    handled: the labels we wrote ourselves do not trigger another run.
+    """
+
+    def __init__(self, batch_dir, process, interval=2.0, debounce=2.0):
+        self.batch_dir = batch_dir
+        self.process = process
+        self.interval = interval
+        self.debounce = debounce
+        self.known = {}    # path -> signature already handled
+        self.pending = {}  # path -> (signature, time it was first seen)
+
+    @staticmethod
+    def signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def scan(self):
+        """{playlist_path: (mtime_ns, size)} for the .lpl files in batch_dir."""
+        signatures = {}
+        for path in glob.glob(os.path.join(self.batch_dir, "*.lpl")):
+            sig = self.signature(path)
+            if sig is not None:
+                signatures[path] = sig
+        return signatures
+
+    def poll(self, now=None):
+        """One pass over the directory. Returns the playlists processed in this pass."""
+        now = time.monotonic() if now is None else now
+        current = self.scan()
+
+        for path in list(self.known):
+            if path not in current:
+                del self.known[path]
+        for path in list(self.pending):
+            if path not in current:
+                del self.pending[path]
+
+        ready = []
+        for path, sig in sorted(current.items()):
+            if self.known.get(path) == sig:
+                self.pending.pop(path, None)
+                continue
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != sig:
+                # New or still being written: (re)start the debounce window
+                self.pending[path] = (sig, now)
+            elif now - seen[1] >= self.debounce:
+                ready.append(path)
+
+        for path in ready:
+            del self.pending[path]
+            try:
+                self.process(path)
+            except Exception as e:
+                logger.error(f"Error processing {os.path.basename(path)}: {e}")
+            # Remember the state after our own save, so it is not picked up as a change
+            sig = self.signature(path)
+            if sig is not None:
+                self.known[path] = sig
+        return ready
+
+    def run(self, stop=None):
+        """Polls until the stop event is set (or forever)."""
+        stop = stop or threading.Event()
+        logger.info(f"Watching {self.batch_dir} for playlist changes (every {self.interval}s)")
+        while not stop.is_set():
+            self.poll()
+            stop.wait(self.interval)
@@ -3,12 +3,23 @@ import json
 import os
 import sys
 import glob
-from playlist_manager import PlaylistManager
-from translator import Translator
-from thumbnail_downloader import ThumbnailDownloader
+import re
+import multiprocessing
+from playlist_manager import PlaylistManager, detect_system_name, group_items
+from contextlib import nullcontext
+from database import DatabaseManager
+from translator import normalize_system_name, diff_stats, format_stats, TierStats
+from translator_pool import translator_pool, data_version
+from fuzzy_budget import FuzzyBudget
+from thumbnail_downloader import ThumbnailDownloader, DownloadPipeline, DOWNLOAD_ENGINES, create_downloader
+from batch_runner import run_batch
+from playlist_watcher import PlaylistWatcher
 import webbrowser
 import server
 import subprocess
+from log_stream import get_logger, setup_logging, level_from_flags
+
+logger = get_logger("plcn")
 
 CONFIG_FILE = "config.json"
 
@@ -31,33 +42,36 @@ def kill_process_on_port(port):
             pids = result.stdout.strip().split('\n')
             for pid in pids:
                 subprocess.run(['kill', '-9', pid])
-            print(f"Killed process(es) on port {port}")
+            logger.info(f"Killed process(es) on port {port}")
     except Exception as e:
         # Ignore errors (no process on port, etc.)
         pass
 
 def main():
+    # Leveled, queue-backed logging (--quiet/--verbose also apply to the ui subcommand)
+    setup_logging(level_from_flags(quiet='--quiet' in sys.argv, verbose='--verbose' in sys.argv))
+
     # Auto-launch UI if no arguments provided (e.g., double-click on macOS)
     if len(sys.argv) == 1:
-        print("No arguments provided. Starting Web UI...")
+        logger.info("No arguments provided. Starting Web UI...")
         # Clean up any existing process on the port
         kill_process_on_port(server.PORT)
         
         url = f"http://localhost:{server.PORT}"
-        print(f"Opening {url}")
+        logger.info(f"Opening {url}")
         webbrowser.open(url)
         server.run_server()
         return
     
     # Check for 'ui' subcommand
     if len(sys.argv) > 1 and sys.argv[1] == 'ui':
-        print("Starting Web UI...")
+        logger.info("Starting Web UI...")
         
         # Clean up any existing process on the port
         kill_process_on_port(server.PORT)
         
         url = f"http://localhost:{server.PORT}"
-        print(f"Opening {url}")
+        logger.info(f"Opening {url}")
         webbrowser.open(url)
         server.run_server()
         return
@@ -65,15 +79,60 @@ def main():
     config = load_config()
     
     parser = argparse.ArgumentParser(description="RetroArch Playlist Translator and Thumbnail Downloader")
-    parser.add_argument("command", nargs="?", help="Subcommand: 'ui' to open Web UI")
+    parser.add_argument("command", nargs="?",
+                        help="Subcommand: 'ui' to open Web UI, 'watch' to keep processing --batch-dir as playlists change")
     parser.add_argument("--playlist", help="Path to the RetroArch playlist file (.lpl)")
     parser.add_argument("--system", help="System name (e.g., 'Sega - Saturn')")
     parser.add_argument("--thumbnails-dir", help="Directory to save thumbnails")
     parser.add_argument("--rom-name-cn-path", default="data/rom-name-cn", help="Path to rom-name-cn repository")
     parser.add_argument("--batch-dir", help="Directory containing multiple .lpl files for batch processing")
+    parser.add_argument("--jobs", type=int, help="Playlists analyzed in parallel in batch mode (worker processes)")
+    parser.add_argument("--no-pipeline", action="store_true",
+                        help="Download thumbnails only after the whole playlist is analyzed")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-analyze every item instead of only new or changed ones")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write playlists without indentation (much smaller for very large playlists)")
+    parser.add_argument("--download-engine", choices=DOWNLOAD_ENGINES,
+                        help="Thumbnail downloads on a thread pool (default) or the adaptive asyncio engine")
+    parser.add_argument("--no-thumbnail-index", action="store_true",
+                        help="Request every thumbnail instead of checking the server's directory listings first")
+    parser.add_argument("--no-thumbnail-store", action="store_true",
+                        help="Write each thumbnail directly instead of linking it from the content-addressed store")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between directory scans in watch mode")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                        help="Seconds a playlist must stay unchanged before watch mode processes it")
+    parser.add_argument("--fuzzy-item-ms", type=float, help="Max milliseconds of fuzzy matching per item (default: unlimited)")
+    parser.add_argument("--fuzzy-playlist-ms", type=float, help="Max milliseconds of fuzzy matching per playlist (default: unlimited)")
+    parser.add_argument("--fuzzy-max-candidates", type=int, help="Max candidates scored by fuzzy matching per item (default: 20000)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("--quiet", action="store_true", help="Only show warnings and errors")
+    verbosity.add_argument("--verbose", action="store_true", help="Show per-item matching details")
 
     args = parser.parse_args()
 
+    # Fuzzy budget overrides (Args > Config)
+    for key in ("fuzzy_item_ms", "fuzzy_playlist_ms", "fuzzy_max_candidates"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+
+    if args.no_pipeline:
+        config["pipeline"] = False
+    if args.full:
+        config["incremental"] = False
+    if args.compact:
+        config["compact_playlists"] = True
+    if args.download_engine:
+        config["download_engine"] = args.download_engine
+    if args.no_thumbnail_index:
+        config["thumbnail_index"] = False
+    if args.no_thumbnail_store:
+        config["thumbnail_store"] = False
+
+    # In-memory translation snapshot for pooled translators (config.json: translation_snapshot)
+    translator_pool.use_snapshot = config.get("translation_snapshot", True)
+
     # Determine values from args or config
     # Priority: Args > Config
     
@@ -86,31 +145,43 @@ def main():
     
     # Check for batch mode
     batch_dir = args.batch_dir or config.get("batch_dir")
-    
-    if batch_dir:
-        print(f"Batch mode enabled. Processing playlists in: {batch_dir}")
+
+    if args.command == 'watch':
+        thumbnails_dir = args.thumbnails_dir or config.get("thumbnails_dir")
+        if not batch_dir or not os.path.isdir(batch_dir) or not thumbnails_dir:
+            logger.error("Error: watch mode needs an existing --batch-dir and a --thumbnails-dir.")
+            return
+        watch_playlists(batch_dir, thumbnails_dir, rom_name_cn_path, config, args.interval, args.debounce)
+
+    elif batch_dir:
+        logger.info(f"Batch mode enabled. Processing playlists in: {batch_dir}")
         if not os.path.exists(batch_dir):
-            print(f"Error: Batch directory not found: {batch_dir}")
+            logger.error(f"Error: Batch directory not found: {batch_dir}")
             return
             
         thumbnails_dir = args.thumbnails_dir or config.get("thumbnails_dir")
         if not thumbnails_dir:
-             print("Error: Thumbnails directory is required for batch mode.")
+             logger.error("Error: Thumbnails directory is required for batch mode.")
              return
 
         lpl_files = glob.glob(os.path.join(batch_dir, "*.lpl"))
-        print(f"Found {len(lpl_files)} playlist files.")
+        logger.info(f"Found {len(lpl_files)} playlist files.")
         
+        playlists = []
         for lpl_file in lpl_files:
-            print(f"\nProcessing: {lpl_file}")
             # Detect system
             system_name = detect_system(lpl_file)
             if not system_name:
-                print(f"Skipping {lpl_file}: Could not detect system name.")
+                logger.warning(f"Skipping {lpl_file}: Could not detect system name.")
                 continue
                 
-            print(f"Detected System: {system_name}")
-            process_playlist(lpl_file, system_name, thumbnails_dir, rom_name_cn_path)
+            logger.info(f"Detected System for {os.path.basename(lpl_file)}: {system_name}")
+            playlists.append((lpl_file, system_name))
+
+        jobs = args.jobs or config.get("batch_jobs", 1)
+        result = run_batch(playlists, thumbnails_dir, rom_name_cn_path, jobs=jobs, config=config)
+        logger.info("\nTranslation tier summary:")
+        logger.info(format_stats(result['stats']))
             
     else:
         # Single file mode
@@ -119,28 +190,44 @@ def main():
         thumbnails_dir = args.thumbnails_dir or config.get("thumbnails_dir")
         
         if not playlist_path or not system_name or not thumbnails_dir:
-            print("Error: Missing required configuration. Please provide --playlist, --system, and --thumbnails-dir arguments, or set them in config.json via the Web UI.")
+            logger.error("Error: Missing required configuration. Please provide --playlist, --system, and --thumbnails-dir arguments, or set them in config.json via the Web UI.")
             return
 
-        process_playlist(playlist_path, system_name, thumbnails_dir, rom_name_cn_path)
+        process_playlist(playlist_path, system_name, thumbnails_dir, rom_name_cn_path, config)
 
 def detect_system(playlist_path):
     """Detects system name from playlist file content."""
     try:
-        with open(playlist_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            items = data.get('items', [])
-            if items:
-                db_name = items[0].get('db_name', '')
-                if db_name:
-                    return os.path.splitext(db_name)[0]
+        # Reads only the first few items, not the whole playlist
+        return detect_system_name(playlist_path)
     except Exception as e:
-        print(f"Error detecting system for {playlist_path}: {e}")
+        logger.error(f"Error detecting system for {playlist_path}: {e}")
     return None
 
-def analyze_playlist(playlist_path, system_name, rom_name_cn_path):
+# Arcade names carry region/date codes like "(World 900227)" or "(USA 920313)"
+_ARCADE_DATE_TAG_RE = re.compile(r'\s*\([^)]*\d{6}[^)]*\)$')
+_TRAILING_TAG_RE = re.compile(r'\s*\([^)]*\)$')
+
+def clean_arcade_name(game_name):
+    """
+    Cleans arcade game names by removing region codes, version info, and dates.
+    Examples:
+      "1941: Counter Attack (World 900227)" -> "1941: Counter Attack"
+      "Street Fighter II' - Champion Edition (USA 920313)" -> "Street Fighter II' - Champion Edition"
+    """
+    # Remove region and date codes like (World 900227), (USA 920313), (Japan), etc.
+    cleaned = _ARCADE_DATE_TAG_RE.sub('', game_name)  # Remove (Region YYMMDD)
+    cleaned = _TRAILING_TAG_RE.sub('', cleaned)  # Remove remaining (Region) or (version)
+    return cleaned.strip()
+
+def analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=None, fuzzy_budget=None, incremental=True,
+                     db_path=None):
     """
     Analyzes the playlist and returns a list of proposed changes.
+    If a dict is passed as stats, it is filled with the translator tier statistics of this run.
+    An optional FuzzyBudget bounds the fuzzy matching per item and per playlist.
+    With incremental, unchanged items reuse the result of an earlier run (see iter_analyze_playlist).
+    db_path selects the database (default: plcn.db in the working directory).
     Returns:
         list of dicts: {
             'index': int,
@@ -148,334 +235,439 @@ def analyze_playlist(playlist_path, system_name, rom_name_cn_path):
             'path': str,
             'new_label': str,
             'thumbnail_source': str (Standard English Name or None),
-            'system': str
+            'system': str,
+            'deferred': bool (fuzzy budget ran out, a cheaper fallback was used)
         }
     """
-    
-    # Clean FBNeo/Arcade game names
-    def clean_arcade_name(game_name):
-        """
-        Cleans arcade game names by removing region codes, version info, and dates.
-        Examples:
-          "1941: Counter Attack (World 900227)" -> "1941: Counter Attack"
-          "Street Fighter II' - Champion Edition (USA 920313)" -> "Street Fighter II' - Champion Edition"
-        """
-        import re
-        # Remove region and date codes like (World 900227), (USA 920313), (Japan), etc.
-        cleaned = re.sub(r'\s*\([^)]*\d{6}[^)]*\)$', '', game_name)  # Remove (Region YYMMDD)
-        cleaned = re.sub(r'\s*\([^)]*\)$', '', cleaned)  # Remove remaining (Region) or (version)
-        return cleaned.strip()
-    
-    # Normalize system name (remove timestamp and number suffixes)
-    # e.g., "Nintendo - SNES (20240830-122750) (3308)" -> "Nintendo - SNES"
-    def normalize_system_name(system_name):
-        import re
-        # Remove patterns like (YYYYMMDD-HHMMSS) and (number)
-        normalized = re.sub(r'\s*\(\d{8}-\d{6}\)\s*', '', system_name)
-        normalized = re.sub(r'\s*\(\d+\)\s*$', '', normalized)
-        return normalized.strip()
+    return list(iter_analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats, fuzzy_budget,
+                                      incremental=incremental, db_path=db_path))
+
+def iter_analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=None, fuzzy_budget=None, cancel=None,
+                          progress_callback=None, incremental=True, db_path=None):
+    """
+    Generator variant of analyze_playlist: yields each proposed change as soon as it is decided.
+    cancel is an optional threading.Event-like object; once it is set the analysis stops
+    before the next item. Closing the generator stops it as well. stats is filled with the
+    statistics of the items analyzed so far when the generator finishes or is stopped.
+    progress_callback(analyzed, total, tier) is called whenever the translator tries a
+    tier and after each item (tier None).
+
+    With incremental, items whose path, label, system and translation data are unchanged
+    since an earlier analysis reuse its stored result (item_fingerprints table), and no
+    translator is leased at all when every item is unchanged.
+    """
     
     normalized_system = normalize_system_name(system_name)
-    print(f"System: {system_name}")
+    logger.info(f"System: {system_name}")
     if normalized_system != system_name:
-        print(f"Normalized to: {normalized_system} (for database matching)")
+        logger.info(f"Normalized to: {normalized_system} (for database matching)")
     
     # Initialize components
     playlist_manager = PlaylistManager(playlist_path)
-    translator = Translator(rom_name_cn_path, normalized_system)
     
     # Deduplicate items (in memory for analysis)
     # Note: This modifies the playlist_manager's internal state
     removed_count = playlist_manager.deduplicate_items()
     if removed_count > 0:
-        print(f"Removed {removed_count} duplicate entries")
+        logger.info(f"Removed {removed_count} duplicate entries")
 
     items = playlist_manager.get_items()
-    proposed_changes = []
 
-    for i, item in enumerate(items):
-        original_label = item.get('label')
-        path = item.get('path')
-        
-        # Extract ROM name for display (filename without extension)
-        display_label = original_label
-        if path:
-            basename = os.path.basename(path)
-            if '#' in basename:
-                basename = basename.split('#')[0]
-            display_label = os.path.splitext(basename)[0]
+    playlist_key = os.path.abspath(playlist_path)
+    version = data_version(rom_name_cn_path)
+    fingerprint_db = DatabaseManager(db_path=db_path)
+    reused = {}
+    if incremental:
+        known = fingerprint_db.get_item_fingerprints(playlist_key, normalized_system, version)
+        for i, item in enumerate(items):
+            change = _reuse_fingerprint(i, item, known, system_name)
+            if change is not None:
+                reused[i] = change
+        if reused:
+            logger.info(f"Reusing {len(reused)} unchanged item(s), resolving {len(items) - len(reused)}")
+
+    resolved = []
+    # Reuse a warmed translator for this system instead of reloading the DB and DAT
+    lease = (translator_pool.lease(rom_name_cn_path, normalized_system, db_path) if len(reused) < len(items)
+             else nullcontext())
+    with lease as translator:
+        before = translator.stats() if translator else None
+        try:
+            for change in _iter_analyze_items(items, translator, normalized_system, system_name, fuzzy_budget, cancel,
+                                              progress_callback, reused):
+                if change['index'] not in reused and not change['deferred']:
+                    resolved.append((items[change['index']].get('label'), change))
+                yield change
+        finally:
+            if stats is not None:
+                stats.update(diff_stats(translator.stats(), before) if translator else TierStats().snapshot())
+            if fuzzy_budget and fuzzy_budget.deferred_count:
+                logger.info(f"Fuzzy budget exhausted for {fuzzy_budget.deferred_count} item(s); they were marked as deferred")
+            # Deferred items got a cheaper fallback, they are resolved again next time
+            if resolved:
+                fingerprint_db.save_item_fingerprints(playlist_key, normalized_system, version, resolved)
+            fingerprint_db.close()
+
+def _reuse_fingerprint(i, item, known, system_name):
+    """
+    The stored change for an item, or None if it is new or changed. An item still matches
+    after its new label was applied, so its label may be the analyzed or the new one.
+    """
+    row = known.get(item.get('path'))
+    if row is None or item.get('label') not in (row['label'], row['new_label']):
+        return None
+    return {
+        'index': i,
+        'original_label': _display_label(item),
+        'path': item.get('path'),
+        'new_label': row['new_label'],
+        'thumbnail_source': row['thumbnail_source'],
+        'system': system_name,
+        'deferred': False
+    }
+
+def _iter_analyze_items(items, translator, normalized_system, system_name, fuzzy_budget=None, cancel=None,
+                        progress_callback=None, reused=None):
+    """
+    Resolves the new label and thumbnail source of each (deduplicated) playlist item.
+    Items in reused (index -> change) are yielded as they are; translator may be None
+    when every item is reused.
+
+    Items of one title (the discs of a game, an .m3u and its members, several formats)
+    are resolved once, by the first of them; the others get a copy of its result.
+    """
+    total = len(items)
+    analyzed = 0
+    reused = reused or {}
+    groups = group_items(items)
+    group_results = {}
+    if groups:
+        logger.info(f"Grouped {len(groups)} item(s) into {len(set(groups.values()))} multi-disc/multi-format title(s)")
+    if progress_callback and translator is not None:
+        translator.tier_callback = lambda tier: progress_callback(analyzed, total, tier)
+    try:
+        for i, item in enumerate(items):
+            if cancel is not None and cancel.is_set():
+                logger.info(f"Analysis cancelled after {i}/{total} item(s)")
+                return
+            change = reused.get(i)
+            group_change = group_results.get(groups.get(i))
+            if change is None and group_change is not None:
+                change = _fan_out(group_change, i, item)
+            elif change is None:
+                item_budget = fuzzy_budget.item() if fuzzy_budget else None
+                change = _analyze_item(i, item, translator, normalized_system, system_name, item_budget)
+                # Items whose fuzzy matching ran out of budget got a cheaper fallback
+                change['deferred'] = bool(item_budget and item_budget.deferred)
+            # A reused member also resolves the rest of its group (e.g. a newly added disc)
+            if i in groups and groups[i] not in group_results:
+                group_results[groups[i]] = change
+            analyzed = i + 1
+            if progress_callback:
+                progress_callback(analyzed, total, None)
+            yield change
+    finally:
+        # The translator goes back to the pool
+        if translator is not None:
+            translator.tier_callback = None
+
+def _fan_out(change, i, item):
+    """The resolved change of a group, for another member of the group."""
+    member = dict(change, index=i, path=item.get('path'))
+    member['original_label'] = _display_label(item)
+    return member
+
+def _display_label(item):
+    """ROM file name without extension (archive paths use the archive name), else the label."""
+    path = item.get('path')
+    if not path:
+        return item.get('label')
+    basename = os.path.basename(path)
+    if '#' in basename:
+        basename = basename.split('#')[0]
+    return os.path.splitext(basename)[0]
+
+def _analyze_item(i, item, translator, normalized_system, system_name, budget=None):
+    """Resolves a single playlist item and returns its proposed change."""
+    original_label = item.get('label')
+    path = item.get('path')
+    
+    # Extract ROM name for display (filename without extension)
+    display_label = _display_label(item)
+    
+    new_label = original_label
+    thumbnail_source = None
+    
+    # Special handling for FBNeo/Arcade games
+    # These games have region codes like "(World 900227)" that need to be removed
+    is_arcade = 'Arcade' in normalized_system or 'FBNeo' in normalized_system
+    
+    if is_arcade and original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
+        # Clean the arcade name (remove region codes and dates)
+        cleaned_name = clean_arcade_name(original_label)
+        logger.debug(f"[{i}] Arcade game detected: '{original_label}' -> '{cleaned_name}'")
         
-        new_label = original_label
-        thumbnail_source = None
+        # Try to translate the cleaned name
+        translated_cn, english_name = translator.translate(cleaned_name, budget=budget)
         
-        # Special handling for FBNeo/Arcade games
-        # These games have region codes like "(World 900227)" that need to be removed
-        is_arcade = 'Arcade' in normalized_system or 'FBNeo' in normalized_system
+        # Check if we found a match
+        if translated_cn and translated_cn != cleaned_name:
+            # Found Chinese translation
+            new_label = translated_cn
+            thumbnail_source = english_name if english_name else cleaned_name
+            logger.debug(f"[{i}] Found Chinese translation: '{translated_cn}'")
+        elif english_name and english_name != cleaned_name:
+            # No Chinese translation, but found standardized English name
+            new_label = english_name
+            thumbnail_source = english_name
+            logger.debug(f"[{i}] Using standardized English name: '{english_name}'")
+        else:
+            # No match found, use cleaned name as label for consistency
+            new_label = cleaned_name
+            thumbnail_source = cleaned_name
+            logger.debug(f"[{i}] No match found, using cleaned name")
         
-        if is_arcade and original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
-            # Clean the arcade name (remove region codes and dates)
-            cleaned_name = clean_arcade_name(original_label)
-            print(f"  [{i}] Arcade game detected: '{original_label}' -> '{cleaned_name}'")
-            
-            # Try to translate the cleaned name
-            translated_cn, english_name = translator.translate(cleaned_name)
+        return {
+            'index': i,
+            'original_label': display_label,
+            'path': path,
+            'new_label': new_label,
+            'thumbnail_source': thumbnail_source,
+            'system': system_name
+        }
+    
+    # Priority 0: Check if parent directory name contains Chinese characters
+    # This takes precedence over existing label because folder structure is often the "source of truth"
+    if path:
+        parent_dir = os.path.basename(os.path.dirname(path))
+        if parent_dir and any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
+            new_label = parent_dir
             
+            # Use translator.translate for fuzzy matching
+            translated_cn, english_name = translator.translate(parent_dir, budget=budget)
             # Check if we found a match
-            if translated_cn and translated_cn != cleaned_name:
+            # Check if we found a match
+            if translated_cn and translated_cn != parent_dir:
                 # Found Chinese translation
-                new_label = translated_cn
-                thumbnail_source = english_name if english_name else cleaned_name
-                print(f"  [{i}] Found Chinese translation: '{translated_cn}'")
-            elif english_name and english_name != cleaned_name:
-                # No Chinese translation, but found standardized English name
-                new_label = english_name
-                thumbnail_source = english_name
-                print(f"  [{i}] Using standardized English name: '{english_name}'")
-            else:
-                # No match found, use cleaned name as label for consistency
-                new_label = cleaned_name
-                thumbnail_source = cleaned_name
-                print(f"  [{i}] No match found, using cleaned name")
-            
-            proposed_changes.append({
-                'index': i,
-                'original_label': display_label,
-                'path': path,
-                'new_label': new_label,
-                'thumbnail_source': thumbnail_source,
-                'system': system_name
-            })
-            continue
-        
-        # Priority 0: Check if parent directory name contains Chinese characters
-        # This takes precedence over existing label because folder structure is often the "source of truth"
-        if path:
-            parent_dir = os.path.basename(os.path.dirname(path))
-            if parent_dir and any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
-                new_label = parent_dir
                 
-                # Use translator.translate for fuzzy matching
-                translated_cn, english_name = translator.translate(parent_dir)
-                # Check if we found a match
-                # Check if we found a match
-                if translated_cn and translated_cn != parent_dir:
-                    # Found Chinese translation
-                    
-                    # If parent_dir is ALREADY Chinese, prefer it over the translation
-                    # This prevents bad fuzzy matches (e.g. "棉花小魔女" -> "小魔女") from overwriting user's folder name
-                    if any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
-                        new_label = parent_dir
-                    else:
-                        new_label = translated_cn
-                        
-                    thumbnail_source = english_name if english_name else parent_dir
-                elif english_name and english_name != parent_dir:
-                    # No Chinese, but found standardized English name
-                    # If parent_dir is already Chinese, prefer it over English name
-                    if any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
-                        new_label = parent_dir
-                        thumbnail_source = english_name
-                    else:
-                        new_label = english_name
-                        thumbnail_source = english_name
+                # If parent_dir is ALREADY Chinese, prefer it over the translation
+                # This prevents bad fuzzy matches (e.g. "棉花小魔女" -> "小魔女") from overwriting user's folder name
+                if any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
+                    new_label = parent_dir
                 else:
-                    # Try translating candidates
-                    filename_no_ext = os.path.splitext(os.path.basename(path))[0] if path else None
-                    candidates = []
-                    if filename_no_ext: candidates.append(filename_no_ext)
-                    if original_label and original_label != filename_no_ext: candidates.append(original_label)
-                    
-                    for candidate in candidates:
-                        _, std_en = translator.translate(candidate)
-                        if std_en and std_en != candidate:
-                            thumbnail_source = std_en
-                            break
+                    new_label = translated_cn
                     
-                    if not thumbnail_source:
-                        thumbnail_source = filename_no_ext if filename_no_ext else original_label
-
-                proposed_changes.append({
-                    'index': i,
-                    'original_label': display_label,
-                    'path': path,
-                    'new_label': new_label,
-                    'thumbnail_source': thumbnail_source,
-                    'system': system_name
-                })
-                continue
-
-        # Priority 1: If original_label already contains Chinese and is not empty, use it
-        # This preserves user's manual edits from previous runs
-        if original_label and any('\u4e00' <= char <= '\u9fff' for char in original_label):
-            print(f"  [{i}] Using existing Chinese label: '{original_label}'")
-            new_label = original_label
-            # Try to find English name for thumbnail
-            translated_cn, english_name = translator.translate(original_label)
-            # Check if we found a match (either name changed from original)
-            if (translated_cn and translated_cn != original_label) or (english_name and english_name != original_label):
-                # We found a match in database
-                if english_name and english_name != original_label:
+                thumbnail_source = english_name if english_name else parent_dir
+            elif english_name and english_name != parent_dir:
+                # No Chinese, but found standardized English name
+                # If parent_dir is already Chinese, prefer it over English name
+                if any('\u4e00' <= char <= '\u9fff' for char in parent_dir):
+                    new_label = parent_dir
+                    thumbnail_source = english_name
+                else:
+                    new_label = english_name
                     thumbnail_source = english_name
-                    print(f"  [{i}] Found thumbnail source: '{english_name}'")
-                # Update to standardized Chinese name if available
-                if translated_cn and translated_cn != original_label:
-                    new_label = translated_cn
-                    print(f"  [{i}] Updated to standardized Chinese name: '{translated_cn}'")
             else:
-                # No match found, keep original label but still try to download thumbnails
-                print(f"  [{i}] No thumbnail source found for '{original_label}'")
-                # Fallback to filename for thumbnail source (better than Chinese label)
+                # Try translating candidates
                 filename_no_ext = os.path.splitext(os.path.basename(path))[0] if path else None
-                thumbnail_source = filename_no_ext if filename_no_ext else original_label
-            
-            proposed_changes.append({
+                candidates = []
+                if filename_no_ext: candidates.append(filename_no_ext)
+                if original_label and original_label != filename_no_ext: candidates.append(original_label)
+                
+                for candidate in candidates:
+                    _, std_en = translator.translate(candidate, budget=budget)
+                    if std_en and std_en != candidate:
+                        thumbnail_source = std_en
+                        break
+                
+                if not thumbnail_source:
+                    thumbnail_source = filename_no_ext if filename_no_ext else original_label
+
+            return {
                 'index': i,
                 'original_label': display_label,
                 'path': path,
                 'new_label': new_label,
                 'thumbnail_source': thumbnail_source,
                 'system': system_name
-            })
-            continue
-
-        # Priority 2: Check if filename (without extension) contains Chinese characters
-        if path:
-            # Handle RetroArch archive paths (e.g. /path/to/Game.zip#Inner.nes)
-            basename = os.path.basename(path)
-            if '#' in basename:
-                basename = basename.split('#')[0]
-            
-            filename_no_ext = os.path.splitext(basename)[0]
-            
-            if filename_no_ext and any('\u4e00' <= char <= '\u9fff' for char in filename_no_ext):
-                import re
-                # Remove content in brackets [] and parentheses ()
-                clean_name = re.sub(r'\[.*?\]', '', filename_no_ext)
-                clean_name = re.sub(r'\(.*?\)', '', clean_name).strip()
-                
-                if clean_name and any('\u4e00' <= char <= '\u9fff' for char in clean_name):
-                    new_label = clean_name
-                    # Use translator.translate to get fuzzy matching
-                    print(f"  [{i}] Translating: '{clean_name}'")
-                    translated_cn, english_name = translator.translate(clean_name)
-                    # Check if we found a match
-                    if translated_cn and translated_cn != clean_name:
-                        # Found Chinese translation
-                        new_label = translated_cn
-                        thumbnail_source = english_name if english_name else clean_name
-                        print(f"  [{i}] Found Chinese translation: '{translated_cn}'")
-                    elif english_name and english_name != clean_name:
-                        # No Chinese, but found standardized English name
-                        new_label = english_name
-                        thumbnail_source = english_name
-                        print(f"  [{i}] Using standardized English name: '{english_name}'")
-                    else:
-                        # No match found
-                        print(f"  [{i}] No match found")
-                        if original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
-                            thumbnail_source = original_label
-                            print(f"  [{i}] Using original label as fallback: '{original_label}'")
-                else:
-                    new_label = filename_no_ext
-                    print(f"  [{i}] Translating: '{filename_no_ext}'")
-                    translated_cn, english_name = translator.translate(filename_no_ext)
-                    # Check if we found a match
-                    if translated_cn and translated_cn != filename_no_ext:
-                        # Found Chinese translation
-                        new_label = translated_cn
-                        thumbnail_source = english_name if english_name else filename_no_ext
-                        print(f"  [{i}] Found Chinese translation: '{translated_cn}'")
-                    elif english_name and english_name != filename_no_ext:
-                        # No Chinese, but found standardized English name
-                        new_label = english_name
-                        thumbnail_source = english_name
-                        print(f"  [{i}] Using standardized English name: '{english_name}'")
-                    else:
-                        # No match found
-                        print(f"  [{i}] No match found")
-                        if original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
-                            thumbnail_source = original_label
-                            print(f"  [{i}] Using original label as fallback: '{original_label}'")
-                
-                proposed_changes.append({
-                    'index': i,
-                    'original_label': display_label,
-                    'path': path,
-                    'new_label': new_label,
-                    'thumbnail_source': thumbnail_source,
-                    'system': system_name
-                })
-                continue
+            }
 
-        # Priority 3: Translation
-        candidates = []
-        if path:
-            filename_no_ext = os.path.splitext(os.path.basename(path))[0]
-            if filename_no_ext: candidates.append(filename_no_ext)
-        if original_label and original_label not in candidates:
-            candidates.append(original_label)
-        if path:
-            parent_dir = os.path.basename(os.path.dirname(path))
-            if parent_dir and parent_dir not in candidates:
-                candidates.append(parent_dir)
-        
-        translated_label = None
-        matched_english_name = None
-        standard_english_name = None
-        
-        for candidate in candidates:
-            translation, std_en = translator.translate(candidate)
-            if translation != candidate:
-                # Found Chinese translation
-                translated_label = translation
-                matched_english_name = candidate
-                standard_english_name = std_en
-                break
-            elif std_en != candidate:
-                # No Chinese translation, but found standardized English name
-                # Store this as a fallback option
-                if not standard_english_name:  # Only use first match
-                    standard_english_name = std_en
-                    matched_english_name = candidate
-        
-        
-        # Determine new_label and thumbnail_source
-        # Check if we have a Chinese translation (contains Chinese characters)
-        if translated_label and any('\u4e00' <= char <= '\u9fff' for char in translated_label):
-            # Priority 1: Use Chinese translation
-            new_label = translated_label
-            thumbnail_source = standard_english_name if standard_english_name else matched_english_name
-        elif standard_english_name and standard_english_name != matched_english_name:
-            # Priority 2: Use standardized English name (if different from original)
-            new_label = standard_english_name
-            thumbnail_source = standard_english_name
+    # Priority 1: If original_label already contains Chinese and is not empty, use it
+    # This preserves user's manual edits from previous runs
+    if original_label and any('\u4e00' <= char <= '\u9fff' for char in original_label):
+        logger.debug(f"[{i}] Using existing Chinese label: '{original_label}'")
+        new_label = original_label
+        # Try to find English name for thumbnail
+        translated_cn, english_name = translator.translate(original_label, budget=budget)
+        # Check if we found a match (either name changed from original)
+        if (translated_cn and translated_cn != original_label) or (english_name and english_name != original_label):
+            # We found a match in database
+            if english_name and english_name != original_label:
+                thumbnail_source = english_name
+                logger.debug(f"[{i}] Found thumbnail source: '{english_name}'")
+            # Update to standardized Chinese name if available
+            if translated_cn and translated_cn != original_label:
+                new_label = translated_cn
+                logger.debug(f"[{i}] Updated to standardized Chinese name: '{translated_cn}'")
         else:
-            # No translation or standardization found, keep original
-            new_label = original_label
-            thumbnail_source = original_label
+            # No match found, keep original label but still try to download thumbnails
+            logger.debug(f"[{i}] No thumbnail source found for '{original_label}'")
+            # Fallback to filename for thumbnail source (better than Chinese label)
+            filename_no_ext = os.path.splitext(os.path.basename(path))[0] if path else None
+            thumbnail_source = filename_no_ext if filename_no_ext else original_label
         
-        proposed_changes.append({
+        return {
             'index': i,
             'original_label': display_label,
             'path': path,
             'new_label': new_label,
             'thumbnail_source': thumbnail_source,
             'system': system_name
-        })
+        }
 
-    return proposed_changes
+    # Priority 2: Check if filename (without extension) contains Chinese characters
+    if path:
+        # Handle RetroArch archive paths (e.g. /path/to/Game.zip#Inner.nes)
+        basename = os.path.basename(path)
+        if '#' in basename:
+            basename = basename.split('#')[0]
+        
+        filename_no_ext = os.path.splitext(basename)[0]
+        
+        if filename_no_ext and any('\u4e00' <= char <= '\u9fff' for char in filename_no_ext):
+            import re
+            # Remove content in brackets [] and parentheses ()
+            clean_name = re.sub(r'\[.*?\]', '', filename_no_ext)
+            clean_name = re.sub(r'\(.*?\)', '', clean_name).strip()
+            
+            if clean_name and any('\u4e00' <= char <= '\u9fff' for char in clean_name):
+                new_label = clean_name
+                # Use translator.translate to get fuzzy matching
+                logger.debug(f"[{i}] Translating: '{clean_name}'")
+                translated_cn, english_name = translator.translate(clean_name, budget=budget)
+                # Check if we found a match
+                if translated_cn and translated_cn != clean_name:
+                    # Found Chinese translation
+                    new_label = translated_cn
+                    thumbnail_source = english_name if english_name else clean_name
+                    logger.debug(f"[{i}] Found Chinese translation: '{translated_cn}'")
+                elif english_name and english_name != clean_name:
+                    # No Chinese, but found standardized English name
+                    new_label = english_name
+                    thumbnail_source = english_name
+                    logger.debug(f"[{i}] Using standardized English name: '{english_name}'")
+                else:
+                    # No match found
+                    logger.debug(f"[{i}] No match found")
+                    if original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
+                        thumbnail_source = original_label
+                        logger.debug(f"[{i}] Using original label as fallback: '{original_label}'")
+            else:
+                new_label = filename_no_ext
+                logger.debug(f"[{i}] Translating: '{filename_no_ext}'")
+                translated_cn, english_name = translator.translate(filename_no_ext, budget=budget)
+                # Check if we found a match
+                if translated_cn and translated_cn != filename_no_ext:
+                    # Found Chinese translation
+                    new_label = translated_cn
+                    thumbnail_source = english_name if english_name else filename_no_ext
+                    logger.debug(f"[{i}] Found Chinese translation: '{translated_cn}'")
+                elif english_name and english_name != filename_no_ext:
+                    # No Chinese, but found standardized English name
+                    new_label = english_name
+                    thumbnail_source = english_name
+                    logger.debug(f"[{i}] Using standardized English name: '{english_name}'")
+                else:
+                    # No match found
+                    logger.debug(f"[{i}] No match found")
+                    if original_label and not any('\u4e00' <= char <= '\u9fff' for char in original_label):
+                        thumbnail_source = original_label
+                        logger.debug(f"[{i}] Using original label as fallback: '{original_label}'")
+            
+            return {
+                'index': i,
+                'original_label': display_label,
+                'path': path,
+                'new_label': new_label,
+                'thumbnail_source': thumbnail_source,
+                'system': system_name
+            }
 
-def apply_changes(playlist_path, changes, thumbnails_dir, backup=True, progress_callback=None):
+    # Priority 3: Translation
+    candidates = []
+    if path:
+        filename_no_ext = os.path.splitext(os.path.basename(path))[0]
+        if filename_no_ext: candidates.append(filename_no_ext)
+    if original_label and original_label not in candidates:
+        candidates.append(original_label)
+    if path:
+        parent_dir = os.path.basename(os.path.dirname(path))
+        if parent_dir and parent_dir not in candidates:
+            candidates.append(parent_dir)
+    
+    translated_label = None
+    matched_english_name = None
+    standard_english_name = None
+    
+    for candidate in candidates:
+        translation, std_en = translator.translate(candidate, budget=budget)
+        if translation != candidate:
+            # Found Chinese translation
+            translated_label = translation
+            matched_english_name = candidate
+            standard_english_name = std_en
+            break
+        elif std_en != candidate:
+            # No Chinese translation, but found standardized English name
+            # Store this as a fallback option
+            if not standard_english_name:  # Only use first match
+                standard_english_name = std_en
+                matched_english_name = candidate
+    
+    
+    # Determine new_label and thumbnail_source
+    # Check if we have a Chinese translation (contains Chinese characters)
+    if translated_label and any('\u4e00' <= char <= '\u9fff' for char in translated_label):
+        # Priority 1: Use Chinese translation
+        new_label = translated_label
+        thumbnail_source = standard_english_name if standard_english_name else matched_english_name
+    elif standard_english_name and standard_english_name != matched_english_name:
+        # Priority 2: Use standardized English name (if different from original)
+        new_label = standard_english_name
+        thumbnail_source = standard_english_name
+    else:
+        # No translation or standardization found, keep original
+        new_label = original_label
+        thumbnail_source = original_label
+    
+    return {
+        'index': i,
+        'original_label': display_label,
+        'path': path,
+        'new_label': new_label,
+        'thumbnail_source': thumbnail_source,
+        'system': system_name
+    }
+
+def apply_changes(playlist_path, changes, thumbnails_dir, backup=True, progress_callback=None, downloader=None,
+                  compact=False):
     """
     Applies the changes to the playlist and downloads thumbnails.
+    A long-lived caller can pass its own downloader to reuse the HTTP session.
     """
-    # 0. Backup
-    if backup:
-        backup_path = playlist_path + ".bak"
-        import shutil
-        shutil.copy2(playlist_path, backup_path)
-        print(f"Backed up playlist to {backup_path}")
+    download_tasks = apply_labels(playlist_path, changes, backup, compact)
 
+    # Batch download
+    if download_tasks:
+        downloader = downloader or ThumbnailDownloader(thumbnails_dir)
+        downloader.download_batch(download_tasks, progress_callback=progress_callback)
+
+def apply_labels(playlist_path, changes, backup=True, compact=False, db_path=None):
+    """
+    Writes the new labels to the playlist (after a backup) and returns the thumbnail
+    download tasks [(system, thumbnail_source, new_label), ...] for ThumbnailDownloader.
+    The playlist (and its backup) is only written if a label actually changed.
+    """
     playlist_manager = PlaylistManager(playlist_path)
     # Re-deduplicate to ensure indices match (assuming analyze was run on fresh load)
     # WARNING: If analyze removed items, indices in 'changes' must align with post-deduplication items.
@@ -483,8 +675,8 @@ def apply_changes(playlist_path, changes, thumbnails_dir, backup=True, progress_
     # Since we re-instantiate PlaylistManager, we must ensure deterministic behavior.
     playlist_manager.deduplicate_items()
     
-    downloader = ThumbnailDownloader(thumbnails_dir)
     download_tasks = []
+    queued = set()
     
     for change in changes:
         index = change['index']
@@ -495,18 +687,10 @@ def apply_changes(playlist_path, changes, thumbnails_dir, backup=True, progress_
         
         # Update label
         if new_label:
-            updated = False
-            # Try to find by path first (more robust)
-            if target_path:
-                import unicodedata
-                norm_target = unicodedata.normalize('NFC', target_path)
-                for item in playlist_manager.items:
-                    item_path = item.get('path')
-                    if item_path and unicodedata.normalize('NFC', item_path) == norm_target:
-                        item['label'] = new_label
-                        updated = True
-                        print(f"Updated label for {os.path.basename(target_path)} to '{new_label}'")
-                        break
+            # Try to find by path first (more robust), through the NFC path index
+            updated = playlist_manager.update_label_by_path(target_path, new_label)
+            if updated:
+                logger.debug(f"Updated label for {os.path.basename(target_path)} to '{new_label}'")
             
             # Fallback to index if path not found or not provided
             if not updated:
@@ -514,43 +698,119 @@ def apply_changes(playlist_path, changes, thumbnails_dir, backup=True, progress_
                     # Verify path matches if possible
                     current_item = playlist_manager.items[index]
                     if target_path and current_item.get('path') != target_path:
-                        print(f"Warning: Index {index} path mismatch. Expected {target_path}, got {current_item.get('path')}. Skipping update.")
+                        logger.warning(f"Warning: Index {index} path mismatch. Expected {target_path}, got {current_item.get('path')}. Skipping update.")
                     else:
                         playlist_manager.update_label(index, new_label)
-                        print(f"Updated label at index {index} to '{new_label}'")
+                        logger.debug(f"Updated label at index {index} to '{new_label}'")
                 else:
-                    print(f"Error: Index {index} out of bounds. Skipping update.")
+                    logger.error(f"Error: Index {index} out of bounds. Skipping update.")
             
-        # Collect download task
+        # Collect download task (once per title: the discs of a game share theirs)
         if thumbnail_source and new_label:
-            download_tasks.append((system, thumbnail_source, new_label))
+            task = (system, thumbnail_source, new_label)
+            if task not in queued:
+                queued.add(task)
+                download_tasks.append(task)
             
-    # Save playlist
-    playlist_manager.save(playlist_path)
-    print(f"Saved updated playlist to {playlist_path}")
+    # Save playlist (the backup is the file as it was before this save)
+    backup_path = playlist_path + ".bak" if backup else None
+    if playlist_manager.save(playlist_path, compact=compact, backup_path=backup_path):
+        if backup_path:
+            logger.info(f"Backed up playlist to {backup_path}")
+        logger.info(f"Saved updated playlist to {playlist_path}")
+    else:
+        logger.info(f"No labels changed, {playlist_path} left as is")
+
+    # Remember the applied labels, so the next incremental run recognizes these items
+    fingerprint_db = DatabaseManager(db_path=db_path)
+    fingerprint_db.update_item_fingerprints(os.path.abspath(playlist_path), changes)
+    fingerprint_db.close()
     
     # Verify save
     try:
         import time
         mtime = os.path.getmtime(playlist_path)
-        print(f"File modification time: {time.ctime(mtime)}")
+        logger.debug(f"File modification time: {time.ctime(mtime)}")
         # Optional: Read back first item to verify
         # with open(playlist_path, 'r', encoding='utf-8') as f:
         #     data = json.load(f)
         #     print(f"Verification - First item label: {data['items'][0].get('label')}")
     except Exception as e:
-        print(f"Verification failed: {e}")
-    
-    # Batch download
-    if download_tasks:
-        downloader.download_batch(download_tasks, progress_callback=progress_callback)
+        logger.error(f"Verification failed: {e}")
 
-def process_playlist(playlist_path, system_name, thumbnails_dir, rom_name_cn_path):
-    print(f"Analyzing playlist: {playlist_path}")
-    changes = analyze_playlist(playlist_path, system_name, rom_name_cn_path)
-    
-    print(f"Applying {len(changes)} changes...")
-    apply_changes(playlist_path, changes, thumbnails_dir)
+    return download_tasks
+
+def watch_playlists(batch_dir, thumbnails_dir, rom_name_cn_path, config, interval=2.0, debounce=2.0):
+    """
+    Long-lived batch mode: the pooled translators (database, DAT indexes) and the
+    downloader's HTTP session stay warm between runs, and each changed playlist is
+    processed incrementally, so only its new or changed items are resolved.
+    """
+    # Keep every system's translator for the whole session instead of closing it after 10 idle minutes
+    translator_pool.idle_timeout = float('inf')
+    downloader = create_downloader(thumbnails_dir, config)
+
+    def process(playlist_path):
+        system_name = detect_system(playlist_path)
+        if not system_name:
+            logger.warning(f"Skipping {playlist_path}: Could not detect system name.")
+            return
+        process_playlist(playlist_path, system_name, thumbnails_dir, rom_name_cn_path, config, downloader=downloader)
+
+    try:
+        PlaylistWatcher(batch_dir, process, interval=interval, debounce=debounce).run()
+    except KeyboardInterrupt:
+        logger.info("Stopped watching.")
+    finally:
+        downloader.close()
+
+def process_playlist(playlist_path, system_name, thumbnails_dir, rom_name_cn_path, config=None, downloader=None):
+    logger.info(f"Analyzing playlist: {playlist_path}")
+    config = config or {}
+    stats = {}
+    fuzzy_budget = FuzzyBudget.from_config(config)
+    incremental = config.get("incremental", True)
+    own_downloader = downloader is None
+    if own_downloader:
+        downloader = create_downloader(thumbnails_dir, config)
+    try:
+        if config.get("pipeline", True):
+            _process_pipelined(playlist_path, system_name, thumbnails_dir, rom_name_cn_path, stats, fuzzy_budget,
+                               incremental, downloader, config.get("compact_playlists", False))
+        else:
+            changes = analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=stats,
+                                       fuzzy_budget=fuzzy_budget, incremental=incremental)
+
+            logger.info(f"Applying {len(changes)} changes...")
+            apply_changes(playlist_path, changes, thumbnails_dir, downloader=downloader,
+                          compact=config.get("compact_playlists", False))
+    finally:
+        if own_downloader:
+            downloader.close()
+
+    logger.info("\nTranslation tier summary:")
+    logger.info(format_stats(stats))
+
+def _process_pipelined(playlist_path, system_name, thumbnails_dir, rom_name_cn_path, stats, fuzzy_budget,
+                       incremental=True, downloader=None, compact=False):
+    """
+    Analysis and thumbnail downloads overlap: each resolved item's download is queued
+    right away (DownloadPipeline, bounded), and the playlist is saved once both are done.
+    """
+    downloader = downloader or ThumbnailDownloader(thumbnails_dir)
+    changes = []
+    with DownloadPipeline(downloader) as pipeline:
+        for change in iter_analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=stats,
+                                            fuzzy_budget=fuzzy_budget, incremental=incremental):
+            changes.append(change)
+            if change['thumbnail_source'] and change['new_label']:
+                pipeline.add(change['system'], change['thumbnail_source'], change['new_label'])
+        logger.info(f"Analysis done, waiting for {pipeline.added - pipeline.completed} queued download(s)...")
+
+    logger.info(f"Applying {len(changes)} changes...")
+    apply_labels(playlist_path, changes, compact=compact)
 
 if __name__ == "__main__":
+    # Batch worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
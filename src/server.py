@@ -5,6 +5,11 @@ import os
 import sys
 import glob
 import subprocess
+from log_stream import get_logger, setup_logging, log_buffer
+from playlist_manager import detect_system_name
+from thumbnail_downloader import create_downloader
+
+logger = get_logger("server")
 
 PORT = 7777
 CONFIG_FILE = "config.json"
@@ -37,24 +42,40 @@ class JobManager:
                 'total': 0,
                 'message': '',
                 'result': None,
-                'error': None
+                'error': None,
+                'details': {},  # job specific progress fields, e.g. the current translator tier
+                'cancel': threading.Event(),  # set by cancel_job, checked by the job itself
+                'log_seq': log_buffer.last_seq()  # log records after this one belong to the job
             }
         return job_id
 
-    def update_job(self, job_id, progress, total, message):
+    def update_job(self, job_id, progress, total, message, **details):
         with self.lock:
             if job_id in self.jobs:
                 self.jobs[job_id]['progress'] = progress
                 self.jobs[job_id]['total'] = total
                 self.jobs[job_id]['message'] = message
-                self.jobs[job_id]['status'] = 'running'
+                self.jobs[job_id]['details'].update(details)
+                if self.jobs[job_id]['status'] == 'pending':
+                    self.jobs[job_id]['status'] = 'running'
 
     def complete_job(self, job_id, result=None):
         with self.lock:
             if job_id in self.jobs:
-                self.jobs[job_id]['status'] = 'completed'
-                self.jobs[job_id]['result'] = result
-                self.jobs[job_id]['progress'] = self.jobs[job_id]['total']
+                job = self.jobs[job_id]
+                job['status'] = 'cancelled' if job['cancel'].is_set() else 'completed'
+                job['result'] = result
+                if job['status'] == 'completed':
+                    job['progress'] = job['total']
+
+    def cancel_job(self, job_id):
+        """Asks a running job to stop; the job finishes with status 'cancelled'."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['status'] not in ('pending', 'running'):
+                return False
+            job['cancel'].set()
+            return True
 
     def fail_job(self, job_id, error):
         with self.lock:
@@ -68,6 +89,151 @@ class JobManager:
 
 job_manager = JobManager()
 
+class PreviewSessions:
+    """
+    Preview results kept on the server by session id (the id of the preview job), so the
+    browser only reads the rows it shows, sends back the rows it edits and applies by id.
+    Sessions that were not used for SESSION_TTL seconds are dropped.
+
+    A row is unmatched when its new label has no Chinese characters, i.e. the translation
+    data had no Chinese name for the item (whatever the file happens to be called).
+    """
+    SESSION_TTL = 3600
+
+    FILTERS = {
+        'all': lambda change: True,
+        'unmatched': lambda change: not has_chinese(change['new_label']),
+        'deferred': lambda change: change.get('deferred'),
+        'edited': lambda change: change.get('edited'),
+    }
+    EDITABLE_FIELDS = ('new_label', 'thumbnail_source')
+
+    def __init__(self):
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create(self, session_id, playlist_path, system_name):
+        now = time.time()
+        with self.lock:
+            for expired in [sid for sid, s in self.sessions.items() if now - s['last_used'] > self.SESSION_TTL]:
+                del self.sessions[expired]
+            session = self.sessions[session_id] = {
+                'id': session_id,
+                'playlist_path': playlist_path,
+                'system_name': system_name,
+                'changes': [],  # appended by the preview job, by item index
+                'complete': False,  # set once the preview job analyzed every item
+                'last_used': now
+            }
+        return session
+
+    def get(self, session_id):
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session['last_used'] = time.time()
+            return session
+
+    def page(self, session_id, offset=0, limit=200, filter_name='all'):
+        """(rows, matching, total) for the rows matching the filter, or None for an unknown session."""
+        session = self.get(session_id)
+        if session is None:
+            return None
+        keep = self.FILTERS.get(filter_name, self.FILTERS['all'])
+        with self.lock:
+            changes = list(session['changes'])
+            matching = [change for change in changes if keep(change)]
+        return matching[offset:offset + limit], len(matching), len(changes)
+
+    def changes_to_apply(self, session_id):
+        """
+        The changes of a session whose preview ran to the end, or None for an unknown
+        session. Raises ValueError while the preview is incomplete (running, cancelled or
+        failed), since applying it would skip the items not analyzed yet.
+        """
+        session = self.get(session_id)
+        if session is None:
+            return None
+        with self.lock:
+            if not session['complete']:
+                raise ValueError("Preview has not completed")
+            return list(session['changes'])
+
+    def edit(self, session_id, edits):
+        """
+        Applies sparse edits [{'index': i, 'new_label': ..., 'thumbnail_source': ...}, ...]
+        and returns how many rows were updated, or None for an unknown session.
+        """
+        session = self.get(session_id)
+        if session is None:
+            return None
+        updated = 0
+        with self.lock:
+            changes = session['changes']
+            for edit in edits:
+                index = edit.get('index')
+                if not isinstance(index, int) or not 0 <= index < len(changes):
+                    continue
+                fields = {k: edit[k] for k in self.EDITABLE_FIELDS if k in edit}
+                if fields:
+                    changes[index].update(fields)
+                    changes[index]['edited'] = True
+                    updated += 1
+        return updated
+
+preview_sessions = PreviewSessions()
+
+def has_chinese(text):
+    return bool(text) and any('\u4e00' <= char <= '\u9fff' for char in text)
+
+def run_preview_job(job_id, session):
+    """
+    Analyzes a playlist in the background. The changes are stored in the preview session
+    as they are decided, progress carries the items analyzed and the current tier.
+    """
+    import plcn
+    from fuzzy_budget import FuzzyBudget
+
+    job = job_manager.get_job(job_id)
+    playlist_path, system_name = session['playlist_path'], session['system_name']
+    changes = session['changes']
+    stats = {}
+
+    def progress_cb(analyzed, total, tier):
+        if tier is None:
+            job_manager.update_job(job_id, analyzed, total, f"已分析 {analyzed}/{total}")
+        else:
+            job_manager.update_job(job_id, analyzed, total, job['message'], tier=tier)
+
+    try:
+        config, rom_name_cn_path = load_analysis_config()
+        for change in plcn.iter_analyze_playlist(playlist_path, system_name, rom_name_cn_path, stats=stats,
+                                                 fuzzy_budget=FuzzyBudget.from_config(config),
+                                                 cancel=job['cancel'], progress_callback=progress_cb,
+                                                 incremental=config.get("incremental", True)):
+            changes.append(change)
+        if not job['cancel'].is_set():
+            with preview_sessions.lock:
+                session['complete'] = True
+        job_manager.complete_job(job_id, {"count": len(changes), "stats": stats})
+    except Exception as e:
+        logger.exception(f"Preview failed: {e}")
+        job_manager.fail_job(job_id, str(e))
+
+def load_analysis_config():
+    """Returns (config, rom_name_cn_path) for an analysis run and applies the translator pool settings."""
+    config = {}
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as f:
+            config = json.load(f)
+    rom_name_cn_path = config.get("rom_name_cn_path", "data/rom-name-cn")
+    if getattr(sys, 'frozen', False) and not os.path.isabs(rom_name_cn_path):
+        rom_name_cn_path = os.path.join(sys._MEIPASS, rom_name_cn_path)
+
+    from translator_pool import translator_pool
+    translator_pool.use_snapshot = config.get("translation_snapshot", True)
+    return config, rom_name_cn_path
+
 class ConfigHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         parsed_path = urllib.parse.urlparse(self.path)
@@ -100,6 +266,17 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             keyword = query_params.get('query', [''])[0]
             system = query_params.get('system', [None])[0]
             self.search_db(keyword, system)
+        elif path == "/api/stats":
+            self.send_stats()
+        elif path == "/api/logs":
+            since = int(query_params.get('since', ['0'])[0] or 0)
+            self.send_logs(since)
+        elif path == "/api/playlist/preview/changes":
+            session_id = query_params.get('session_id', [''])[0]
+            offset = int(query_params.get('offset', ['0'])[0] or 0)
+            limit = int(query_params.get('limit', ['200'])[0] or 200)
+            filter_name = query_params.get('filter', ['all'])[0]
+            self.send_preview_changes(session_id, offset, limit, filter_name)
         elif path == "/api/progress":
             job_id = query_params.get('job_id', [''])[0]
             self.stream_progress(job_id)
@@ -205,16 +382,8 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             return
 
         try:
-            system_name = ""
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                items = data.get('items', [])
-                if items:
-                    # Try to get db_name from the first item
-                    # Format is usually "System Name.lpl"
-                    db_name = items[0].get('db_name', '')
-                    if db_name:
-                        system_name = os.path.splitext(db_name)[0]
+            # Streams only the first few items (db_name is usually "System Name.lpl")
+            system_name = detect_system_name(path) or ""
             
             self.send_response(200)
             self.send_header("Content-type", "application/json")
@@ -234,19 +403,19 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                     config = json.load(f)
             
             rom_name_cn_path = config.get("rom_name_cn_path", "data/rom-name-cn")
-            print(f"DEBUG search_db: Original rom_name_cn_path = {rom_name_cn_path}")
-            print(f"DEBUG search_db: sys.frozen = {getattr(sys, 'frozen', False)}")
-            print(f"DEBUG search_db: sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not set')}")
+            logger.debug(f"search_db: Original rom_name_cn_path = {rom_name_cn_path}")
+            logger.debug(f"search_db: sys.frozen = {getattr(sys, 'frozen', False)}")
+            logger.debug(f"search_db: sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not set')}")
             
             if getattr(sys, 'frozen', False) and not os.path.isabs(rom_name_cn_path):
                 rom_name_cn_path = os.path.join(sys._MEIPASS, rom_name_cn_path)
-                print(f"DEBUG search_db: Updated rom_name_cn_path = {rom_name_cn_path}")
+                logger.debug(f"search_db: Updated rom_name_cn_path = {rom_name_cn_path}")
             
-            print(f"DEBUG search_db: Final rom_name_cn_path = {rom_name_cn_path}")
-            print(f"DEBUG search_db: Path exists = {os.path.exists(rom_name_cn_path)}")
+            logger.debug(f"search_db: Final rom_name_cn_path = {rom_name_cn_path}")
+            logger.debug(f"search_db: Path exists = {os.path.exists(rom_name_cn_path)}")
             if os.path.exists(rom_name_cn_path):
                 csv_files = glob.glob(os.path.join(rom_name_cn_path, "*.csv"))
-                print(f"DEBUG search_db: Found {len(csv_files)} CSV files")
+                logger.debug(f"search_db: Found {len(csv_files)} CSV files")
 
             # Manual search now ONLY uses LibretroDB for comprehensive game coverage
             results = []
@@ -258,7 +427,7 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(json.dumps({"error": "System parameter required for search"}).encode())
                 return
             
-            print(f"DEBUG search_db: Searching LibretroDB for keyword='{keyword}', system='{system}'")
+            logger.debug(f"search_db: Searching LibretroDB for keyword='{keyword}', system='{system}'")
             
             try:
                 # Create LibretroDB instance
@@ -267,12 +436,12 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 libretro_db = LibretroDB(storage_path)
                 
                 # Load DAT file for the specified system
-                print(f"DEBUG search_db: Loading DAT for system '{system}'...")
+                logger.debug(f"search_db: Loading DAT for system '{system}'...")
                 if libretro_db.load_system_dat(system):
-                    print(f"DEBUG search_db: DAT loaded successfully, searching...")
+                    logger.debug(f"search_db: DAT loaded successfully, searching...")
                     libretro_results = libretro_db.search(keyword, limit=50)
                     
-                    print(f"DEBUG search_db: Found {len(libretro_results)} matches in LibretroDB")
+                    logger.debug(f"search_db: Found {len(libretro_results)} matches in LibretroDB")
                     
                     # Initialize DatabaseManager
                     from database import DatabaseManager
@@ -299,9 +468,9 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                         
                     # 2. Search Local Database (includes missing_games.csv)
                     # This allows finding games that are NOT in LibretroDB but are in our local files
-                    print(f"DEBUG search_db: Searching local DB for '{keyword}'...")
+                    logger.debug(f"search_db: Searching local DB for '{keyword}'...")
                     local_results = db_manager.search_by_keyword(keyword, system=system, limit=20)
-                    print(f"DEBUG search_db: Found {len(local_results)} matches in local DB")
+                    logger.debug(f"search_db: Found {len(local_results)} matches in local DB")
                     
                     for item in local_results:
                         if item['english_name'] not in added_names:
@@ -313,12 +482,10 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                             added_names.add(item['english_name'])
                             
                 else:
-                    print(f"ERROR search_db: Failed to load DAT for system '{system}'")
+                    logger.error(f"search_db: Failed to load DAT for system '{system}'")
                     
             except Exception as e:
-                import traceback
-                print(f"ERROR searching LibretroDB: {e}")
-                print(traceback.format_exc())
+                logger.exception(f"Error searching LibretroDB: {e}")
 
             
             self.send_response(200)
@@ -331,6 +498,53 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(json.dumps({"error": str(e)}).encode())
 
+    def send_stats(self):
+        # Cumulative translator tier statistics (see TranslatorPool.stats)
+        try:
+            from translator_pool import translator_pool
+            self.send_response(200)
+            self.send_header("Content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(translator_pool.stats()).encode())
+        except Exception as e:
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
+
+    def send_logs(self, since=0):
+        # Log records after sequence number 'since' (same stream as the console)
+        records = log_buffer.since(since)
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({
+            "records": records,
+            "last_seq": records[-1]['seq'] if records else since
+        }).encode())
+
+    def send_preview_changes(self, session_id, offset=0, limit=200, filter_name='all'):
+        """
+        One page of a preview session's changes, optionally only the rows matching a filter
+        (all, unmatched, deferred, edited). Works while the preview job is still running.
+        """
+        page = preview_sessions.page(session_id, offset, limit, filter_name)
+        if page is None:
+            self.send_response(404)
+            self.send_header("Content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": "Preview session not found"}).encode())
+            return
+        changes, matching, total = page
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({
+            "changes": changes,
+            "offset": offset,
+            "matching": matching,
+            "total": total
+        }).encode())
+
     def stream_progress(self, job_id):
         self.send_response(200)
         self.send_header("Content-type", "text/event-stream")
@@ -338,6 +552,7 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header("Connection", "keep-alive")
         self.end_headers()
 
+        log_seq = None
         while True:
             job = job_manager.get_job(job_id)
             if not job:
@@ -350,8 +565,17 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 "total": job['total'],
                 "message": job['message'],
                 "result": job['result'],
-                "error": job['error']
+                "error": job['error'],
+                "details": job['details']
             }
+
+            # Log lines written since the last event
+            if log_seq is None:
+                log_seq = job['log_seq']
+            records = log_buffer.since(log_seq)
+            if records:
+                log_seq = records[-1]['seq']
+                data["logs"] = [{"level": r['level'], "message": r['message']} for r in records]
             
             try:
                 self.wfile.write(b"data: " + json.dumps(data).encode() + b"\n\n")
@@ -359,7 +583,7 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             except BrokenPipeError:
                 break
 
-            if job['status'] in ['completed', 'failed']:
+            if job['status'] in ['completed', 'failed', 'cancelled']:
                 break
             
             time.sleep(0.5)
@@ -371,6 +595,12 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             
             try:
                 config_data = json.loads(post_data)
+                # Keep keys the UI does not edit (fuzzy_*, translation_snapshot, ...)
+                if os.path.exists(CONFIG_FILE):
+                    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                        existing = json.load(f)
+                    existing.update(config_data)
+                    config_data = existing
                 with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
                     json.dump(config_data, f, indent=4, ensure_ascii=False)
                 self.send_response(200)
@@ -391,22 +621,18 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 data = json.loads(post_data)
                 playlist_path = data.get('playlist_path')
                 system_name = data.get('system_name')
-                
-                config = {}
-                if os.path.exists(CONFIG_FILE):
-                    with open(CONFIG_FILE, 'r') as f:
-                        config = json.load(f)
-                rom_name_cn_path = config.get("rom_name_cn_path", "data/rom-name-cn")
-                if getattr(sys, 'frozen', False) and not os.path.isabs(rom_name_cn_path):
-                     rom_name_cn_path = os.path.join(sys._MEIPASS, rom_name_cn_path)
-                
-                import plcn
-                changes = plcn.analyze_playlist(playlist_path, system_name, rom_name_cn_path)
-                
+
+                # Large previews run as a job: the UI follows /api/progress and pages
+                # through the session's changes with /api/playlist/preview/changes
+                job_id = job_manager.create_job()
+                session = preview_sessions.create(job_id, playlist_path, system_name)
+                thread = threading.Thread(target=run_preview_job, args=(job_id, session))
+                thread.start()
+
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
                 self.end_headers()
-                self.wfile.write(json.dumps({"changes": changes}).encode())
+                self.wfile.write(json.dumps({"job_id": job_id, "session_id": session['id']}).encode())
             except Exception as e:
                 import traceback
                 traceback.print_exc()
@@ -415,6 +641,34 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(json.dumps({"error": str(e)}).encode())
             return
 
+        elif self.path == "/api/playlist/preview/edit":
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data)
+            updated = preview_sessions.edit(data.get('session_id', ''), data.get('edits', []))
+            if updated is None:
+                self.send_response(404)
+                self.send_header("Content-type", "application/json")
+                self.end_headers()
+                self.wfile.write(json.dumps({"error": "Preview session not found"}).encode())
+                return
+            self.send_response(200)
+            self.send_header("Content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"updated": updated}).encode())
+            return
+
+        elif self.path == "/api/jobs/cancel":
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data)
+            cancelled = job_manager.cancel_job(data.get('job_id', ''))
+            self.send_response(200)
+            self.send_header("Content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"cancelled": cancelled}).encode())
+            return
+
         elif self.path == "/api/playlist/apply":
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
@@ -424,6 +678,22 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 playlist_path = data.get('playlist_path')
                 changes = data.get('changes')
                 thumbnails_dir = data.get('thumbnails_dir')
+
+                # Apply a preview session kept on the server instead of an uploaded list
+                session_id = data.get('session_id')
+                if session_id:
+                    session = preview_sessions.get(session_id)
+                    if session is None:
+                        raise ValueError("Preview session not found")
+                    try:
+                        changes = preview_sessions.changes_to_apply(session_id)
+                    except ValueError as e:
+                        self.send_response(409)
+                        self.send_header("Content-type", "application/json")
+                        self.end_headers()
+                        self.wfile.write(json.dumps({"error": str(e)}).encode())
+                        return
+                    playlist_path = playlist_path or session['playlist_path']
                 
                 # Create Job
                 job_id = job_manager.create_job()
@@ -434,7 +704,13 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                         def progress_cb(curr, tot, msg):
                             job_manager.update_job(jid, curr, tot, msg)
                             
-                        plcn.apply_changes(p_path, chgs, t_dir, progress_callback=progress_cb)
+                        config = load_analysis_config()[0]
+                        downloader = create_downloader(t_dir, config)
+                        try:
+                            plcn.apply_changes(p_path, chgs, t_dir, progress_callback=progress_cb, downloader=downloader,
+                                               compact=config.get("compact_playlists", False))
+                        finally:
+                            downloader.close()
                         job_manager.complete_job(jid)
                     except Exception as e:
                         import traceback
@@ -474,10 +750,13 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                 # Create Job
                 job_id = job_manager.create_job()
                 
+                # Playlists analyzed in parallel (worker processes); config.json: batch_jobs
+                jobs = data.get('jobs') or load_analysis_config()[0].get("batch_jobs", 1)
+
                 def run_batch_job(jid, b_dir, t_dir, r_path):
                     try:
-                        import plcn
                         import glob
+                        from batch_runner import run_batch
                         
                         # Find all .lpl files
                         playlist_files = glob.glob(os.path.join(b_dir, "*.lpl"))
@@ -488,26 +767,16 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
                             return
 
                         job_manager.update_job(jid, 0, total_files, f"Found {total_files} playlists.")
-                        
-                        for i, playlist_path in enumerate(playlist_files):
-                            filename = os.path.basename(playlist_path)
-                            job_manager.update_job(jid, i, total_files, f"Processing {filename}...")
-                            
-                            system_name = os.path.splitext(filename)[0]
-                            
-                            try:
-                                # 1. Analyze
-                                changes = plcn.analyze_playlist(playlist_path, system_name, r_path)
-                                
-                                # 2. Apply (with backup)
-                                # We pass a dummy progress callback or None, as we track file-level progress here.
-                                # Or we could aggregate progress? For simplicity, just file-level.
-                                plcn.apply_changes(playlist_path, changes, t_dir, backup=True)
-                                
-                            except Exception as e:
-                                print(f"Error processing {filename}: {e}")
-                                
-                        job_manager.complete_job(jid, f"Processed {total_files} playlists.")
+                        playlists = [(path, os.path.splitext(os.path.basename(path))[0]) for path in playlist_files]
+
+                        def progress_cb(curr, tot, msg):
+                            job_manager.update_job(jid, curr, tot, msg)
+
+                        config = load_analysis_config()[0]
+                        result = run_batch(playlists, t_dir, r_path, jobs=int(jobs), config=config,
+                                           progress_callback=progress_cb, cancel=job_manager.get_job(jid)['cancel'])
+                        failed = f", {len(result['failed'])} failed" if result['failed'] else ""
+                        job_manager.complete_job(jid, f"Processed {total_files} playlists{failed}.")
                     except Exception as e:
                         import traceback
                         traceback.print_exc()
@@ -543,6 +812,7 @@ class ConfigHandler(http.server.SimpleHTTPRequestHandler):
             self.wfile.write(b"Template not found")
 
 def run_server():
+    setup_logging()
     # Change to the directory where we want to store config.json
     if getattr(sys, 'frozen', False):
         # If frozen, use the executable's directory
@@ -553,22 +823,24 @@ def run_server():
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         os.chdir(project_root)
     
-    print(f"DEBUG: sys.frozen = {getattr(sys, 'frozen', False)}")
+    logger.debug(f"sys.frozen = {getattr(sys, 'frozen', False)}")
     if getattr(sys, 'frozen', False):
-        print(f"DEBUG: sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not Found')}")
-    print(f"DEBUG: TEMPLATE_DIR = {TEMPLATE_DIR}")
+        logger.debug(f"sys._MEIPASS = {getattr(sys, '_MEIPASS', 'Not Found')}")
+    logger.debug(f"TEMPLATE_DIR = {TEMPLATE_DIR}")
     if os.path.exists(TEMPLATE_DIR):
-        print(f"DEBUG: Contents of TEMPLATE_DIR: {os.listdir(TEMPLATE_DIR)}")
+        logger.debug(f"Contents of TEMPLATE_DIR: {os.listdir(TEMPLATE_DIR)}")
     else:
-        print(f"DEBUG: TEMPLATE_DIR does not exist!")
+        logger.debug(f"TEMPLATE_DIR does not exist!")
 
-    print(f"Starting server at http://localhost:{PORT}")
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", PORT), ConfigHandler) as httpd:
+    logger.info(f"Starting server at http://localhost:{PORT}")
+    # Threaded, so progress/preview streams do not block the cancel and other API calls
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    with socketserver.ThreadingTCPServer(("", PORT), ConfigHandler) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
-            print("\nServer stopped.")
+            logger.info("\nServer stopped.")
 
 if __name__ == "__main__":
     run_server()
@@ -1,60 +1,100 @@
 import os
+import queue
+import threading
 import requests
 import urllib.parse
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from log_stream import get_logger
+
+logger = get_logger("thumbnail_downloader")
+
+DOWNLOAD_ENGINES = ("threads", "async")
+
+
+def create_downloader(thumbnails_dir, config=None):
+    """
+    The downloader selected by config.json: download_engine "threads" (default, a
+    ThreadPoolExecutor per batch) or "async" (AsyncThumbnailDownloader, with
+    download_connections connections per host). Unless thumbnail_index is false, it
+    checks names against the server's directory listings first (RemoteThumbnailIndex,
+    cached for thumbnail_index_ttl seconds), and unless thumbnail_store is false,
+    images go through a content-addressed ThumbnailStore (where the filesystem has hardlinks).
+    """
+    config = config or {}
+    if config.get("download_engine", "threads") == "async":
+        from async_downloader import AsyncThumbnailDownloader
+        downloader = AsyncThumbnailDownloader(thumbnails_dir, max_connections=config.get("download_connections", 16))
+    else:
+        downloader = ThumbnailDownloader(thumbnails_dir)
+    if config.get("thumbnail_index", True):
+        from thumbnail_index import RemoteThumbnailIndex, DEFAULT_TTL
+        downloader.index = RemoteThumbnailIndex(downloader.session, os.path.join(thumbnails_dir, ".plcn", "index"),
+                                                ttl=config.get("thumbnail_index_ttl", DEFAULT_TTL))
+    if config.get("thumbnail_store", True):
+        from thumbnail_store import ThumbnailStore
+        downloader.store = ThumbnailStore(os.path.join(thumbnails_dir, ".plcn", "store"))
+    return downloader
+
 
 class ThumbnailDownloader:
     BASE_URL = "https://thumbnails.libretro.com"
+    TYPES = ["Named_Boxarts", "Named_Snaps", "Named_Titles"]
 
-    def __init__(self, thumbnails_dir, max_workers=5):
+    def __init__(self, thumbnails_dir, max_workers=5, index=None, store=None, adapter=None):
         self.thumbnails_dir = thumbnails_dir
         self.max_workers = max_workers
+        # Optional RemoteThumbnailIndex: names missing on the server are not requested
+        self.index = index
+        # Optional ThumbnailStore: images fetched once are linked, not fetched again
+        self.store = store
         
-        # Setup session with retry
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
-        
+        # Setup session with retry (unless a subclass brings its own adapter)
+        if adapter is None:
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+            adapter = HTTPAdapter(max_retries=retries)
+
         self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries)
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
 
+    def close(self):
+        self.session.close()
+
     def download_thumbnail(self, system, game_english_name, game_chinese_name):
         """
         Downloads thumbnails for a single game.
         Returns a list of results (success/fail messages).
         """
         # Thumbnail types
-        types = ["Named_Boxarts", "Named_Snaps", "Named_Titles"]
-        
-        # The filename on the server usually matches the game label in the playlist (English),
-        # but with special characters replaced.
-        server_filename = self.sanitize_filename(game_english_name) + ".png"
+        types = self.TYPES
         
         results = []
         for type_name in types:
-            url = f"{self.BASE_URL}/{urllib.parse.quote(system)}/{type_name}/{urllib.parse.quote(server_filename)}"
-            
-            # Target directory
-            target_dir = os.path.join(self.thumbnails_dir, system, type_name)
-            os.makedirs(target_dir, exist_ok=True)
-            
             # Target file path (using Chinese name)
-            target_filename = self.sanitize_filename(game_chinese_name) + ".png"
-            target_path = os.path.join(target_dir, target_filename)
+            target_path = self.target_path(system, type_name, game_chinese_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
             
             if os.path.exists(target_path):
                 results.append(f"Successfully skipped {type_name}: {game_chinese_name} (已存在)")
                 continue
 
+            server_filename = self.server_filename(system, type_name, game_english_name)
+            if server_filename is None:
+                results.append(f"Failed {type_name}: not on the server")
+                continue
+            if self.from_store(system, type_name, server_filename, target_path):
+                results.append(f"Successfully linked {type_name}: {game_chinese_name} (from store)")
+                continue
+            url = self.thumbnail_url(system, type_name, server_filename)
+
             # print(f"Downloading {type_name} for {game_english_name}...")
             try:
                 # Use session with retry
                 response = self.session.get(url, timeout=10)
                 if response.status_code == 200:
-                    with open(target_path, 'wb') as f:
-                        f.write(response.content)
+                    self.save_image(system, type_name, server_filename, response.content, target_path)
                     results.append(f"Successfully downloaded {type_name}: {game_chinese_name}")
                 else:
                     results.append(f"Failed {type_name}: HTTP {response.status_code}")
@@ -62,12 +102,69 @@ class ThumbnailDownloader:
                 results.append(f"Error {type_name}: {e}")
         return results
 
+    def server_filename(self, system, type_name, game_english_name):
+        """
+        The server file name usually matches the game label in the playlist (English),
+        but with special characters replaced. With an index, a near miss is replaced by
+        the file the server has, and None means the server has no such file.
+        """
+        filename = self.sanitize_filename(game_english_name) + ".png"
+        if self.index is None:
+            return filename
+        resolved = self.index.resolve(self.BASE_URL, system, type_name, filename)
+        if resolved and resolved != filename:
+            logger.debug(f"{type_name}: '{filename}' resolved to '{resolved}' on the server")
+        return resolved
+
+    def uses_store(self):
+        """True if there is a thumbnail store and it can hardlink (see ThumbnailStore)."""
+        return self.store is not None and self.store.supports_hardlinks()
+
+    def from_store(self, system, type_name, server_filename, target_path):
+        """Creates target_path from the thumbnail store if this server file was fetched before."""
+        if not self.uses_store():
+            return False
+        stored = self.store.get(system, type_name, server_filename)
+        if stored is None:
+            return False
+        self.store.link(stored, target_path)
+        return True
+
+    def save_image(self, system, type_name, server_filename, content, target_path):
+        """Writes a fetched image to target_path, through the thumbnail store if there is one."""
+        if not self.uses_store():
+            with open(target_path, 'wb') as f:
+                f.write(content)
+            return
+        self.store.link(self.store.put(system, type_name, server_filename, content), target_path)
+
+    def thumbnail_url(self, system, type_name, server_filename):
+        return f"{self.BASE_URL}/{urllib.parse.quote(system)}/{type_name}/{urllib.parse.quote(server_filename)}"
+
+    def target_path(self, system, type_name, game_chinese_name):
+        """Local file of one thumbnail type, named after the Chinese label as RetroArch looks it up."""
+        target_filename = self.sanitize_filename(game_chinese_name) + ".png"
+        return os.path.join(self.thumbnails_dir, system, type_name, target_filename)
+
+    def is_complete(self, system, game_chinese_name):
+        """True if all thumbnail types of this game are already on disk (nothing to download)."""
+        return all(os.path.exists(self.target_path(system, type_name, game_chinese_name))
+                   for type_name in self.TYPES)
+
     def download_batch(self, tasks, progress_callback=None):
         """
         Downloads thumbnails for multiple games in parallel.
         tasks: List of tuples (system, game_english_name, game_chinese_name)
+        Games whose thumbnails are all on disk already are skipped up front.
         """
-        print(f"Starting batch download for {len(tasks)} items with {self.max_workers} threads...")
+        pending = [task for task in tasks if not self.is_complete(task[0], task[2])]
+        if len(pending) < len(tasks):
+            logger.info(f"Skipping {len(tasks) - len(pending)} item(s) with complete thumbnails")
+        tasks = pending
+        if not tasks:
+            return
+
+        logger.info(f"Starting batch download for {len(tasks)} items with {self.max_workers} threads...")
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tasks
@@ -84,30 +181,34 @@ class ThumbnailDownloader:
                 completed += 1
                 try:
                     results = future.result()
-                    # Build detailed message
-                    success_count = sum(1 for r in results if "Successfully" in r or "已存在" in r)
-                    failure_count = len(results) - success_count
-                    
-                    if success_count > 0 and failure_count == 0:
-                        message = f"✓ {cn_name} - 下载成功 ({success_count} 个封面)"
-                    elif success_count > 0:
-                        message = f"⚠ {cn_name} - 部分成功 ({success_count} 成功, {failure_count} 失败)"
-                    else:
-                        message = f"✗ {cn_name} - 下载失败"
-                    
-                    # Print detailed results to console
-                    if results:
-                        for res in results:
-                            print(res)
+                    message = self.summarize_results(cn_name, results)
                     
                     if progress_callback:
                         progress_callback(completed, total, message)
                 except Exception as exc:
                     error_msg = f"✗ {cn_name} - 错误: {str(exc)}"
-                    print(f"[{completed}/{total}] Error processing {cn_name}: {exc}")
+                    logger.error(f"[{completed}/{total}] Error processing {cn_name}: {exc}")
                     if progress_callback:
                         progress_callback(completed, total, error_msg)
 
+    def summarize_results(self, cn_name, results):
+        """One progress line for the results of download_thumbnail."""
+        # Build detailed message
+        success_count = sum(1 for r in results if "Successfully" in r or "已存在" in r)
+        failure_count = len(results) - success_count
+        
+        if success_count > 0 and failure_count == 0:
+            message = f"✓ {cn_name} - 下载成功 ({success_count} 个封面)"
+        elif success_count > 0:
+            message = f"⚠ {cn_name} - 部分成功 ({success_count} 成功, {failure_count} 失败)"
+        else:
+            message = f"✗ {cn_name} - 下载失败"
+        
+        # Per-file results, shown with --verbose
+        for res in results:
+            logger.debug(res)
+        return message
+
     def sanitize_filename(self, name):
         """
         Replaces illegal characters with underscores, matching RetroArch's behavior.
@@ -117,3 +218,71 @@ class ThumbnailDownloader:
         for char in illegal_chars:
             name = name.replace(char, '_')
         return name
+
+
+class DownloadPipeline:
+    """
+    Downloads thumbnails while the producer (the playlist analysis) is still adding tasks.
+    Tasks wait in a bounded queue: add() blocks once maxsize tasks are pending, so the
+    analysis cannot run arbitrarily far ahead of the downloads. close() waits for the
+    queued downloads to finish. A task that was added before (another disc of the same
+    game) is not queued again.
+
+        with DownloadPipeline(downloader) as pipeline:
+            for change in changes:
+                pipeline.add(system, english_name, chinese_name)
+    """
+
+    def __init__(self, downloader, maxsize=None, progress_callback=None):
+        self.downloader = downloader
+        self.progress_callback = progress_callback
+        self.queue = queue.Queue(maxsize=maxsize or downloader.max_workers * 4)
+        self.added = 0
+        self.completed = 0
+        self.skipped = 0
+        self.seen = set()
+        self.lock = threading.Lock()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(downloader.max_workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def add(self, system, game_english_name, game_chinese_name):
+        task = (system, game_english_name, game_chinese_name)
+        # Nothing to queue when every thumbnail type is on disk already
+        complete = self.downloader.is_complete(system, game_chinese_name)
+        with self.lock:
+            if complete or task in self.seen:
+                self.skipped += 1
+                return
+            self.seen.add(task)
+            self.added += 1
+        self.queue.put(task)
+
+    def close(self):
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _work(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                return
+            system, en_name, cn_name = task
+            try:
+                message = self.downloader.summarize_results(cn_name, self.downloader.download_thumbnail(*task))
+            except Exception as exc:
+                message = f"✗ {cn_name} - 错误: {str(exc)}"
+                logger.error(f"Error processing {cn_name}: {exc}")
+            with self.lock:
+                self.completed += 1
+                completed, added = self.completed, self.added
+            if self.progress_callback:
+                self.progress_callback(completed, added, message)
@@ -0,0 +1,205 @@
+import html
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+import urllib.parse
+from name_parser import parse_name, rank_candidate
+from log_stream import get_logger
+
+logger = get_logger("thumbnail_index")
+
+DEFAULT_TTL = 24 * 3600
+# A listing that could not be fetched is tried again after this many seconds
+RETRY_FAILED = 300
+_HREF_RE = re.compile(r'href="([^"?#]+\.png)"', re.IGNORECASE)
+# Characters RetroArch (and the thumbnail server) replace with '_' in file names
+_LOOSE_RE = re.compile(r'[&*/:<>?\\|_]')
+_SPACES_RE = re.compile(r'\s+')
+
+
+def parse_listing(text):
+    """File names of the .png entries in an HTML directory listing."""
+    names = []
+    for href in _HREF_RE.findall(text):
+        name = urllib.parse.unquote(html.unescape(href))
+        if '/' not in name:
+            names.append(name)
+    return names
+
+
+def loose_key(name):
+    """Comparison key that ignores case, sanitization ('&' vs '_') and spacing differences."""
+    name = unicodedata.normalize('NFC', name).casefold()
+    return _SPACES_RE.sub(' ', _LOOSE_RE.sub('_', name)).strip()
+
+
+class ListingEntry:
+    """The file names of one system/type directory, with lookups for near misses."""
+
+    def __init__(self, names):
+        self.names = set(names)
+        self._loose = None
+        self._bases = None
+
+    def _build(self):
+        # Built aside and published at the end: the entry is shared by the download threads
+        loose = {}
+        bases = {}
+        for name in sorted(self.names):
+            stem = name[:-4]
+            loose.setdefault(loose_key(stem), name)
+            parsed = parse_name(stem)
+            bases.setdefault((loose_key(parsed.base), parsed.disc), []).append((name, parsed))
+        self._bases = bases
+        self._loose = loose
+
+    def resolve(self, filename):
+        """
+        The server file for filename: the exact name, a name that differs only in
+        case/sanitization, or the best region variant of the same title (same disc).
+        None if the title is not on the server.
+        """
+        if filename in self.names:
+            return filename
+        if self._loose is None:
+            self._build()
+        stem = filename[:-4] if filename.lower().endswith('.png') else filename
+        match = self._loose.get(loose_key(stem))
+        if match:
+            return match
+        parsed = parse_name(stem)
+        candidates = self._bases.get((loose_key(parsed.base), parsed.disc))
+        if not candidates:
+            return None
+        # Prefer the requested regions (then USA/Europe/Japan), and releases without extra tags
+        best = max(candidates, key=lambda c: (rank_candidate(c[1], parsed.regions), -len(c[1].flags)))
+        return best[0]
+
+
+class RemoteThumbnailIndex:
+    """
+    Directory listings of the thumbnail server, per system and thumbnail type, so names
+    that are not on the server are skipped without a request and near misses are
+    resolved before one is made.
+
+    Listings are cached in cache_dir/<system>/<type>.json. Within ttl seconds the cached
+    copy is used as is; after that it is revalidated with a conditional GET (ETag /
+    Last-Modified). A listing that cannot be fetched falls back to a stale copy, and
+    without any copy resolve() leaves the name unchanged (the download is just tried).
+    """
+
+    def __init__(self, session, cache_dir, ttl=DEFAULT_TTL):
+        self.session = session
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.entries = {}
+        self.loading = {}  # key -> lock held while that listing is loaded
+        self.lock = threading.Lock()
+
+    def resolve(self, base_url, system, type_name, filename):
+        """Server file name to request for filename, or None if it is not on the server."""
+        entry = self.get_entry(base_url, system, type_name)
+        if entry is None:
+            return filename
+        return entry.resolve(filename)
+
+    def get_entry(self, base_url, system, type_name):
+        key = (base_url, system, type_name)
+        with self.lock:
+            entry, expires = self.entries.get(key, (None, 0))
+            # Long-lived processes (watch mode) revalidate after the TTL too
+            if time.monotonic() < expires:
+                return entry
+            loading = self.loading.setdefault(key, threading.Lock())
+
+        # One thread loads a listing, the others asking for it wait for the result;
+        # the global lock is not held meanwhile, so other listings load in parallel
+        with loading:
+            with self.lock:
+                entry, expires = self.entries.get(key, (None, 0))
+            if time.monotonic() < expires:
+                return entry
+            names = self._load(base_url, system, type_name)
+            entry = ListingEntry(names) if names else None
+            with self.lock:
+                self.entries[key] = (entry, time.monotonic() + (self.ttl if entry else RETRY_FAILED))
+            return entry
+
+    def _cache_path(self, system, type_name):
+        return os.path.join(self.cache_dir, system, type_name + ".json")
+
+    def _load(self, base_url, system, type_name):
+        path = self._cache_path(system, type_name)
+        cached = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = None
+        if cached and cached.get('url') != self._listing_url(base_url, system, type_name):
+            cached = None
+        if cached and time.time() - cached.get('fetched', 0) < self.ttl:
+            return cached['names']
+
+        fetched = self._fetch(base_url, system, type_name, cached)
+        if fetched is not None:
+            self._store(path, fetched)
+            return fetched['names']
+        if cached:
+            logger.warning(f"Using stale thumbnail index for {system}/{type_name}")
+            return cached['names']
+        return None
+
+    def _listing_url(self, base_url, system, type_name):
+        return f"{base_url}/{urllib.parse.quote(system)}/{type_name}/"
+
+    def _fetch(self, base_url, system, type_name, cached=None):
+        """The listing as a cache record, or None if it could not be fetched."""
+        url = self._listing_url(base_url, system, type_name)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        try:
+            response = self.session.get(url, headers=headers, timeout=30)
+        except Exception as e:
+            logger.warning(f"Could not fetch thumbnail index {url}: {e}")
+            return None
+
+        if response.status_code == 304 and cached:
+            return dict(cached, fetched=time.time())
+        if response.status_code != 200:
+            logger.warning(f"Could not fetch thumbnail index {url}: HTTP {response.status_code}")
+            return None
+        names = parse_listing(response.text)
+        if not names:
+            # Not a listing we understand: better no index than skipping every download
+            logger.warning(f"No thumbnails found in the index {url}, not using it")
+            return None
+        logger.info(f"Thumbnail index {system}/{type_name}: {len(names)} file(s)")
+        return {
+            'url': url,
+            'fetched': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'names': names
+        }
+
+    def _store(self, path, record):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
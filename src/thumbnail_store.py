@@ -0,0 +1,105 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from log_stream import get_logger
+
+logger = get_logger("thumbnail_store")
+
+
+class ThumbnailStore:
+    """
+    Content-addressed cache of downloaded thumbnails:
+
+        objects/<sha256[:2]>/<sha256>.png          the image, stored once per content
+        names/<system>/<type>/<server filename>    hardlink to the object it was fetched as
+
+    A thumbnail fetched once is never fetched again: every target file named after a
+    Chinese label (across playlists, after a label correction, for regional variants
+    that share an image) is created from the store as a hardlink, so identical images
+    use disk space once.
+
+    Hardlink support is tested once, in the store root. On filesystems without it
+    (e.g. FAT/exFAT SD cards) the store is not used at all, since every image would be
+    written three times (object, name, target); the downloader then writes the targets
+    directly. A target on another device than the store is copied from it.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._hardlinks = None
+        self._lock = threading.Lock()
+
+    def supports_hardlinks(self):
+        """True if files in the store root can be hardlinked (tested on first call)."""
+        with self._lock:
+            if self._hardlinks is None:
+                self._hardlinks = self._probe_hardlinks()
+                if not self._hardlinks:
+                    logger.info(f"No hardlinks in {self.root}, thumbnails are written without the store")
+            return self._hardlinks
+
+    def _probe_hardlinks(self):
+        probe = os.path.join(self.root, f".probe.{uuid.uuid4().hex}")
+        linked = probe + ".link"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(probe, 'wb'):
+                pass
+            os.link(probe, linked)
+            return True
+        except OSError:
+            return False
+        finally:
+            for path in (probe, linked):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _name_path(self, system, type_name, server_filename):
+        return os.path.join(self.root, "names", system, type_name, server_filename)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".png")
+
+    def get(self, system, type_name, server_filename):
+        """Path of the stored image for this server file, or None if it was never fetched."""
+        path = self._name_path(system, type_name, server_filename)
+        return path if os.path.exists(path) else None
+
+    def put(self, system, type_name, server_filename, content):
+        """Stores a fetched image under its SHA-256 and its server name. Returns the stored path."""
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            temp_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(temp_path, object_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        name_path = self._name_path(system, type_name, server_filename)
+        os.makedirs(os.path.dirname(name_path), exist_ok=True)
+        self.link(object_path, name_path)
+        return name_path
+
+    def link(self, source, target):
+        """
+        Creates target as a hardlink to source (a copy where links are not possible).
+        The file appears atomically, so RetroArch never sees a partial image.
+        """
+        temp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copyfile(source, temp_path)
+        try:
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
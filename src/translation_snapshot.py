@@ -0,0 +1,92 @@
+import sys
+import normalizer
+from name_parser import parsed_from_row, rank_candidate
+
+
+class TranslationSnapshot:
+    """
+    Read-only in-memory copy of one system's translation rows.
+
+    Serves the exact lookups of DatabaseManager (search_by_english, search_by_chinese,
+    search_by_chinese_key, search_by_normalized_alias) from dicts instead of one SQLite
+    query per call, returning the same rows: the first row by id, and for aliases the
+    best ranked row with ties going to the first alias.
+    """
+
+    def __init__(self, db, system=None):
+        self.system = system
+        self.alias_table = db.get_alias_table()
+        self.english = {}  # english_name -> chinese_name
+        self.chinese = {}  # chinese_name -> english_name
+        self.keys = {}  # chinese_key -> (id, chinese_name, english_name)
+        self.aliases = {}  # normalized_alias -> [(chinese_name, english_name, ParsedName)]
+
+        where, params = db.system_clause(system, 'system')
+        cursor = db.get_connection().cursor()
+        cursor.execute(f'SELECT id, english_name, chinese_name, chinese_key FROM translations {where} ORDER BY id', params)
+        self.rows = 0
+        for row_id, english_name, chinese_name, chinese_key in cursor.fetchall():
+            self.rows += 1
+            self.english.setdefault(english_name, chinese_name)
+            self.chinese.setdefault(chinese_name, english_name)
+            if chinese_key:
+                self.keys.setdefault(chinese_key, (row_id, chinese_name, english_name))
+
+        where, params = db.system_clause(system, 't.system')
+        cursor.execute(f'''
+            SELECT a.normalized_alias, t.chinese_name, t.english_name, t.base_title, t.regions, t.languages, t.revision, t.disc, t.flags
+            FROM aliases a
+            JOIN translations t ON a.english_name = t.english_name
+            {where} ORDER BY a.id
+        ''', params)
+        for row in cursor.fetchall():
+            self.aliases.setdefault(row[0], []).append((row[1], row[2], parsed_from_row(*row[3:])))
+
+    def search_by_english(self, english_name):
+        return self.english.get(english_name)
+
+    def search_by_chinese(self, chinese_name):
+        return self.chinese.get(chinese_name)
+
+    def search_by_chinese_key(self, chinese_name):
+        raw_key = normalizer.chinese_key(chinese_name)
+        if not raw_key:
+            return None
+        key = self.alias_table.rewrite(raw_key)
+        hits = [hit for hit in (self.keys.get(key), self.keys.get(raw_key)) if hit]
+        if not hits:
+            return None
+        _, chinese_name, english_name = min(hits)
+        return chinese_name, english_name
+
+    def search_by_normalized_alias(self, normalized_name, regions=()):
+        rows = self.aliases.get(normalized_name)
+        if not rows:
+            return (None, None)
+        # max() keeps the first row on ties, like DatabaseManager.search_by_normalized_alias
+        best = max(rows, key=lambda row: rank_candidate(row[2], regions))
+        return best[0], best[1]
+
+    def estimate_bytes(self):
+        """Rough memory used by the snapshot (dicts, keys and values, shared objects counted once)."""
+        seen = set()
+        total = 0
+
+        def add(obj):
+            nonlocal total
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                total += sys.getsizeof(obj)
+
+        for mapping in (self.english, self.chinese, self.keys, self.aliases):
+            add(mapping)
+            for key, value in mapping.items():
+                add(key)
+                add(value)
+                if isinstance(value, (tuple, list)):
+                    for part in value:
+                        add(part)
+                        if isinstance(part, tuple):
+                            for field in part:
+                                add(field)
+        return total
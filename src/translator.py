@@ -1,14 +1,147 @@
 import json
 import os
 import re
+import time
 from libretro_db import LibretroDB
 from database import DatabaseManager
+from translation_snapshot import TranslationSnapshot
+import normalizer
+from name_parser import parse_name
+from log_stream import get_logger
+
+logger = get_logger("translator")
+
+# System names from rom-name-cn files carry timestamp and count suffixes
+_SYSTEM_TIMESTAMP_RE = re.compile(r'\s*\(\d{8}-\d{6}\)\s*')
+_SYSTEM_COUNT_RE = re.compile(r'\s*\(\d+\)\s*$')
+
+def normalize_system_name(system_name):
+    """
+    Normalizes a system name (removes timestamp and number suffixes).
+    e.g., "Nintendo - SNES (20240830-122750) (3308)" -> "Nintendo - SNES"
+    """
+    normalized = _SYSTEM_TIMESTAMP_RE.sub('', system_name)
+    normalized = _SYSTEM_COUNT_RE.sub('', normalized)
+    return normalized.strip()
+
+# Known acronyms that never normalize to a database name
+ACRONYMS = {
+    "srwf": "Super Robot Taisen F (Japan) (Rev A) (10M, 11M, 12M, 13M)",
+    "srwff": "Super Robot Taisen F - Kanketsu-hen (Japan) (Rev A) (10M)",
+    "srw": "Super Robot Taisen (Japan)"
+}
+
+ACRONYM_FALLBACK_CHINESE = {
+    "srwf": "超级机器人大战F",
+    "srwff": "超级机器人大战F完结篇"
+}
+
+# Returned by a lookup tier that does not apply to the text (not counted in stats)
+SKIPPED = object()
+
+class TierStats:
+    """
+    Per-tier counters and cumulative timings for Translator.translate.
+    calls counts how often a tier actually ran, hits how often it produced the result.
+    """
+    def __init__(self):
+        self.tiers = {}  # tier -> [calls, hits, seconds]
+        self.translations = 0
+        self.misses = 0
+
+    def record(self, tier, elapsed, hit):
+        entry = self.tiers.get(tier)
+        if entry is None:
+            entry = self.tiers[tier] = [0, 0, 0.0]
+        entry[0] += 1
+        if hit:
+            entry[1] += 1
+        entry[2] += elapsed
+
+    def merge(self, snapshot):
+        """Adds the counters of a snapshot (or snapshot delta) to this object."""
+        self.translations += snapshot['translations']
+        self.misses += snapshot['misses']
+        for tier, values in snapshot['tiers'].items():
+            entry = self.tiers.setdefault(tier, [0, 0, 0.0])
+            entry[0] += values['calls']
+            entry[1] += values['hits']
+            entry[2] += values['time_ms'] / 1000.0
+
+    def snapshot(self, enabled=True):
+        tiers = {}
+        for tier, (calls, hits, seconds) in self.tiers.items():
+            tiers[tier] = {
+                'calls': calls,
+                'hits': hits,
+                'hit_rate': round(hits / calls, 4) if calls else 0.0,
+                'time_ms': round(seconds * 1000.0, 3)
+            }
+        return {
+            'enabled': enabled,
+            'translations': self.translations,
+            'misses': self.misses,
+            'tiers': tiers
+        }
+
+def diff_stats(after, before):
+    """Returns the stats accumulated between two snapshots of the same Translator."""
+    tiers = {}
+    for tier, values in after['tiers'].items():
+        prev = before['tiers'].get(tier, {'calls': 0, 'hits': 0, 'time_ms': 0.0})
+        calls = values['calls'] - prev['calls']
+        if calls <= 0:
+            continue
+        hits = values['hits'] - prev['hits']
+        tiers[tier] = {
+            'calls': calls,
+            'hits': hits,
+            'hit_rate': round(hits / calls, 4),
+            'time_ms': round(values['time_ms'] - prev['time_ms'], 3)
+        }
+    return {
+        'enabled': after['enabled'],
+        'translations': after['translations'] - before['translations'],
+        'misses': after['misses'] - before['misses'],
+        'tiers': tiers
+    }
+
+def format_stats(stats):
+    """Formats a stats snapshot as a small text table for the console."""
+    if not stats['enabled']:
+        return "Tier statistics disabled."
+    lines = [f"Translations: {stats['translations']} (no match: {stats['misses']})",
+             f"{'Tier':<18}{'Calls':>8}{'Hits':>8}{'Hit %':>8}{'Time (ms)':>12}"]
+    for tier, values in sorted(stats['tiers'].items(), key=lambda kv: -kv[1]['time_ms']):
+        lines.append(f"{tier:<18}{values['calls']:>8}{values['hits']:>8}"
+                     f"{values['hit_rate'] * 100:>7.1f}%{values['time_ms']:>12.1f}")
+    return "\n".join(lines)
 
 class Translator:
-    def __init__(self, rom_name_cn_path, system_name=None, llm_client=None, db_path=None):
+    def __init__(self, rom_name_cn_path, system_name=None, llm_client=None, db_path=None, collect_stats=True,
+                 use_snapshot=False):
         self.rom_name_cn_path = rom_name_cn_path
         self.system_name = system_name
         self.llm_client = llm_client
+
+        # Per-tier counters; None disables timing entirely
+        self.tier_stats = TierStats() if collect_stats else None
+        # Optional callable(tier) told which tier translate() is about to try (progress display)
+        self.tier_callback = None
+
+        # Lookup tiers in the order translate() tries them
+        self.tiers = [
+            ('exact_en', self._match_exact_english),
+            ('reverse_cn', self._match_reverse_chinese),
+            ('chinese_key', self._match_chinese_key),
+            ('normalized_alias', self._match_normalized_alias),
+            ('acronym', self._match_acronym),
+            ('fuzzy_cn', self._match_fuzzy_chinese),
+            ('fuzzy_en', self._match_fuzzy_english),
+            ('libretro_db', self._match_libretro_db),
+            ('arcade_cleanup', self._match_arcade_cleanup),
+            ('llm', self._match_llm),
+        ]
         
         # Initialize Database
         self.db = DatabaseManager(db_path=db_path)
@@ -22,8 +155,18 @@ class Translator:
         count = cursor.fetchone()[0]
         
         if count == 0:
-            print("Database empty. Importing CSVs...")
+            logger.info("Database empty. Importing CSVs...")
             self.db.import_csvs(rom_name_cn_path)
+        elif not self.db.has_chinese_aliases():
+            # Databases imported before alias support: compile the alias file now
+            self.db.import_aliases(rom_name_cn_path)
+
+        # Optional in-memory copy of this system's rows for the exact lookup tiers
+        self.snapshot = None
+        if use_snapshot:
+            self.snapshot = TranslationSnapshot(self.db, system_name)
+            logger.info(f"Loaded translation snapshot for {system_name or 'all systems'}: "
+                  f"{self.snapshot.rows} rows (~{self.snapshot.estimate_bytes() / (1024 * 1024):.1f} MB)")
         
         # Initialize LibretroDB
         self.libretro_db = None
@@ -31,107 +174,191 @@ class Translator:
             # Store DBs in a subdirectory of local_db_path
             self.libretro_db = LibretroDB(os.path.dirname(rom_name_cn_path)) 
             # Try to load the DAT file for this system
-            print(f"Initializing LibretroDB for {system_name}...")
+            logger.info(f"Initializing LibretroDB for {system_name}...")
             self.libretro_db.load_system_dat(system_name)
 
     def normalize_name(self, name):
         """
         Normalizes a game name for fuzzy matching.
-        Delegates to DatabaseManager to ensure consistency.
+        Uses the shared normalizer to ensure consistency with the database.
         """
-        return self.db.normalize_name(name)
+        return normalizer.normalize_name(name)
 
-    def translate(self, text):
+    def translate(self, text, budget=None):
         """
         Translates the given text using the database.
         Returns a tuple: (translated_text, standard_english_name)
         If no translation found, returns (text, text).
+
+        The lookup tiers in self.tiers are tried in order; the first one that
+        returns a result wins. An optional ItemBudget (see fuzzy_budget) limits the
+        fuzzy tiers; when it runs out they fall back to cheaper matching and mark it deferred.
         """
         if not text:
             return text, text
-            
+
+        norm_text = self.normalize_name(text)
+        stats = self.tier_stats
+        tier_callback = self.tier_callback
+
+        for tier, match in self.tiers:
+            if tier_callback is not None:
+                tier_callback(tier)
+            if stats is None:
+                result = match(text, norm_text, budget)
+                if result is not None and result is not SKIPPED:
+                    return result
+                continue
+
+            start = time.perf_counter()
+            result = match(text, norm_text, budget)
+            if result is SKIPPED:
+                continue
+            stats.record(tier, time.perf_counter() - start, result is not None)
+            if result is not None:
+                stats.translations += 1
+                return result
+
+        if stats is not None:
+            stats.translations += 1
+            stats.misses += 1
+        return text, text
+
+    def stats(self):
+        """Snapshot of the per-tier counters and timings (see TierStats.snapshot)."""
+        if self.tier_stats is None:
+            return TierStats().snapshot(enabled=False)
+        return self.tier_stats.snapshot()
+
+    def reset_stats(self):
+        if self.tier_stats is not None:
+            self.tier_stats = TierStats()
+
+    # Lookup tiers. Each returns (translated_text, standard_english_name), None when it
+    # found nothing, or SKIPPED when it does not apply to this text/system.
+    # budget is the optional ItemBudget passed to translate().
+
+    def _match_exact_english(self, text, norm_text, budget):
         # 1. Exact match (English -> Chinese)
-        chinese = self.db.search_by_english(text, system=self.system_name)
+        chinese = self._search_by_english(text)
         if chinese:
             return chinese, text
-            
+        return None
+
+    def _match_reverse_chinese(self, text, norm_text, budget):
         # 2. Reverse lookup (Chinese -> English)
-        english = self.db.search_by_chinese(text, system=self.system_name)
+        if self.snapshot is not None:
+            english = self.snapshot.search_by_chinese(text)
+        else:
+            english = self.db.search_by_chinese(text, system=self.system_name)
         if english:
             return text, english
-            
+        return None
+
+    def _match_chinese_key(self, text, norm_text, budget):
+        # 2b. Canonical Chinese key (width, punctuation, spacing and bracketed tags ignored)
+        if not any(ord(c) >= 128 for c in text):
+            return SKIPPED
+        if self.snapshot is not None:
+            return self.snapshot.search_by_chinese_key(text)
+        return self.db.search_by_chinese_key(text, system=self.system_name)
+
+    def _match_normalized_alias(self, text, norm_text, budget):
         # 3. Normalized match (Alias lookup)
-        norm_text = self.normalize_name(text)
-        chinese, english = self.db.search_by_normalized_alias(norm_text, system=self.system_name)
+        regions = parse_name(text).regions
+        if self.snapshot is not None:
+            chinese, english = self.snapshot.search_by_normalized_alias(norm_text, regions)
+        else:
+            chinese, english = self.db.search_by_normalized_alias(norm_text, system=self.system_name,
+                                                                  regions=regions)
         if chinese and english:
             return chinese, english
-            
-        # 3. Alias / Acronym handling (Hardcoded fallbacks)
+        return None
+
+    def _match_acronym(self, text, norm_text, budget):
+        # 4. Alias / Acronym handling (Hardcoded fallbacks)
         # SRWF -> Super Robot Taisen F
-        acronyms = {
-            "srwf": "Super Robot Taisen F (Japan) (Rev A) (10M, 11M, 12M, 13M)",
-            "srwff": "Super Robot Taisen F - Kanketsu-hen (Japan) (Rev A) (10M)",
-            "srw": "Super Robot Taisen (Japan)"
-        }
-        
-        if norm_text in acronyms:
-            standard_english = acronyms[norm_text]
-            # Try to find Chinese translation for this standard English name in DB
-            chinese = self.db.search_by_english(standard_english, system=self.system_name)
-            if chinese:
-                return chinese, standard_english
-            
-            # Fallback hardcoded Chinese
-            fallback_chinese = {
-                "srwf": "超级机器人大战F",
-                "srwff": "超级机器人大战F完结篇"
-            }
-            if norm_text in fallback_chinese:
-                 return fallback_chinese[norm_text], standard_english
+        if norm_text not in ACRONYMS:
+            return None
 
-        # 4. Try fuzzy matching
-        # If text contains non-ASCII characters, try Chinese fuzzy search
+        standard_english = ACRONYMS[norm_text]
+        # Try to find Chinese translation for this standard English name in DB
+        chinese = self._search_by_english(standard_english)
+        if chinese:
+            return chinese, standard_english
+
+        # Fallback hardcoded Chinese
+        if norm_text in ACRONYM_FALLBACK_CHINESE:
+            return ACRONYM_FALLBACK_CHINESE[norm_text], standard_english
+        return None
+
+    def _match_fuzzy_chinese(self, text, norm_text, budget):
+        # 5a. Fuzzy matching: if text contains non-ASCII characters, try Chinese fuzzy search
+        if not any(ord(c) >= 128 for c in text):
+            return SKIPPED
+        if budget is not None and budget.exhausted():
+            budget.defer()
+            return None
+        result = self.db.fuzzy_search_by_chinese(text, system=self.system_name, budget=budget)
+        if result:
+            standard_cn, english = result
+            return standard_cn, english
+        return None
+
+    def _match_fuzzy_english(self, text, norm_text, budget):
+        # 5b. Otherwise try English fuzzy search
         if any(ord(c) >= 128 for c in text):
-             result = self.db.fuzzy_search_by_chinese(text, system=self.system_name)
-             if result:
-                 standard_cn, english = result
-                 return standard_cn, english
-        else:
-             # Otherwise try English fuzzy search
-             fuzzy_cn = self.db.fuzzy_search_by_english(norm_text, system=self.system_name)
-             if fuzzy_cn:
-                 return fuzzy_cn, text
+            return SKIPPED
+        if budget is not None and budget.exhausted():
+            budget.defer()
+            return None
+        fuzzy_cn = self.db.fuzzy_search_by_english(norm_text, system=self.system_name, budget=budget)
+        if fuzzy_cn:
+            return fuzzy_cn, text
+        return None
 
-        # 5. Try LibretroDB for standard English name
+    def _match_libretro_db(self, text, norm_text, budget):
+        # 6. Try LibretroDB for standard English name
         # This helps games without Chinese translations get standardized names
-        if self.libretro_db:
-            standard_name = self.libretro_db.get_standard_name(text)
-            if standard_name and standard_name != text:
-                print(f"LibretroDB standard name: '{text}' -> '{standard_name}'")
-                
-                # Try to find Chinese translation for this standard English name
-                chinese = self.db.search_by_english(standard_name, system=self.system_name)
-                if chinese:
-                    return chinese, standard_name
-                
-                # No Chinese translation available, use standard English as both label and thumbnail source
-                return standard_name, standard_name
-
-        # 6. For Arcade/FBNeo games, clean the ROM name for better presentation
+        if not self.libretro_db:
+            return SKIPPED
+        standard_name = self.libretro_db.get_standard_name(text, budget=budget)
+        if standard_name and standard_name != text:
+            logger.debug(f"LibretroDB standard name: '{text}' -> '{standard_name}'")
+
+            # Try to find Chinese translation for this standard English name
+            chinese = self._search_by_english(standard_name)
+            if chinese:
+                return chinese, standard_name
+
+            # No Chinese translation available, use standard English as both label and thumbnail source
+            return standard_name, standard_name
+        return None
+
+    def _match_arcade_cleanup(self, text, norm_text, budget):
+        # 7. For Arcade/FBNeo games, clean the ROM name for better presentation
         # This handles cases where LibretroDB has no data
-        if self.system_name and ('Arcade' in self.system_name or 'FBNeo' in self.system_name):
-            cleaned = self._clean_arcade_rom_name(text)
-            if cleaned != text:
-                print(f"Cleaned arcade ROM name: '{text}' -> '{cleaned}'")
-                return cleaned, cleaned
-
-        # 7. Fallback to LLM (if configured)
-        if self.llm_client:
-            llm_result = self.translate_with_llm(text)
-            if llm_result:
-                return llm_result, text 
-        
-        return text, text
+        if not (self.system_name and ('Arcade' in self.system_name or 'FBNeo' in self.system_name)):
+            return SKIPPED
+        cleaned = self._clean_arcade_rom_name(text)
+        if cleaned != text:
+            logger.debug(f"Cleaned arcade ROM name: '{text}' -> '{cleaned}'")
+            return cleaned, cleaned
+        return None
+
+    def _match_llm(self, text, norm_text, budget):
+        # 8. Fallback to LLM (if configured)
+        if not self.llm_client:
+            return SKIPPED
+        llm_result = self.translate_with_llm(text)
+        if llm_result:
+            return llm_result, text
+        return None
+
+    def _search_by_english(self, english_name):
+        if self.snapshot is not None:
+            return self.snapshot.search_by_english(english_name)
+        return self.db.search_by_english(english_name, system=self.system_name)
 
     def _clean_arcade_rom_name(self, name):
         """
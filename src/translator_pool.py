@@ -0,0 +1,171 @@
+import os
+import glob
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from translator import Translator, TierStats, diff_stats, normalize_system_name
+
+
+def data_version(rom_name_cn_path):
+    """
+    Returns a fingerprint of the translation data a Translator is built from:
+    the rom-name-cn CSV/alias files and the LibretroDB DAT files (names, sizes and mtimes).
+    A change to any of them yields a new version, so stale pooled translators are not reused.
+    """
+    dat_dir = os.path.join(os.path.dirname(rom_name_cn_path), "libretro-db", "dat")
+    paths = (glob.glob(os.path.join(rom_name_cn_path, "*.csv")) +
+             glob.glob(os.path.join(rom_name_cn_path, "*.json")) +
+             glob.glob(os.path.join(dat_dir, "*.dat")))
+
+    version = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        version.append((os.path.basename(path), stat.st_size, int(stat.st_mtime)))
+    # Stable across processes: it is also stored with the item fingerprints
+    return hashlib.sha1(repr(version).encode('utf-8')).hexdigest()
+
+
+class TranslatorPool:
+    """
+    Process-wide pool of warmed Translator instances.
+
+    Building a Translator opens a SQLite connection, checks the translations table and
+    loads the system DAT, so repeated analyses of the same system reuse idle instances.
+    Instances are handed out exclusively (one thread at a time) and keyed by normalized
+    system name, data location and data version. Instances idle for longer than
+    idle_timeout seconds are closed.
+
+    With use_snapshot, pooled translators serve their exact lookups from an in-memory
+    TranslationSnapshot of the system (config.json: translation_snapshot).
+
+    Tier statistics gathered while a translator is leased are added to per-system
+    totals, so they survive eviction and can be served by the web UI.
+    """
+
+    def __init__(self, idle_timeout=600, max_idle_per_key=2, collect_stats=True, use_snapshot=True):
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self.collect_stats = collect_stats
+        self.use_snapshot = use_snapshot
+        self.idle = {}  # key -> list of (translator, last_used)
+        self.leased = {}  # id(translator) -> stats snapshot taken at acquire
+        self.totals = {}  # system -> TierStats
+        self.lock = threading.Lock()
+
+    def make_key(self, rom_name_cn_path, system_name, db_path=None):
+        system = normalize_system_name(system_name) if system_name else None
+        return (system,
+                os.path.abspath(rom_name_cn_path),
+                os.path.abspath(db_path) if db_path else None,
+                data_version(rom_name_cn_path),
+                self.use_snapshot)
+
+    def acquire(self, rom_name_cn_path, system_name, db_path=None):
+        """
+        Returns (key, translator). The translator must be handed back with release(key, translator).
+        """
+        key = self.make_key(rom_name_cn_path, system_name, db_path)
+        self.evict_idle()
+
+        with self.lock:
+            entries = self.idle.get(key)
+            if entries:
+                translator, _ = entries.pop()
+                if not entries:
+                    del self.idle[key]
+                self.leased[id(translator)] = translator.stats()
+                return key, translator
+
+        # Build outside the lock; loading a DAT can take a while
+        translator = Translator(rom_name_cn_path, key[0], db_path=db_path, collect_stats=self.collect_stats,
+                                use_snapshot=key[4])
+        with self.lock:
+            self.leased[id(translator)] = translator.stats()
+        return key, translator
+
+    def release(self, key, translator):
+        """Returns a translator to the pool so the next analysis of the same system can reuse it."""
+        with self.lock:
+            before = self.leased.pop(id(translator), None)
+            if before is not None and translator.tier_stats is not None:
+                totals = self.totals.setdefault(key[0], TierStats())
+                totals.merge(diff_stats(translator.stats(), before))
+
+            entries = self.idle.setdefault(key, [])
+            if len(entries) < self.max_idle_per_key:
+                entries.append((translator, time.monotonic()))
+                return
+        self._close(translator)
+
+    def merge_stats(self, system_name, stats):
+        """Adds tier statistics gathered outside the pool (e.g. by a batch worker process) to the totals."""
+        system = normalize_system_name(system_name) if system_name else None
+        with self.lock:
+            self.totals.setdefault(system, TierStats()).merge(stats)
+
+    @contextmanager
+    def lease(self, rom_name_cn_path, system_name, db_path=None):
+        key, translator = self.acquire(rom_name_cn_path, system_name, db_path)
+        try:
+            yield translator
+        finally:
+            self.release(key, translator)
+
+    def evict_idle(self, now=None):
+        """Closes translators that have been idle longer than idle_timeout. Returns how many were closed."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self.lock:
+            for key in list(self.idle.keys()):
+                keep = []
+                for translator, last_used in self.idle[key]:
+                    if now - last_used > self.idle_timeout:
+                        expired.append(translator)
+                    else:
+                        keep.append((translator, last_used))
+                if keep:
+                    self.idle[key] = keep
+                else:
+                    del self.idle[key]
+
+        for translator in expired:
+            self._close(translator)
+        return len(expired)
+
+    def stats(self):
+        """
+        Cumulative tier statistics of all translators handed out by this pool,
+        per system and in total (translators still leased are counted once returned).
+        """
+        with self.lock:
+            total = TierStats()
+            systems = {}
+            for system, tier_stats in self.totals.items():
+                snapshot = tier_stats.snapshot(enabled=self.collect_stats)
+                systems[system or ''] = snapshot
+                total.merge(snapshot)
+        return {
+            'systems': systems,
+            'total': total.snapshot(enabled=self.collect_stats)
+        }
+
+    def clear(self):
+        """Closes all idle translators."""
+        with self.lock:
+            entries = [t for items in self.idle.values() for t, _ in items]
+            self.idle = {}
+        for translator in entries:
+            self._close(translator)
+
+    def _close(self, translator):
+        try:
+            translator.db.close()
+        except Exception:
+            pass
+
+
+translator_pool = TranslatorPool()
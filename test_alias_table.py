@@ -0,0 +1,52 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from alias_table import AliasTable
+from translator import Translator
+
+ALIASES = {
+    "Super Mario": {"alias": ["超级马里奥", "超级马力欧", "超级玛丽"], "default": "超级马里奥"},
+    "Mario": {"alias": ["马里奥", "马力欧", "玛丽"], "default": "马里奥",
+              "exclude": ["Mario Lemieux Hockey"]},
+    "Donkey Kong": {"alias": ["大金刚", "森喜刚"], "default": "大金刚", "others": ["咚奇刚"]},
+}
+
+def test_rewrite():
+    print("\n--- Testing Alias Rewriting ---")
+    table = AliasTable(*AliasTable.parse(ALIASES))
+    assert table.rewrite("超级玛丽3") == "超级马里奥3"  # longest spelling first
+    assert table.rewrite("玛丽医生") == "马里奥医生"
+    assert table.rewrite("超级咚奇刚2") == "超级大金刚2"
+    assert table.rewrite("玛丽冰球", "Mario Lemieux Hockey (USA)") == "玛丽冰球"
+    print("[PASS] Alias spellings folded to the series default, exclude honored")
+
+def test_alias_lookup():
+    print("\n--- Testing Alias Lookup In Translator ---")
+    test_dir = "test_alias_table_data"
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "name_alias(Chinese).json"), 'w', encoding='utf-8') as f:
+        json.dump(ALIASES, f, ensure_ascii=False)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\n"
+                "Super Mario World (USA),超级马力欧世界\n"
+                "Donkey Kong Country (USA),超级大金刚\n"
+                "Mario Lemieux Hockey (USA),玛丽冰球\n")
+
+    translator = Translator(rom_name_cn_path, db_path=os.path.join(test_dir, "test.db"))
+    assert translator.translate("超级玛丽世界") == ("超级马力欧世界", "Super Mario World (USA)")
+    assert translator.translate("超级森喜刚") == ("超级大金刚", "Donkey Kong Country (USA)")
+    assert translator.translate("玛丽 冰球") == ("玛丽冰球", "Mario Lemieux Hockey (USA)")
+    tiers = translator.stats()['tiers']
+    assert tiers['chinese_key']['hits'] == 3 and 'fuzzy_cn' not in tiers
+    print("[PASS] Variant spellings resolve through the key index")
+    translator.db.close()
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_rewrite()
+    test_alias_lookup()
@@ -0,0 +1,99 @@
+import os
+import sys
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import thumbnail_downloader
+from async_downloader import AdaptiveLimit, AsyncThumbnailDownloader
+
+def test_adaptive_limit():
+    print("\n--- Testing Adaptive Concurrency Limit ---")
+    limit = AdaptiveLimit(initial=4, maximum=8, target_latency=1.0)
+    for _ in range(40):
+        limit.record(0.1, now=100.0)
+    assert limit.limit == 8
+    print("[PASS] Fast responses raise the limit up to the maximum")
+
+    limit.record(0.1, throttled=True, now=200.0)
+    assert limit.limit == 4
+    limit.record(0.1, throttled=True, now=200.5)  # same round trip
+    assert limit.limit == 4
+    limit.record(0.1, throttled=True, now=202.0)
+    limit.record(9.0, now=215.0)  # slower than slow_latency
+    assert limit.limit == 1 and limit.decreases == 3
+    print("[PASS] 429/5xx and slow responses halve it, once per round trip")
+
+class ThumbnailHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        if "Missing" in self.path:
+            status, body = 404, b""
+        elif "Busy" in self.path and self.requests_seen.count(self.path) == 1:
+            status, body = 503, b""
+        else:
+            status, body = 200, b"png"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_async_downloads():
+    print("\n--- Testing Asyncio Thumbnail Downloader ---")
+    test_dir = os.path.abspath("test_async_downloader_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThumbnailHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    downloader = AsyncThumbnailDownloader(test_dir, max_connections=4, backoff=0.01)
+    downloader.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results = downloader.download_thumbnail("Test System", "Contra (USA)", "魂斗罗")
+        assert results == [f"Successfully downloaded {t}: 魂斗罗" for t in downloader.TYPES]
+        assert downloader.is_complete("Test System", "魂斗罗")
+        print("[PASS] All thumbnail types are downloaded")
+
+        progress = []
+        downloader.download_batch([("Test System", "Missing Game", "不存在"), ("Test System", "Busy Game", "忙"),
+                                   ("Test System", "Contra (USA)", "魂斗罗")],
+                                  progress_callback=lambda done, total, msg: progress.append((done, total)))
+        assert sorted(progress) == [(1, 2), (2, 2)]
+        assert not os.path.exists(downloader.target_path("Test System", "Named_Boxarts", "不存在"))
+        assert downloader.is_complete("Test System", "忙")
+        assert downloader.limits and next(iter(downloader.limits.values())).decreases >= 1
+        print("[PASS] 404s fail, 503s are retried and lower the limit, complete games are skipped")
+    finally:
+        downloader.close()
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+def test_single_session():
+    print("\n--- Testing Async Downloader Session ---")
+    created = []
+    original_session = thumbnail_downloader.requests.Session
+    class CountingSession(original_session):
+        def __init__(self):
+            super().__init__()
+            created.append(self)
+    thumbnail_downloader.requests.Session = CountingSession
+    try:
+        downloader = AsyncThumbnailDownloader("test_async_session_data", max_connections=4)
+    finally:
+        thumbnail_downloader.requests.Session = original_session
+    try:
+        assert created == [downloader.session]
+        adapter = downloader.session.get_adapter("https://thumbnails.libretro.com/")
+        assert adapter.max_retries.total == 0 and adapter._pool_maxsize == 4
+        print("[PASS] One session, with the engine's own pool and no adapter retries")
+    finally:
+        downloader.close()
+
+if __name__ == "__main__":
+    test_adaptive_limit()
+    test_async_downloads()
+    test_single_session()
@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import playlist_manager as pm_module
+from playlist_manager import PlaylistManager
+
+def test_atomic_save():
+    print("\n--- Testing Atomic, Change-Only Playlist Save ---")
+    test_dir = os.path.abspath("test_atomic_save_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    try:
+        path = os.path.join(test_dir, "test.lpl")
+        data = {
+            "version": "1.5",
+            "default_core_path": "",
+            "items": [{"path": "/roms/Contra (USA).nes", "label": "Contra (USA)", "core_path": "DETECT",
+                       "crc32": "DETECT", "db_name": "Nintendo - NES.lpl"}],
+            "scan_content_dir": "/roms"
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        mtime = os.stat(path).st_mtime_ns
+
+        manager = PlaylistManager(path)
+        assert manager.save(backup_path=path + ".bak") is False
+        assert os.stat(path).st_mtime_ns == mtime and not os.path.exists(path + ".bak")
+        print("[PASS] Unchanged content is not rewritten (and not backed up)")
+
+        manager.update_label(0, "魂斗罗")
+        assert manager.save(backup_path=path + ".bak") is True
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert list(saved) == ["version", "default_core_path", "items", "scan_content_dir"]
+        assert list(saved['items'][0]) == list(data['items'][0])
+        assert saved['items'][0]['label'] == "魂斗罗" and saved['scan_content_dir'] == "/roms"
+        with open(path + ".bak", 'r', encoding='utf-8') as f:
+            assert json.load(f)['items'][0]['label'] == "Contra (USA)"
+        assert sorted(os.listdir(test_dir)) == ["test.lpl", "test.lpl.bak"]
+        print("[PASS] Changed labels are written with key order and metadata kept")
+
+        size = os.path.getsize(path)
+        manager.update_label(0, "魂斗罗")  # same value: still clean
+        assert manager.save(compact=True) is False
+        manager.update_label(0, "魂斗罗 1")
+        assert manager.save(compact=True) is True
+        assert os.path.getsize(path) < size
+        saved['items'][0]['label'] = "魂斗罗 1"
+        assert PlaylistManager(path).data == saved
+        print("[PASS] Compact output is smaller and loads the same")
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+        manager.update_label(0, "Contra")
+        original_replace = pm_module.os.replace
+        pm_module.os.replace = failing_replace
+        try:
+            manager.save(compact=True)
+            assert False, "save should fail"
+        except OSError:
+            pass
+        finally:
+            pm_module.os.replace = original_replace
+        assert PlaylistManager(path).items[0]['label'] == "魂斗罗 1"
+        assert sorted(os.listdir(test_dir)) == ["test.lpl", "test.lpl.bak"]
+        print("[PASS] A failed write leaves the old playlist and no temp file")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_untouched_retroarch_playlist():
+    print("\n--- Testing Save of an Untouched RetroArch Playlist ---")
+    test_dir = os.path.abspath("test_atomic_save_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    try:
+        # RetroArch indents with 2 spaces, PLCN serializes with 4
+        path = os.path.join(test_dir, "retroarch.lpl")
+        shutil.copy2("test_playlist.lpl", path)
+        with open(path, 'rb') as f:
+            original = f.read()
+        mtime = os.stat(path).st_mtime_ns
+
+        manager = PlaylistManager(path)
+        manager.deduplicate_items()
+        manager.update_label(0, manager.items[0]['label'])
+        assert manager.save(backup_path=path + ".bak") is False
+        assert not os.path.exists(path + ".bak")
+        with open(path, 'rb') as f:
+            assert f.read() == original
+        assert os.stat(path).st_mtime_ns == mtime
+        print("[PASS] An unmodified RetroArch playlist is neither rewritten nor backed up")
+    finally:
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_atomic_save()
+    test_untouched_retroarch_playlist()
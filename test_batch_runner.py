@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from batch_runner import BatchProgress, run_batch
+
+def make_batch_dir():
+    test_dir = tempfile.mkdtemp(prefix="plcn_batch_")
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra (USA),魂斗罗\n")
+    return test_dir, rom_name_cn_path
+
+def test_batch_progress():
+    print("\n--- Testing Aggregated Batch Progress ---")
+    updates = []
+    progress = BatchProgress(2, lambda done, total, message: updates.append((done, total)))
+    progress.playlist_done("Processed a.lpl", downloads=3)
+    progress.download_done("✓ 魂斗罗")
+    progress.playlist_done("Processed b.lpl", downloads=1)
+    assert updates == [(1, 5), (2, 5), (3, 6)]
+    assert progress.summary() == "2/2 playlists, 1/4 thumbnails"
+    print("[PASS] Progress counts playlists and thumbnails of all playlists")
+
+def test_batch_failures_in_workers():
+    print("\n--- Testing Batch Worker Pool ---")
+    test_dir, rom_name_cn_path = make_batch_dir()
+    try:
+        playlists = [(os.path.join(test_dir, f"missing_{i}.lpl"), "Test System") for i in range(3)]
+        result = run_batch(playlists, os.path.join(test_dir, "thumbnails"), rom_name_cn_path, jobs=2,
+                           db_path=os.path.join(test_dir, "plcn.db"))
+        assert sorted(result['failed']) == sorted(path for path, _ in playlists)
+        assert result['stats']['translations'] == 0
+        assert not os.path.exists("plcn.db")
+        print("[PASS] Errors in worker processes are reported per playlist")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_batch_in_workers():
+    print("\n--- Testing Batch Run in Worker Processes ---")
+    test_dir, rom_name_cn_path = make_batch_dir()
+    try:
+        thumbnails_dir = os.path.join(test_dir, "thumbnails")
+        # Thumbnails already on disk, so nothing is downloaded
+        for type_name in ["Named_Boxarts", "Named_Snaps", "Named_Titles"]:
+            os.makedirs(os.path.join(thumbnails_dir, "Test System", type_name))
+            open(os.path.join(thumbnails_dir, "Test System", type_name, "魂斗罗.png"), 'wb').close()
+
+        playlists = []
+        for i in range(3):
+            playlist_path = os.path.join(test_dir, f"playlist_{i}.lpl")
+            with open(playlist_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": "1.5", "items": [{
+                    "path": f"/roms/{i}/Contra (USA).nes", "label": "Contra (USA)",
+                    "core_path": "DETECT", "core_name": "DETECT", "crc32": "DETECT", "db_name": "Test System.lpl"
+                }]}, f)
+            playlists.append((playlist_path, "Test System"))
+
+        db_path = os.path.join(test_dir, "plcn.db")
+        result = run_batch(playlists, thumbnails_dir, rom_name_cn_path, jobs=2, db_path=db_path,
+                           config={"thumbnail_index": False, "thumbnail_store": False})
+        assert result['failed'] == []
+        for playlist_path, _ in playlists:
+            with open(playlist_path, 'r', encoding='utf-8') as f:
+                assert json.load(f)['items'][0]['label'] == "魂斗罗"
+        assert result['stats']['translations'] == 3
+        assert os.path.exists(db_path)
+        assert not os.path.exists("plcn.db")
+        print("[PASS] Labels of every playlist written, worker statistics merged")
+    finally:
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_batch_progress()
+    test_batch_failures_in_workers()
+    test_batch_in_workers()
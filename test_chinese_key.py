@@ -0,0 +1,56 @@
+import os
+import sys
+import shutil
+import sqlite3
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from normalizer import chinese_key
+from database import DatabaseManager
+from translator import Translator
+
+def test_chinese_key():
+    print("\n--- Testing Canonical Chinese Key ---")
+    assert chinese_key("超级马里奥３：世界（中文版）") == chinese_key("超级马里奥3: 世界") == "超级马里奥3世界"
+    assert chinese_key("洛克人·X") == "洛克人x"
+    assert chinese_key("魂斗罗－力量 [汉化]") == "魂斗罗力量"
+    assert chinese_key("【汉化】") == "汉化"
+    print("[PASS] Width, punctuation, spacing and bracketed tags folded")
+
+def test_chinese_key_tier():
+    print("\n--- Testing Chinese Key Tier ---")
+    test_dir = "test_chinese_key_data"
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra Force (USA),魂斗罗：力量\n")
+
+    translator = Translator(rom_name_cn_path, db_path=os.path.join(test_dir, "test.db"))
+    assert translator.translate("魂斗罗 力量（中文版）") == ("魂斗罗：力量", "Contra Force (USA)")
+    tiers = translator.stats()['tiers']
+    assert tiers['chinese_key']['hits'] == 1 and 'fuzzy_cn' not in tiers
+    print("[PASS] Canonical key hit before fuzzy matching")
+    translator.db.close()
+    shutil.rmtree(test_dir)
+
+def test_chinese_key_migration():
+    print("\n--- Testing Chinese Key Migration ---")
+    db_path = "test_chinese_key_migration.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE translations (id INTEGER PRIMARY KEY AUTOINCREMENT, english_name TEXT NOT NULL UNIQUE, chinese_name TEXT NOT NULL, system TEXT)")
+    conn.execute("INSERT INTO translations (english_name, chinese_name, system) VALUES ('Contra Force (USA)', '魂斗罗：力量', 'Test System')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_path)
+    assert db.search_by_chinese_key("魂斗罗·力量") == ("魂斗罗：力量", "Contra Force (USA)")
+    print("[PASS] Existing rows get a key on upgrade")
+    db.close()
+    os.remove(db_path)
+
+if __name__ == "__main__":
+    test_chinese_key()
+    test_chinese_key_tier()
+    test_chinese_key_migration()
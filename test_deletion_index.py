@@ -0,0 +1,55 @@
+import os
+import sys
+import random
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from rapidfuzz.distance import Levenshtein
+from deletion_index import DeletionIndex
+from database import DatabaseManager
+
+def test_lookup_matches_brute_force():
+    print("\n--- Testing Deletion Index Lookup ---")
+    random.seed(7)
+    alphabet = "abcdefgh0123"
+    names = list(dict.fromkeys(
+        ''.join(random.choice(alphabet) for _ in range(random.randint(2, 14))) for _ in range(2000)
+    ))
+    index = DeletionIndex(names)
+    for _ in range(300):
+        query = list(random.choice(names))
+        for _ in range(random.randint(0, 2)):
+            pos = random.randrange(len(query))
+            if random.random() < 0.5:
+                query[pos] = random.choice(alphabet)
+            else:
+                query.insert(pos, random.choice(alphabet))
+        query = ''.join(query)
+        expected = [i for i, name in enumerate(names) if Levenshtein.distance(query, name) <= 2]
+        assert index.lookup(query) == expected, query
+    assert index.lookup("") == []
+    print("[PASS] Same neighbours as a brute force edit distance scan")
+
+def test_fuzzy_english_uses_index():
+    print("\n--- Testing English Fuzzy Search With Deletion Index ---")
+    db_path = "test_deletion_index.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = DatabaseManager(db_path)
+    cursor = db.get_connection().cursor()
+    cursor.executemany("INSERT INTO translations (english_name, chinese_name, system) VALUES (?, ?, ?)", [
+        ("Metal Slug X (USA)", "合金弹头X", "Arcade - NEOGEO"),
+        ("Metal Slug 3 (USA)", "合金弹头3", "Arcade - NEOGEO"),
+        ("Art of Fighting 3 (USA)", "龙虎之拳3", "Arcade - NEOGEO"),
+    ])
+    db.get_connection().commit()
+
+    assert db.fuzzy_search_by_english("Metal Slug 2") == "合金弹头X"
+    assert db.fuzzy_search_by_english("Art of Fightin 3") == "龙虎之拳3"
+    assert db.fuzzy_search_by_english("Art Fighting") == "龙虎之拳3"  # beyond two edits, full scan
+    print("[PASS] Typo neighbours and full scan fallback")
+
+    db.close()
+    os.remove(db_path)
+
+if __name__ == "__main__":
+    test_lookup_matches_brute_force()
+    test_fuzzy_english_uses_index()
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import plcn
+from playlist_manager import PlaylistManager, group_items
+
+PSX = "/roms/psx"
+
+def psx_item(name, label=None):
+    return {'path': f"{PSX}/{name}", 'label': label or os.path.splitext(name)[0]}
+
+def test_group_items():
+    print("\n--- Testing Multi-Disc Grouping ---")
+    items = [
+        psx_item("Final Fantasy VII (USA) (Disc 1).chd"),
+        psx_item("Final Fantasy VII (USA) (Disc 2).chd"),
+        psx_item("Final Fantasy VII (USA).m3u"),
+        psx_item("Final Fantasy VII (Japan) (Disc 1).chd"),
+        psx_item("Metal Gear Solid (USA) (Disc 1).chd"),
+        {'path': "/other/Metal Gear Solid (USA) (Disc 2).chd", 'label': "Metal Gear Solid (USA) (Disc 2)"},
+    ]
+    groups = group_items(items)
+    assert sorted(groups) == [0, 1, 2]
+    print("[PASS] Discs and the .m3u of one release share a group; regions and directories do not")
+
+    manager = PlaylistManager.__new__(PlaylistManager)
+    manager.items = [psx_item("FF (USA) (Disc 1).chd", "最终幻想"), psx_item("FF (USA) (Disc 2).chd", "最终幻想"),
+                     psx_item("FF (USA) (Disc 2).bin", "最终幻想")]
+    manager._path_index = None
+    assert manager.deduplicate_items() == 1
+    assert [item['path'] for item in manager.items] == [f"{PSX}/FF (USA) (Disc 1).chd", f"{PSX}/FF (USA) (Disc 2).chd"]
+    print("[PASS] Discs with the same label are not removed as duplicates")
+
+class CountingTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, name, budget=None):
+        self.calls.append(name)
+        if name.startswith("Final Fantasy VII (USA)"):
+            return "最终幻想7", "Final Fantasy VII (USA) (Disc 1)"
+        return name, name
+
+def test_group_fan_out():
+    print("\n--- Testing Group Fan-Out ---")
+    items = [psx_item("Final Fantasy VII (USA) (Disc 1).chd"), psx_item("Tetris (USA).chd"),
+             psx_item("Final Fantasy VII (USA) (Disc 2).chd"), psx_item("Final Fantasy VII (USA) (Disc 3).chd")]
+    translator = CountingTranslator()
+    changes = list(plcn._iter_analyze_items(items, translator, "Sony - PlayStation", "Sony - PlayStation"))
+    assert [c['new_label'] for c in changes] == ["最终幻想7", "Tetris (USA)", "最终幻想7", "最终幻想7"]
+    assert [c['index'] for c in changes] == [0, 1, 2, 3]
+    assert changes[2]['path'] == items[2]['path']
+    assert changes[3]['original_label'] == "Final Fantasy VII (USA) (Disc 3)"
+    assert not any("Disc 2" in name or "Disc 3" in name for name in translator.calls)
+    print("[PASS] A group is resolved once and fanned out to every disc")
+
+    test_dir = os.path.abspath("test_disc_grouping_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    cwd = os.getcwd()
+    os.chdir(test_dir)  # item fingerprints live in ./plcn.db
+    try:
+        playlist_path = os.path.join(test_dir, "test.lpl")
+        with open(playlist_path, 'w', encoding='utf-8') as f:
+            json.dump({'items': items}, f)
+        tasks = plcn.apply_labels(playlist_path, changes, backup=False)
+        assert tasks == [("Sony - PlayStation", "Final Fantasy VII (USA) (Disc 1)", "最终幻想7"),
+                         ("Sony - PlayStation", "Tetris (USA)", "Tetris (USA)")]
+        assert len(PlaylistManager(playlist_path).items) == 4
+        print("[PASS] One download task per group, and every disc keeps its entry")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_group_items()
+    test_group_fan_out()
@@ -0,0 +1,53 @@
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from thumbnail_downloader import ThumbnailDownloader, DownloadPipeline
+
+class BlockingDownloader(ThumbnailDownloader):
+    """Records the tasks instead of downloading; waits for `release` before each one."""
+    def __init__(self):
+        super().__init__("unused", max_workers=1)
+        self.release = threading.Event()
+        self.done = []
+
+    def download_thumbnail(self, system, game_english_name, game_chinese_name):
+        self.release.wait()
+        self.done.append(game_chinese_name)
+        return [f"Successfully downloaded Named_Boxarts: {game_chinese_name}"]
+
+def test_pipeline_backpressure():
+    print("\n--- Testing Download Pipeline Backpressure ---")
+    downloader = BlockingDownloader()
+    progress = []
+    pipeline = DownloadPipeline(downloader, maxsize=1, progress_callback=lambda done, added, msg: progress.append(done))
+
+    pipeline.add("Test System", "Contra (USA)", "魂斗罗")  # taken by the worker, which waits
+    pipeline.add("Test System", "Metroid (USA)", "银河战士")  # fills the queue
+    producer = threading.Thread(target=pipeline.add, args=("Test System", "Tetris (USA)", "俄罗斯方块"))
+    producer.start()
+    producer.join(timeout=0.3)
+    assert producer.is_alive(), "add() should block while the queue is full"
+    print("[PASS] Producer waits when the queue is full")
+
+    downloader.release.set()
+    producer.join(timeout=5)
+    pipeline.close()
+    assert downloader.done == ["魂斗罗", "银河战士", "俄罗斯方块"]
+    assert progress == [1, 2, 3]
+    print("[PASS] All queued downloads finish before close() returns")
+
+def test_pipeline_skips_repeated_tasks():
+    print("\n--- Testing Download Pipeline Repeated Tasks ---")
+    downloader = BlockingDownloader()
+    downloader.release.set()
+    with DownloadPipeline(downloader) as pipeline:
+        for _ in range(3):  # the discs of one game
+            pipeline.add("Test System", "Final Fantasy VII (USA) (Disc 1)", "最终幻想7")
+    assert downloader.done == ["最终幻想7"]
+    assert pipeline.added == 1 and pipeline.skipped == 2
+    print("[PASS] A repeated task is downloaded once")
+
+if __name__ == "__main__":
+    test_pipeline_backpressure()
+    test_pipeline_skips_repeated_tasks()
@@ -0,0 +1,61 @@
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from rapidfuzz import process, fuzz
+from database import DatabaseManager
+from fuzzy_budget import FuzzyBudget, extract_one, CHUNK_SIZE
+
+def test_extract_one_matches_rapidfuzz():
+    print("\n--- Testing Budgeted extractOne ---")
+    choices = [f"game title number {i}" for i in range(CHUNK_SIZE * 3)]
+    query = "game title number 1234"
+    expected = process.extractOne(query, choices, scorer=fuzz.ratio, score_cutoff=50)
+    budget = FuzzyBudget(item_ms=None).item()
+    result = extract_one(process, query, choices, fuzz.ratio, 50, budget)
+    assert result == expected
+    assert budget.scored == len(choices) and not budget.deferred
+    print("[PASS] Unlimited budget gives the same result as extractOne")
+
+def test_candidate_budget_defers():
+    print("\n--- Testing Candidate Budget ---")
+    choices = [f"game title number {i}" for i in range(CHUNK_SIZE * 3)]
+    playlist_budget = FuzzyBudget(max_candidates=100, item_ms=None)
+    budget = playlist_budget.item()
+    result = extract_one(process, "game title number 50", choices, fuzz.ratio, 50, budget)
+    assert budget.scored == 100 and budget.deferred
+    assert result[0] == "game title number 50"
+    assert playlist_budget.deferred_count == 1
+    print("[PASS] Scoring stops at max_candidates and keeps the best match so far")
+
+def test_playlist_budget_skips_fuzzy():
+    print("\n--- Testing Playlist Budget ---")
+    db_path = "test_fuzzy_budget.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = DatabaseManager(db_path)
+    cursor = db.get_connection().cursor()
+    cursor.execute("INSERT INTO translations (english_name, chinese_name, system) VALUES (?, ?, ?)",
+                   ("Fire Emblem - Monshou no Nazo", "火焰纹章 - 纹章之谜", "SNES"))
+    db.get_connection().commit()
+
+    playlist_budget = FuzzyBudget(item_ms=None, playlist_ms=0)
+    budget = playlist_budget.item()
+    assert db.fuzzy_search_by_chinese("火焰之纹章3", budget=budget) is None
+    assert budget.deferred
+    print("[PASS] Exhausted playlist budget defers fuzzy matching")
+
+    assert db.fuzzy_search_by_chinese("火焰之纹章3", budget=FuzzyBudget().item()) is not None
+    print("[PASS] Default budget still matches")
+
+    default = FuzzyBudget.from_config({})
+    assert default.item_ms is None and default.playlist_ms is None and default.max_candidates
+    print("[PASS] Time budgets are off unless configured")
+
+    db.close()
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+if __name__ == "__main__":
+    test_extract_one_matches_rapidfuzz()
+    test_candidate_budget_defers()
+    test_playlist_budget_skips_fuzzy()
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import plcn
+from translator_pool import translator_pool
+
+def write_playlist(path, labels):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'items': [{'path': f"/roms/{label}.nes", 'label': label} for label in labels]}, f)
+
+def test_incremental_analysis():
+    print("\n--- Testing Incremental Re-Analysis ---")
+    test_dir = os.path.abspath("test_incremental_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra (USA),魂斗罗\nMetroid (USA),银河战士\nTetris (USA),俄罗斯方块\n")
+
+    cwd = os.getcwd()
+    os.chdir(test_dir)  # item fingerprints live in ./plcn.db
+    try:
+        playlist_path = os.path.join(test_dir, "test.lpl")
+        write_playlist(playlist_path, ["Contra (USA)", "Metroid (USA)"])
+        stats = {}
+        first = plcn.analyze_playlist(playlist_path, "Test System", rom_name_cn_path, stats=stats)
+        assert [c['new_label'] for c in first] == ["魂斗罗", "银河战士"]
+        assert stats['translations'] == 2
+
+        stats = {}
+        again = plcn.analyze_playlist(playlist_path, "Test System", rom_name_cn_path, stats=stats)
+        assert again == first and stats['translations'] == 0
+        print("[PASS] Unchanged items reuse their stored result")
+
+        # Apply, then add a ROM: only the new item is resolved
+        plcn.apply_labels(playlist_path, first, backup=False)
+        with open(playlist_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'].append({'path': "/roms/Tetris (USA).nes", 'label': "Tetris (USA)"})
+        with open(playlist_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        stats = {}
+        changes = plcn.analyze_playlist(playlist_path, "Test System", rom_name_cn_path, stats=stats)
+        assert [c['new_label'] for c in changes] == ["魂斗罗", "银河战士", "俄罗斯方块"]
+        assert stats['translations'] == 1
+        assert [c['original_label'] for c in changes] == ["Contra (USA)", "Metroid (USA)", "Tetris (USA)"]
+        print("[PASS] Only new items are resolved after the labels were applied")
+
+        # An edited label is what the next run keeps
+        changes[0]['new_label'] = "魂斗罗 1"
+        plcn.apply_labels(playlist_path, changes, backup=False)
+        again = plcn.analyze_playlist(playlist_path, "Test System", rom_name_cn_path)
+        assert again[0]['new_label'] == "魂斗罗 1"
+        print("[PASS] Labels edited before applying are kept")
+
+        # Items whose label is not their file name are recognized too
+        other_path = os.path.join(test_dir, "other.lpl")
+        with open(other_path, 'w', encoding='utf-8') as f:
+            json.dump({'items': [{'path': "/roms/Contra (USA).nes", 'label': "Contra"}]}, f)
+        first = plcn.analyze_playlist(other_path, "Test System", rom_name_cn_path)
+        stats = {}
+        again = plcn.analyze_playlist(other_path, "Test System", rom_name_cn_path, stats=stats)
+        assert again == first and stats['translations'] == 0
+        print("[PASS] Items are matched by their playlist label, not their file name")
+
+        stats = {}
+        plcn.analyze_playlist(playlist_path, "Test System", rom_name_cn_path, stats=stats, incremental=False)
+        assert stats['translations'] == 3
+        print("[PASS] A full run resolves every item again")
+    finally:
+        os.chdir(cwd)
+        translator_pool.clear()
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_incremental_analysis()
@@ -0,0 +1,44 @@
+import os
+import sys
+import logging
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import log_stream
+from log_stream import get_logger, setup_logging, shutdown_logging, level_from_flags, log_buffer
+
+def test_levels():
+    print("\n--- Testing CLI Verbosity Levels ---")
+    assert level_from_flags() == logging.INFO
+    assert level_from_flags(quiet=True) == logging.WARNING
+    assert level_from_flags(verbose=True) == logging.DEBUG
+    print("[PASS] --quiet / --verbose map to logging levels")
+
+def test_buffered_stream():
+    print("\n--- Testing Queue-Backed Log Stream ---")
+    logger = get_logger("test")
+    root = logging.getLogger(log_stream.LOGGER_NAME)
+    try:
+        setup_logging(logging.INFO)
+        start = log_buffer.last_seq()
+        logger.debug("hidden per-item detail")
+        logger.info("analysis started")
+        logger.warning("index mismatch")
+        shutdown_logging()  # drains the queue
+
+        records = log_buffer.since(start)
+        assert [r['message'] for r in records] == ["analysis started", "index mismatch"]
+        assert records[1]['level'] == 'WARNING'
+        print("[PASS] Records above the level reach the buffer in order")
+
+        setup_logging(logging.DEBUG)
+        start = log_buffer.last_seq()
+        logger.debug("per-item detail")
+        shutdown_logging()
+        assert [r['message'] for r in log_buffer.since(start)] == ["per-item detail"]
+        print("[PASS] Logging can be set up again with another level")
+    finally:
+        shutdown_logging()
+        root.setLevel(logging.NOTSET)
+
+if __name__ == "__main__":
+    test_levels()
+    test_buffered_stream()
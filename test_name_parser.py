@@ -0,0 +1,79 @@
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from name_parser import parse_name, rank_candidate
+from database import DatabaseManager
+from libretro_db import LibretroDB
+
+def test_parse_name():
+    print("\n--- Testing Name Parser ---")
+    parsed = parse_name("Final Fantasy VII (USA) (Disc 1) (Rev 1)")
+    assert parsed.base == "Final Fantasy VII"
+    assert parsed.regions == ("USA",)
+    assert parsed.disc == 1
+    assert parsed.revision == "Rev 1"
+    print("[PASS] Regions, disc and revision parsed")
+
+    parsed = parse_name("Legend of Zelda, The (USA, Europe) (En,Fr,De) [!]")
+    assert parsed.regions == ("USA", "Europe")
+    assert parsed.languages == ("En", "Fr", "De")
+    assert parsed.flags == ("!",)
+    print("[PASS] Region and language lists parsed")
+
+    parsed = parse_name("1941: Counter Attack (World 900227)")
+    assert parsed.base == "1941: Counter Attack"
+    assert parsed.regions == ("World",)
+    print("[PASS] Arcade region/date tag parsed")
+
+def test_rank_candidate():
+    print("\n--- Testing Candidate Ranking ---")
+    usa = parse_name("Contra (USA)")
+    japan = parse_name("Contra (Japan)")
+    collection = parse_name("Contra (USA) (Contra Anniversary Collection)")
+    assert rank_candidate(usa) > rank_candidate(japan)
+    assert rank_candidate(japan, ("Japan",)) > rank_candidate(usa, ("Japan",))
+    assert rank_candidate(collection) < rank_candidate(japan)
+    print("[PASS] Region preference and collection penalty")
+
+def test_tag_columns():
+    print("\n--- Testing Stored Tag Columns ---")
+    db_path = "test_name_parser.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = DatabaseManager(db_path)
+    cursor = db.get_connection().cursor()
+    for english_name, chinese_name in [("Contra (Japan)", "魂斗罗 日版"), ("Contra (USA)", "魂斗罗")]:
+        db._insert_translation(cursor, english_name, chinese_name, "NES")
+        cursor.execute("INSERT INTO aliases (alias, english_name, normalized_alias) VALUES (?, ?, ?)",
+                       (english_name, english_name, db.normalize_name(english_name)))
+    db.get_connection().commit()
+
+    cursor.execute("SELECT base_title, regions FROM translations WHERE english_name = ?", ("Contra (Japan)",))
+    row = cursor.fetchone()
+    assert row['base_title'] == "Contra" and row['regions'] == "Japan"
+    print("[PASS] Tags stored at insert time")
+
+    assert db.search_by_normalized_alias("contra", system="NES") == ("魂斗罗", "Contra (USA)")
+    assert db.search_by_normalized_alias("contra", system="NES", regions=("Japan",)) == ("魂斗罗 日版", "Contra (Japan)")
+    print("[PASS] Normalized alias lookup ranks by stored region tags")
+
+    db.close()
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+def test_libretro_region_preference():
+    print("\n--- Testing LibretroDB Region Preference ---")
+    libretro_db = LibretroDB("data")
+    for name in ["Contra (Japan)", "Contra (USA)", "Contra (Europe)"]:
+        libretro_db.name_tags[name] = parse_name(name)
+    libretro_db.standard_names = {"contra": ["Contra (Japan)", "Contra (USA)", "Contra (Europe)"]}
+    assert libretro_db.get_standard_name("Contra") == "Contra (USA)"
+    assert libretro_db.get_standard_name("Contra (Europe)") == "Contra (Europe)"
+    print("[PASS] Region preference uses cached tags")
+
+if __name__ == "__main__":
+    test_parse_name()
+    test_rank_candidate()
+    test_tag_columns()
+    test_libretro_region_preference()
@@ -0,0 +1,59 @@
+import os
+import sys
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from rapidfuzz import process, fuzz
+from database import DatabaseManager
+from ngram_index import NgramIndex
+
+def test_shortlist():
+    print("\n--- Testing Bigram Shortlist ---")
+    index = NgramIndex([
+        ("火焰纹章 - 纹章之谜", "Fire Emblem - Monshou no Nazo (Japan)"),
+        ("魂斗罗", "Contra (USA)"),
+        ("魂斗罗", "Contra (Japan)"),
+        ("超级马里奥世界", "Super Mario World (USA)"),
+    ])
+    assert len(index) == 3
+    assert index.english_names[1] == "Contra (USA)"  # first row wins for duplicate names
+    assert index.shortlist("火焰之纹章3") == [0]
+    assert index.shortlist("魂 斗 罗") == [1]
+    assert index.shortlist("马") == [2]
+    assert index.shortlist("塞尔达传说") == []
+    print("[PASS] Shortlist contains names sharing a bigram, in insertion order")
+
+def test_matches_full_scan():
+    print("\n--- Testing Index Against Full Scan ---")
+    test_dir = "test_ngram_index_data"
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    system = "Nintendo - Super Nintendo Entertainment System"
+    shutil.copy(os.path.join("data", "rom-name-cn", f"{system}.csv"), rom_name_cn_path)
+
+    db = DatabaseManager(os.path.join(test_dir, "test.db"))
+    db.import_csvs(rom_name_cn_path)
+    cursor = db.get_connection().cursor()
+    cursor.execute('SELECT chinese_name FROM translations ORDER BY id')
+    names = [row[0] for row in cursor.fetchall()]
+
+    queries = ["超级马里奥世界2", "魂斗罗3代", "火焰之纹章", "最终幻想VI", "洛克人 X", "勇者斗恶龙5"]
+    for query in queries:
+        expected = process.extractOne(query, names, scorer=fuzz.WRatio, score_cutoff=65)
+        result = db.fuzzy_search_by_chinese(query, system=system)
+        if expected is None:
+            assert result is None, query
+        else:
+            # Equal scores may resolve to another name, but never a worse one
+            assert result is not None, query
+            assert fuzz.WRatio(query, result[0]) == expected[1], query
+            assert db.search_by_english(result[1], system=system) == result[0]
+    print("[PASS] Same best score as scoring every name")
+
+    db.close()
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_shortlist()
+    test_matches_full_scan()
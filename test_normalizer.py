@@ -0,0 +1,81 @@
+import os
+import sys
+import re
+import csv
+import glob
+import random
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import normalizer
+from database import DatabaseManager
+from libretro_db import LibretroDB
+
+def reference_normalize_name(name):
+    """The original per-class implementation, kept here as the reference for the shared normalizer."""
+    # Strategy 1: Aggressive
+    name_clean = re.sub(r'\[.*?\]', '', name)
+    name_clean = re.sub(r'\(.*?\)', '', name_clean)
+    name_clean = re.sub(r'\bCN\b', '', name_clean, flags=re.IGNORECASE)
+    name_clean = name_clean.replace('_', ' ').replace('.', ' ')
+    clean_name = re.sub(r'[^a-zA-Z0-9]', '', name_clean).lower()
+
+    if clean_name:
+        return clean_name
+
+    # Strategy 2: Fallback
+    name_fallback = name.replace('[', ' ').replace(']', ' ').replace('(', ' ').replace(')', ' ')
+    name_fallback = re.sub(r'\bCN\b', '', name_fallback, flags=re.IGNORECASE)
+    name_fallback = name_fallback.replace('_', ' ').replace('.', ' ')
+    clean_name_fallback = re.sub(r'[^a-zA-Z0-9]', '', name_fallback).lower()
+
+    return clean_name_fallback
+
+# Characters that exercise every branch: tags, the CN marker, separators, CJK, full-width and newlines
+ALPHABET = list("abcxyzABCNXZcn019 _.-:'!&[]()") + ['\n', '\t', '魂', '斗', '罗', 'Ｃ', 'Ｎ', 'é', 'ß', 'İ', 'K']
+
+def random_names(count, seed=1234):
+    rng = random.Random(seed)
+    names = ["", "CN", "cn", "(CN)", "[CN]", "_CN_", "A.CN", "中文CN", "(Japan)", "[!]", "((a)b)", "(a\nb)"]
+    for _ in range(count):
+        names.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24))))
+    return names
+
+def test_normalizer_matches_reference():
+    print("\n--- Testing Shared Normalizer Against Reference ---")
+    names = random_names(20000)
+    for name in names:
+        expected = reference_normalize_name(name)
+        assert normalizer.normalize_name(name) == expected, repr(name)
+    assert normalizer.normalize_many(names) == [reference_normalize_name(n) for n in names]
+    print(f"[PASS] {len(names)} random names normalize identically")
+
+def test_normalizer_matches_reference_on_data():
+    print("\n--- Testing Shared Normalizer On rom-name-cn Data ---")
+    names = []
+    for csv_file in sorted(glob.glob(os.path.join("data", "rom-name-cn", "*.csv")))[:10]:
+        with open(csv_file, 'r', encoding='utf-8-sig') as f:
+            for row in csv.reader(f):
+                names.extend(row)
+    for name in names:
+        assert normalizer.normalize_name(name) == reference_normalize_name(name), repr(name)
+    print(f"[PASS] {len(names)} data names normalize identically")
+
+def test_class_methods_delegate():
+    print("\n--- Testing Class Normalizers ---")
+    db_path = "test_normalizer.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = DatabaseManager(db_path)
+    libretro_db = LibretroDB("data")
+    for name in ["Metal Slug X (USA) [!]", "CN [Dragon_Force]", "(CN)"]:
+        expected = reference_normalize_name(name)
+        assert db.normalize_name(name) == expected
+        assert libretro_db.normalize_name(name) == expected
+    print("[PASS] DatabaseManager and LibretroDB use the shared normalizer")
+    db.close()
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+if __name__ == "__main__":
+    test_normalizer_matches_reference()
+    test_normalizer_matches_reference_on_data()
+    test_class_methods_delegate()
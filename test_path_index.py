@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import shutil
+import unicodedata
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from playlist_manager import PlaylistManager
+
+def test_path_index():
+    print("\n--- Testing Playlist Path Index ---")
+    test_dir = "test_path_index_data"
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    playlist_path = os.path.join(test_dir, "test.lpl")
+    nfd_path = unicodedata.normalize('NFD', "/roms/ポケモン Café.gb")
+    with open(playlist_path, 'w', encoding='utf-8') as f:
+        json.dump({'items': [
+            {'path': "/roms/Contra (USA).bin", 'label': "Contra (USA)"},
+            {'path': "/roms/Contra (USA).cue", 'label': "Contra (USA)"},
+            {'path': nfd_path, 'label': "Pokemon"},
+        ]}, f, ensure_ascii=False)
+
+    manager = PlaylistManager(playlist_path)
+    assert manager.update_label_by_path(unicodedata.normalize('NFC', nfd_path), "宝可梦")
+    assert manager.items[2]['label'] == "宝可梦"
+    assert not manager.update_label_by_path("/roms/missing.gb", "x")
+    assert not manager.update_label_by_path(None, "x")
+    print("[PASS] NFC and NFD paths resolve to the same item")
+
+    # Deduplication drops the .bin entry; the index must follow
+    manager.deduplicate_items()
+    assert manager.find_by_path("/roms/Contra (USA).bin") is None
+    assert manager.find_by_path("/roms/Contra (USA).cue") is manager.items[0]
+    print("[PASS] Index is rebuilt after deduplication")
+
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_path_index()
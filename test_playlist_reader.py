@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from playlist_manager import PlaylistManager, PlaylistReader, iter_playlist_items, detect_system_name
+
+def make_items(count):
+    return [{"path": f"/roms/游戏 {i} (USA).nes", "label": f"游戏 {i} (USA)", "crc32": 12345 + i,
+             "db_name": "Nintendo - NES.lpl"} for i in range(count)]
+
+def test_streaming_reader():
+    print("\n--- Testing Streaming Playlist Reader ---")
+    test_dir = os.path.abspath("test_playlist_reader_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    try:
+        path = os.path.join(test_dir, "test.lpl")
+        data = {"version": "1.5", "items": make_items(500), "scan_content_dir": "/roms", "scan_dat_file_path": ""}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+        # Tiny chunks: values and multi-byte characters are split across reads
+        for chunk_size in (7, 64, 4096):
+            reader = PlaylistReader(path, chunk_size=chunk_size)
+            assert list(reader) == data['items']
+            assert list(reader.metadata) == ["version", "items", "scan_content_dir", "scan_dat_file_path"]
+            assert not reader.legacy
+        print("[PASS] Items and metadata match json.load for any chunk size")
+
+        assert [item['label'] for item in iter_playlist_items(path, limit=2)] == ["游戏 0 (USA)", "游戏 1 (USA)"]
+        assert detect_system_name(path) == "Nintendo - NES"
+        print("[PASS] Detection stops after the first items")
+
+        items = make_items(3)
+        items[0]['db_name'] = ""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"items": items}, f)
+        assert detect_system_name(path) == "Nintendo - NES"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"version": "1.5", "items": []}, f)
+        assert detect_system_name(path) is None and list(iter_playlist_items(path)) == []
+        print("[PASS] Items without db_name and empty playlists")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_legacy_format():
+    print("\n--- Testing Legacy Six-Line Playlists ---")
+    test_dir = os.path.abspath("test_playlist_reader_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    try:
+        path = os.path.join(test_dir, "legacy.lpl")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("/roms/Contra (USA).nes\nContra (USA)\nDETECT\nDETECT\n12345678|crc\nNintendo - NES.lpl\n"
+                    "/roms/Metroid (USA).nes\nMetroid (USA)\nDETECT\nDETECT\nDETECT\nNintendo - NES.lpl\n")
+        items = list(iter_playlist_items(path))
+        assert [item['label'] for item in items] == ["Contra (USA)", "Metroid (USA)"]
+        assert items[0]['crc32'] == "12345678|crc"
+        assert detect_system_name(path) == "Nintendo - NES"
+        print("[PASS] Legacy entries are read as items")
+
+        manager = PlaylistManager(path)
+        assert manager.legacy
+        assert manager.save() is False
+        manager.update_label(0, "魂斗罗")
+        assert manager.save() is True
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 12 and lines[1] == "魂斗罗" and lines[7] == "Metroid (USA)"
+        print("[PASS] Legacy playlists are written back in their own format")
+    finally:
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_streaming_reader()
+    test_legacy_format()
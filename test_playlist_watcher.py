@@ -0,0 +1,54 @@
+import os
+import sys
+import json
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from playlist_watcher import PlaylistWatcher
+
+def write_playlist(path, labels):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'items': [{'path': f"/roms/{label}.nes", 'label': label} for label in labels]}, f)
+
+def test_watcher():
+    print("\n--- Testing Playlist Watcher ---")
+    test_dir = os.path.abspath("test_watcher_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    os.makedirs(test_dir)
+    try:
+        nes = os.path.join(test_dir, "Nintendo - NES.lpl")
+        write_playlist(nes, ["Contra (USA)"])
+        processed = []
+
+        def process(path):
+            processed.append(os.path.basename(path))
+            # Like apply_labels: the watcher's own write must not count as a change
+            write_playlist(path, ["魂斗罗"])
+
+        watcher = PlaylistWatcher(test_dir, process, debounce=2.0)
+        assert watcher.poll(now=0) == []
+        assert watcher.poll(now=1) == []
+        assert watcher.poll(now=2) == [nes]
+        assert processed == ["Nintendo - NES.lpl"]
+        print("[PASS] A new playlist is processed once it stays unchanged for the debounce time")
+
+        assert watcher.poll(now=10) == [] and watcher.poll(now=20) == []
+        print("[PASS] The watcher's own write does not trigger another run")
+
+        write_playlist(nes, ["魂斗罗", "Metroid (USA)"])
+        assert watcher.poll(now=30) == []
+        write_playlist(nes, ["魂斗罗", "Metroid (USA)", "Tetris (USA)"])
+        assert watcher.poll(now=31) == []  # still being written: window restarts
+        assert watcher.poll(now=32) == []
+        assert watcher.poll(now=33) == [nes]
+        assert len(processed) == 2
+        print("[PASS] A changed playlist is processed after writes settle")
+
+        os.remove(nes)
+        assert watcher.poll(now=40) == [] and not watcher.known
+        print("[PASS] Removed playlists are forgotten")
+    finally:
+        shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_watcher()
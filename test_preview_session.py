@@ -0,0 +1,66 @@
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from server import PreviewSessions
+
+def make_change(index, original_label, new_label, deferred=False):
+    return {'index': index, 'original_label': original_label, 'path': f"/roms/{original_label}.nes",
+            'new_label': new_label, 'thumbnail_source': original_label, 'system': "Test System",
+            'deferred': deferred}
+
+def test_preview_session():
+    print("\n--- Testing Server-Side Preview Sessions ---")
+    sessions = PreviewSessions()
+    session = sessions.create("s1", "/playlists/test.lpl", "Test System")
+    session['changes'].extend([
+        make_change(0, "Contra (USA)", "魂斗罗"),
+        make_change(1, "Unknown Game", "Unknown Game"),
+        make_change(2, "Metroid (USA)", "银河战士", deferred=True),
+        make_change(3, "Another Game", "Another Game"),
+    ])
+
+    rows, matching, total = sessions.page("s1", offset=0, limit=3)
+    assert [r['index'] for r in rows] == [0, 1, 2] and matching == 4 and total == 4
+    rows, matching, total = sessions.page("s1", offset=1, limit=10, filter_name='unmatched')
+    assert [r['index'] for r in rows] == [3] and matching == 2
+    rows, _, _ = sessions.page("s1", filter_name='deferred')
+    assert [r['index'] for r in rows] == [2]
+    assert sessions.page("missing") is None
+    print("[PASS] Pages and filters are served from the session")
+
+    # An untranslated item counts as unmatched even if its label is not its file name
+    other = sessions.create("s3", "/playlists/other.lpl", "Test System")
+    other['changes'].extend([make_change(0, "Contra (USA)", "Contra"), make_change(1, "魂斗罗", "魂斗罗")])
+    rows, _, _ = sessions.page("s3", filter_name='unmatched')
+    assert [r['index'] for r in rows] == [0]
+    print("[PASS] Rows without a Chinese label are unmatched")
+
+    try:
+        sessions.changes_to_apply("s1")
+        assert False, "an incomplete preview must not be applied"
+    except ValueError:
+        pass
+    session['complete'] = True
+    assert len(sessions.changes_to_apply("s1")) == 4
+    assert sessions.changes_to_apply("missing") is None
+    print("[PASS] Only completed previews are applied")
+
+    updated = sessions.edit("s1", [
+        {'index': 1, 'new_label': "未知游戏"},
+        {'index': 3, 'path': "/etc/passwd"},  # not an editable field
+        {'index': 99, 'new_label': "x"},
+    ])
+    assert updated == 1
+    rows, matching, _ = sessions.page("s1", filter_name='edited')
+    assert matching == 1 and rows[0]['new_label'] == "未知游戏"
+    assert rows[0]['thumbnail_source'] == "Unknown Game"
+    assert session['changes'][3]['path'] == "/roms/Another Game.nes"
+    print("[PASS] Sparse edits update only the given fields")
+
+    session['last_used'] -= PreviewSessions.SESSION_TTL + 1
+    sessions.create("s2", "/playlists/other.lpl", "Test System")
+    assert sessions.get("s1") is None and sessions.get("s2") is not None
+    print("[PASS] Idle sessions expire")
+
+if __name__ == "__main__":
+    test_preview_session()
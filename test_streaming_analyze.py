@@ -0,0 +1,71 @@
+import os
+import sys
+import shutil
+import threading
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import plcn
+from translator import Translator
+
+def setup_data(test_dir):
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra (USA),魂斗罗\nMetroid (USA),银河战士\nTetris (USA),俄罗斯方块\n")
+    return rom_name_cn_path
+
+def test_streaming_analysis():
+    print("\n--- Testing Streaming Playlist Analysis ---")
+    test_dir = "test_stream_data"
+    rom_name_cn_path = setup_data(test_dir)
+    translator = Translator(rom_name_cn_path, db_path=os.path.join(test_dir, "test_stream.db"))
+    items = [
+        {'label': "Contra (USA)", 'path': "/roms/Contra (USA).nes"},
+        {'label': "Metroid (USA)", 'path': "/roms/Metroid (USA).nes"},
+        {'label': "Tetris (USA)", 'path': "/roms/Tetris (USA).nes"},
+    ]
+
+    changes = plcn._iter_analyze_items(items, translator, "Test System", "Test System")
+    first = next(changes)
+    assert first['index'] == 0 and first['new_label'] == "魂斗罗"
+    rest = list(changes)
+    assert [c['new_label'] for c in rest] == ["银河战士", "俄罗斯方块"]
+    print("[PASS] Changes are yielded one item at a time")
+
+    cancel = threading.Event()
+    seen = []
+    for change in plcn._iter_analyze_items(items, translator, "Test System", "Test System", cancel=cancel):
+        seen.append(change)
+        cancel.set()
+    assert len(seen) == 1
+    print("[PASS] Cancellation stops the analysis before the next item")
+
+    progress = []
+    list(plcn._iter_analyze_items(items, translator, "Test System", "Test System",
+                                  progress_callback=lambda done, total, tier: progress.append((done, total, tier))))
+    assert progress[0] == (0, 3, 'exact_en')
+    assert [p for p in progress if p[2] is None] == [(1, 3, None), (2, 3, None), (3, 3, None)]
+    assert translator.tier_callback is None
+    print("[PASS] Progress reports items analyzed and the current tier")
+
+    translator.db.close()
+    shutil.rmtree(test_dir)
+
+def test_job_cancellation():
+    print("\n--- Testing Job Cancellation ---")
+    from server import JobManager
+    jobs = JobManager()
+    job_id = jobs.create_job()
+    jobs.update_job(job_id, 1, 10, "analyzing", tier="fuzzy_en")
+    assert jobs.get_job(job_id)['details'] == {'tier': "fuzzy_en"}
+    assert jobs.cancel_job(job_id)
+    assert jobs.get_job(job_id)['cancel'].is_set()
+    jobs.complete_job(job_id, {"count": 1})
+    assert jobs.get_job(job_id)['status'] == 'cancelled'
+    assert not jobs.cancel_job(job_id)
+    print("[PASS] Cancelled jobs finish with status 'cancelled'")
+
+if __name__ == "__main__":
+    test_streaming_analysis()
+    test_job_cancellation()
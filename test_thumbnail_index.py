@@ -0,0 +1,149 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import urllib.parse
+import requests
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from thumbnail_downloader import ThumbnailDownloader
+from thumbnail_index import RemoteThumbnailIndex, ListingEntry, parse_listing
+
+SERVER_FILES = ["Contra (USA).png", "Metroid (USA, Europe).png", "Metroid (Japan).png", "Sonic _ Knuckles (World).png",
+                "Final Fantasy VII (USA) (Disc 2).png"]
+LISTING = "<html><body><a href=\"../\">../</a>\n" + "\n".join(
+    f'<a href="{urllib.parse.quote(name)}">{name}</a>' for name in SERVER_FILES) + "</body></html>"
+
+class ThumbnailServer(BaseHTTPRequestHandler):
+    seen = []
+
+    def do_GET(self):
+        self.seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.path.endswith('/'):
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.reply(304, b"")
+            else:
+                self.reply(200, LISTING.encode('utf-8'), etag='"v1"')
+        elif urllib.parse.unquote(self.path.rsplit('/', 1)[-1]) in SERVER_FILES:
+            self.reply(200, b"png")
+        else:
+            self.reply(404, b"")
+
+    def reply(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_listing_lookup():
+    print("\n--- Testing Thumbnail Listing Lookup ---")
+    assert parse_listing(LISTING) == SERVER_FILES
+    entry = ListingEntry(SERVER_FILES)
+    assert entry.resolve("Contra (USA).png") == "Contra (USA).png"
+    assert entry.resolve("contra (usa).png") == "Contra (USA).png"
+    assert entry.resolve("Sonic & Knuckles (World).png") == "Sonic _ Knuckles (World).png"
+    assert entry.resolve("Metroid (USA).png") == "Metroid (USA, Europe).png"
+    assert entry.resolve("Metroid (Japan) (Rev 1).png") == "Metroid (Japan).png"
+    assert entry.resolve("Final Fantasy VII (USA) (Disc 1).png") is None
+    assert entry.resolve("Tetris (USA).png") is None
+    print("[PASS] Exact names, sanitization/case near misses and region variants resolve; others are missing")
+
+def test_index_downloads():
+    print("\n--- Testing Downloads Through the Thumbnail Index ---")
+    test_dir = os.path.abspath("test_thumbnail_index_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThumbnailServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = os.path.join(test_dir, ".plcn", "index")
+    try:
+        downloader = ThumbnailDownloader(test_dir)
+        downloader.BASE_URL = base_url
+        downloader.index = RemoteThumbnailIndex(downloader.session, cache_dir)
+        del ThumbnailServer.seen[:]
+
+        results = downloader.download_thumbnail("Test System", "Tetris (USA)", "俄罗斯方块")
+        assert all("not on the server" in r for r in results)
+        assert all(path.endswith('/') for path, _ in ThumbnailServer.seen)  # listings only
+        assert len(ThumbnailServer.seen) == 3
+        print("[PASS] Names missing from the listing are skipped without a request")
+
+        results = downloader.download_thumbnail("Test System", "Metroid (USA)", "银河战士")
+        assert all(r.startswith("Successfully downloaded") for r in results)
+        assert len(ThumbnailServer.seen) == 6
+        print("[PASS] Near misses are downloaded from the resolved name")
+
+        del ThumbnailServer.seen[:]
+        index = RemoteThumbnailIndex(downloader.session, cache_dir)
+        assert index.resolve(base_url, "Test System", "Named_Boxarts", "Tetris (USA).png") is None
+        assert ThumbnailServer.seen == []
+        index = RemoteThumbnailIndex(downloader.session, cache_dir, ttl=0)
+        assert index.resolve(base_url, "Test System", "Named_Boxarts", "Contra (USA).png") == "Contra (USA).png"
+        assert ThumbnailServer.seen == [("/Test%20System/Named_Boxarts/", '"v1"')]
+        print("[PASS] The cached listing is used within its TTL and revalidated with a conditional GET after")
+
+        index = RemoteThumbnailIndex(requests.Session(), os.path.join(test_dir, "other"))
+        assert index.resolve("http://127.0.0.1:1", "Test System", "Named_Boxarts", "Tetris (USA).png") == "Tetris (USA).png"
+        print("[PASS] Without a listing the name is tried as is")
+        downloader.close()
+    finally:
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+class BlockingSession:
+    """Listing requests for the "Slow System" wait until release is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(url)
+        if "Slow%20System" in url:
+            self.release.wait(5)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = LISTING.encode('utf-8')
+        return response
+
+def test_concurrent_listing_loads():
+    print("\n--- Testing Concurrent Listing Loads ---")
+    test_dir = tempfile.mkdtemp(prefix="plcn_index_")
+    session = BlockingSession()
+    index = RemoteThumbnailIndex(session, test_dir)
+    try:
+        slow = [threading.Thread(target=index.get_entry, args=("http://server", "Slow System", "Named_Boxarts"))
+                for _ in range(3)]
+        for thread in slow:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while not session.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert session.requests
+        # Another listing is not held up by the one being fetched
+        fast = threading.Thread(target=index.get_entry, args=("http://server", "Test System", "Named_Boxarts"))
+        fast.start()
+        fast.join(2)
+        assert not fast.is_alive()
+        session.release.set()
+        for thread in slow:
+            thread.join()
+        assert sum("Slow%20System" in url for url in session.requests) == 1
+        assert index.get_entry("http://server", "Slow System", "Named_Boxarts") is not None
+        print("[PASS] Listings load in parallel, each one is fetched once")
+    finally:
+        session.release.set()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_listing_lookup()
+    test_index_downloads()
+    test_concurrent_listing_loads()
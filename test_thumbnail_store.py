@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+import thumbnail_store
+from thumbnail_downloader import ThumbnailDownloader
+from thumbnail_store import ThumbnailStore
+
+class SameImageServer(BaseHTTPRequestHandler):
+    """Every thumbnail is the same image, like a placeholder shared by several titles."""
+    seen = []
+
+    def do_GET(self):
+        self.seen.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "3")
+        self.end_headers()
+        self.wfile.write(b"png")
+
+    def log_message(self, *args):
+        pass
+
+def test_thumbnail_store():
+    print("\n--- Testing Content-Addressed Thumbnail Store ---")
+    test_dir = os.path.abspath("test_thumbnail_store_data")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SameImageServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    store_dir = os.path.join(test_dir, ".plcn", "store")
+    downloader = ThumbnailDownloader(test_dir, store=ThumbnailStore(store_dir))
+    downloader.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        del SameImageServer.seen[:]
+        downloader.download_thumbnail("Test System", "Contra (USA)", "魂斗罗")
+        assert len(SameImageServer.seen) == 3
+
+        # A corrected label for the same game: linked from the store, nothing fetched
+        results = downloader.download_thumbnail("Test System", "Contra (USA)", "魂斗罗 1")
+        assert len(SameImageServer.seen) == 3
+        assert all("from store" in r for r in results)
+        first = os.stat(downloader.target_path("Test System", "Named_Boxarts", "魂斗罗"))
+        second = os.stat(downloader.target_path("Test System", "Named_Boxarts", "魂斗罗 1"))
+        assert first.st_ino == second.st_ino
+        print("[PASS] A fetched thumbnail is linked for another label instead of fetched again")
+
+        downloader.download_thumbnail("Test System", "Metroid (USA)", "银河战士")
+        objects = [f for _, _, files in os.walk(os.path.join(store_dir, "objects")) for f in files]
+        assert len(objects) == 1
+        print("[PASS] Identical images are stored once")
+
+        original_link = thumbnail_store.os.link
+        def no_links(src, dst):
+            raise OSError("hardlinks not supported")
+        thumbnail_store.os.link = no_links
+        try:
+            results = downloader.download_thumbnail("Test System", "Contra (USA)", "魂斗罗 2")
+        finally:
+            thumbnail_store.os.link = original_link
+        target = downloader.target_path("Test System", "Named_Titles", "魂斗罗 2")
+        assert all("from store" in r for r in results)
+        with open(target, 'rb') as f:
+            assert f.read() == b"png"
+        assert os.stat(target).st_nlink == 1
+        assert not [f for f in os.listdir(os.path.dirname(target)) if f.endswith(".tmp")]
+        print("[PASS] A target the store cannot hardlink is copied")
+    finally:
+        downloader.close()
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+def test_store_without_hardlinks():
+    print("\n--- Testing Thumbnail Store Without Hardlinks ---")
+    test_dir = os.path.abspath("test_thumbnail_store_nolinks")
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SameImageServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    downloader = ThumbnailDownloader(test_dir, store=ThumbnailStore(os.path.join(test_dir, ".plcn", "store")))
+    downloader.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    original_link = thumbnail_store.os.link
+    def no_links(src, dst):
+        raise OSError("hardlinks not supported")
+    thumbnail_store.os.link = no_links
+    try:
+        downloader.download_thumbnail("Test System", "Contra (USA)", "魂斗罗")
+        downloader.download_thumbnail("Test System", "Metroid (USA)", "银河战士")
+        files = [os.path.join(root, f) for root, _, names in os.walk(test_dir) for f in names]
+        # One copy per thumbnail, nothing kept in the store
+        assert len(files) == 6
+        assert all(os.sep + ".plcn" + os.sep not in path for path in files)
+        assert not downloader.uses_store()
+        print("[PASS] Without hardlinks every image is written once, at its target")
+    finally:
+        thumbnail_store.os.link = original_link
+        downloader.close()
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+def test_failed_put_leaves_no_temp_file():
+    print("\n--- Testing Failed Store Writes ---")
+    test_dir = os.path.abspath("test_thumbnail_store_put")
+    store = ThumbnailStore(test_dir)
+    original_replace = thumbnail_store.os.replace
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    thumbnail_store.os.replace = failing_replace
+    try:
+        store.put("Test System", "Named_Boxarts", "Contra (USA).png", b"png")
+        assert False, "the failed write must be reported"
+    except OSError:
+        pass
+    finally:
+        thumbnail_store.os.replace = original_replace
+    try:
+        leftovers = [f for _, _, names in os.walk(test_dir) for f in names]
+        assert leftovers == []
+        print("[PASS] A failed object write removes its temp file")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_thumbnail_store()
+    test_store_without_hardlinks()
+    test_failed_put_leaves_no_temp_file()
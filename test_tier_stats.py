@@ -0,0 +1,77 @@
+import os
+import sys
+import shutil
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from translator import Translator, diff_stats, format_stats
+from translator_pool import TranslatorPool
+
+def setup_data(test_dir):
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra (USA),魂斗罗\nMetal Slug X (USA),合金弹头X\n")
+    return rom_name_cn_path
+
+def test_tier_counters():
+    print("\n--- Testing Translator Tier Statistics ---")
+    test_dir = "test_tier_stats_data"
+    rom_name_cn_path = setup_data(test_dir)
+    translator = Translator(rom_name_cn_path, db_path=os.path.join(test_dir, "test.db"))
+
+    translator.translate("Contra (USA)")      # exact_en hit
+    translator.translate("魂斗罗")             # reverse_cn hit
+    translator.translate("Metal Slug X")      # normalized_alias hit
+    translator.translate("Unknown Game")      # miss
+
+    stats = translator.stats()
+    tiers = stats['tiers']
+    assert stats['translations'] == 4 and stats['misses'] == 1
+    assert tiers['exact_en']['calls'] == 4 and tiers['exact_en']['hits'] == 1
+    assert tiers['reverse_cn']['hits'] == 1
+    assert tiers['normalized_alias']['hits'] == 1
+    assert 'libretro_db' not in tiers  # no system, tier skipped and not counted
+    assert all(values['time_ms'] >= 0 for values in tiers.values())
+    print("[PASS] Calls, hits and timings recorded per tier")
+
+    assert "exact_en" in format_stats(stats)
+    before = translator.stats()
+    translator.translate("Contra (USA)")
+    delta = diff_stats(translator.stats(), before)
+    assert delta['translations'] == 1 and list(delta['tiers']) == ['exact_en']
+    print("[PASS] Snapshot deltas")
+
+    translator.db.close()
+    shutil.rmtree(test_dir)
+
+def test_disabled_stats():
+    print("\n--- Testing Disabled Tier Statistics ---")
+    test_dir = "test_tier_stats_data"
+    rom_name_cn_path = setup_data(test_dir)
+    translator = Translator(rom_name_cn_path, db_path=os.path.join(test_dir, "test.db"), collect_stats=False)
+    assert translator.translate("Contra (USA)") == ("魂斗罗", "Contra (USA)")
+    stats = translator.stats()
+    assert not stats['enabled'] and stats['translations'] == 0
+    print("[PASS] No counters when disabled")
+    translator.db.close()
+    shutil.rmtree(test_dir)
+
+def test_pool_totals():
+    print("\n--- Testing Pool Statistics ---")
+    test_dir = "test_tier_stats_data"
+    rom_name_cn_path = setup_data(test_dir)
+    pool = TranslatorPool()
+    for _ in range(2):
+        with pool.lease(rom_name_cn_path, None, db_path=os.path.join(test_dir, "test.db")) as translator:
+            translator.translate("Contra (USA)")
+    total = pool.stats()['total']
+    assert total['translations'] == 2 and total['tiers']['exact_en']['hits'] == 2
+    print("[PASS] Pool accumulates stats across leases")
+    pool.clear()
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_tier_counters()
+    test_disabled_stats()
+    test_pool_totals()
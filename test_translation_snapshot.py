@@ -0,0 +1,58 @@
+import os
+import sys
+import shutil
+import random
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from translator import Translator
+from translation_snapshot import TranslationSnapshot
+
+SYSTEM = "Nintendo - Super Nintendo Entertainment System"
+
+def setup_data(test_dir):
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    for name in (f"{SYSTEM}.csv", "Nintendo - Game Boy.csv", "name_alias(Chinese).json"):
+        shutil.copy(os.path.join("data", "rom-name-cn", name), rom_name_cn_path)
+    return rom_name_cn_path
+
+def test_snapshot_matches_sql():
+    print("\n--- Testing Translation Snapshot Against SQL Lookups ---")
+    test_dir = "test_translation_snapshot_data"
+    rom_name_cn_path = setup_data(test_dir)
+    db_path = os.path.join(test_dir, "test.db")
+    sql = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False)
+    sql.system_name = SYSTEM  # no DAT needed, only the DB tiers are compared
+    snap = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False)
+    snap.system_name = SYSTEM
+    snap.snapshot = TranslationSnapshot(snap.db, SYSTEM)
+    assert snap.snapshot.estimate_bytes() > 0
+
+    cursor = sql.db.get_connection().cursor()
+    cursor.execute("SELECT english_name, chinese_name FROM translations ORDER BY id")
+    rows = cursor.fetchall()
+    random.seed(3)
+    queries = []
+    for english, chinese in random.sample(rows, 300):
+        base = english.split(' (')[0]
+        queries += [english, chinese, f"{chinese}（中文版）", base, f"{base} (Japan)", f"{base} (Europe)"]
+    queries += ["超级玛丽世界", "Unknown Game"]
+
+    for query in queries:
+        norm = sql.normalize_name(query)
+        for tier in ("_match_exact_english", "_match_reverse_chinese", "_match_chinese_key", "_match_normalized_alias"):
+            assert getattr(sql, tier)(query, norm, None) == getattr(snap, tier)(query, norm, None), (tier, query)
+    print("[PASS] Snapshot answers every exact tier like SQL")
+
+    everything = Translator(rom_name_cn_path, db_path=db_path, collect_stats=False, use_snapshot=True)
+    assert everything.snapshot.rows == len(rows)
+    assert everything.translate(rows[0][0]) == sql.translate(rows[0][0])
+    everything.db.close()
+
+    sql.db.close()
+    snap.db.close()
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_snapshot_matches_sql()
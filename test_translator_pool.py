@@ -0,0 +1,95 @@
+import os
+import sys
+import shutil
+import threading
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+from translator_pool import TranslatorPool
+
+def setup_data(test_dir):
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+    rom_name_cn_path = os.path.join(test_dir, "rom-name-cn")
+    os.makedirs(rom_name_cn_path)
+    with open(os.path.join(rom_name_cn_path, "Test System.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\nContra (USA),魂斗罗\n")
+    return rom_name_cn_path
+
+def test_pool_reuses_translators():
+    print("\n--- Testing Translator Pool Reuse ---")
+    test_dir = "test_pool_data"
+    rom_name_cn_path = setup_data(test_dir)
+    db_path = os.path.join(test_dir, "test_pool.db")
+    pool = TranslatorPool()
+
+    with pool.lease(rom_name_cn_path, None, db_path=db_path) as first:
+        assert first.translate("Contra (USA)") == ("魂斗罗", "Contra (USA)")
+    with pool.lease(rom_name_cn_path, None, db_path=db_path) as second:
+        assert second is first
+    print("[PASS] Idle translator reused")
+
+    # Two concurrent leases never share an instance
+    with pool.lease(rom_name_cn_path, None, db_path=db_path) as a:
+        with pool.lease(rom_name_cn_path, None, db_path=db_path) as b:
+            assert a is not b
+    print("[PASS] Concurrent leases are exclusive")
+
+    pool.clear()
+    shutil.rmtree(test_dir)
+
+def test_pool_keys_and_eviction():
+    print("\n--- Testing Translator Pool Keys And Eviction ---")
+    test_dir = "test_pool_data"
+    rom_name_cn_path = setup_data(test_dir)
+    db_path = os.path.join(test_dir, "test_pool.db")
+    pool = TranslatorPool(idle_timeout=60)
+
+    key_a = pool.make_key(rom_name_cn_path, "Nintendo - SNES (20240830-122750) (3308)")
+    key_b = pool.make_key(rom_name_cn_path, "Nintendo - SNES")
+    assert key_a == key_b
+    print("[PASS] Key uses normalized system name")
+
+    with open(os.path.join(rom_name_cn_path, "Other.csv"), 'w', encoding='utf-8') as f:
+        f.write("Name EN,Name CN\n")
+    assert pool.make_key(rom_name_cn_path, "Nintendo - SNES") != key_b
+    print("[PASS] Key changes with data version")
+
+    with pool.lease(rom_name_cn_path, None, db_path=db_path):
+        pass
+    assert pool.evict_idle() == 0
+    assert pool.evict_idle(now=10 ** 9) == 1
+    assert not pool.idle
+    print("[PASS] Idle translators evicted after timeout")
+
+    shutil.rmtree(test_dir)
+
+def test_pool_thread_safety():
+    print("\n--- Testing Translator Pool Thread Safety ---")
+    test_dir = "test_pool_data"
+    rom_name_cn_path = setup_data(test_dir)
+    db_path = os.path.join(test_dir, "test_pool.db")
+    pool = TranslatorPool(max_idle_per_key=4)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                with pool.lease(rom_name_cn_path, None, db_path=db_path) as translator:
+                    assert translator.translate("Contra (USA)")[0] == "魂斗罗"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+    print("[PASS] Concurrent leases from 4 threads")
+
+    pool.clear()
+    shutil.rmtree(test_dir)
+
+if __name__ == "__main__":
+    test_pool_reuses_translators()
+    test_pool_keys_and_eviction()
+    test_pool_thread_safety()